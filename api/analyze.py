@@ -1,91 +1,154 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify, stream_with_context, g
 from flask_cors import CORS
-import json
+from werkzeug.exceptions import RequestEntityTooLarge
+import os
+import sys
 import time
-import re
-import random
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Cold start (serverless): só o necessário para /api/analyze é importado aqui;
+# fila de jobs, leitura de mbox/zip e cache do LLM (sqlite3, email, zipfile)
+# são importados na primeira rota que os usa
+
+from near_duplicate import NearDuplicateIndex
+from results import ClassificationResult
+from live_session import LiveSessionStore
+from template_engine import get_template_engine
+from streaming import sse_event, iter_chunks
+from parsed_email import parse_email
+from id_generator import new_protocol, new_request_id
+from json_stream import read_json, BodyTooLarge, MalformedJSON
+from fast_json import FastJSONProvider, JSONTemplate, dumps
+from admission import AdmissionController, Rejected, queue_time
+from compression import ResponseCompression
+
+MAX_TEXT_CHARS = 50000  # 50k chars max para Vercel
+# Pior caso do texto no JSON: cada caractere escapado como \uXXXX (6 bytes)
+MAX_BODY_BYTES = int(os.getenv('API_MAX_BODY_BYTES', str(MAX_TEXT_CHARS * 6 + 4096)))
+# Jobs em lote (/api/jobs) aceitam corpos maiores: caixas .mbox ou .zip inteiras
+JOBS_MAX_BODY_BYTES = int(os.getenv('JOBS_MAX_BODY_BYTES', str(20 * 1024 * 1024)))
+JOBS_MAX_ITEMS = int(os.getenv('JOBS_MAX_ITEMS', '10000'))
+# Sem threads de fundo (serverless), cada consulta ao job processa itens por até este tempo
+JOBS_POLL_BUDGET_SECONDS = float(os.getenv('JOBS_POLL_BUDGET_SECONDS', '5'))
+JOBS_PAGE_LIMIT = 500
+
+class APIRequest(Request):
+    """Request com limite de corpo por rota (jobs em lote aceitam arquivos maiores)"""
+    
+    @property
+    def max_content_length(self):
+        return JOBS_MAX_BODY_BYTES if self.path == '/api/jobs' else MAX_BODY_BYTES
+
 app = Flask(__name__)
+app.request_class = APIRequest
 CORS(app, origins=['*'])
 
-def classify_email_professional(text):
-    """Classificação profissional de email"""
+# jsonify com encoder rápido (orjson se instalado), compacto e sem ordenar chaves
+app.json = FastJSONProvider(app)
+
+# Partes fixas das respostas, serializadas uma única vez
+API_INFO = JSONTemplate({'version': '2.0.0-vercel', 'environment': 'serverless'})
+HEALTH_INFO = {
+    'status': 'healthy',
+    'message': 'AutoU Email Classifier API - Vercel Edition',
+    'version': '2.0.0-vercel',
+    'environment': 'serverless',
+    'endpoints': [
+        '/api/analyze',
+        '/api/analyze/stream',
+        '/api/health',
+        '/api/metrics',
+        '/api/live',
+        '/api/jobs'
+    ]
+}
+HEALTH = JSONTemplate(HEALTH_INFO)
+
+def json_response(body, status=200):
+    """Resposta com corpo JSON já serializado"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+# Werkzeug recusa corpos maiores (inclusive chunked) antes de bufferizar;
+# APIRequest troca pelo limite de jobs em /api/jobs
+app.config['MAX_CONTENT_LENGTH'] = MAX_BODY_BYTES
+
+# Índice de emails quase idênticos (disparos em massa, alertas automáticos)
+near_duplicate_index = NearDuplicateIndex(max_entries=10000, ttl_seconds=3600)
+
+# Templates de resposta carregados e compilados uma única vez
+response_templates = get_template_engine()
+
+# Sessões de classificação ao vivo (textarea enquanto o usuário digita)
+live_sessions = LiveSessionStore(max_sessions=1000, idle_seconds=300)
+
+# Controle de admissão: fichas por cliente + vagas de processamento com fila curta
+admission = AdmissionController(
+    rate=float(os.getenv('ADMISSION_RATE', '10')),
+    burst=int(os.getenv('ADMISSION_BURST', '20')),
+    max_concurrent=int(os.getenv('ADMISSION_MAX_CONCURRENT', str(2 * (os.cpu_count() or 1)))),
+    max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', '32')),
+    max_wait=float(os.getenv('ADMISSION_MAX_WAIT_SECONDS', '1.0'))
+)
+# Só chaves cadastradas ganham limite próprio; as demais contam pelo IP
+ADMISSION_API_KEYS = frozenset(key.strip() for key in os.getenv('ADMISSION_API_KEYS', '').split(',') if key.strip())
+# Proxies à frente da API que anexam ao X-Forwarded-For (a Vercel reescreve o cabeçalho: 1)
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', '1' if os.getenv('VERCEL') else '0'))
+# gzip/brotli negociado para JSON acima de API_COMPRESS_MIN_BYTES e para streams NDJSON (SSE vai sem)
+response_compression = ResponseCompression()
+
+# Rotas que ocupam CPU durante o request passam pela vaga global; as demais só pelo limite por cliente
+ADMISSION_GATED = frozenset(['analyze', 'analyze_stream', 'live_create', 'live_update'])
+ADMISSION_RATE_ONLY = frozenset(['job_submit', 'live_close'])
+
+def classify_email_professional(email):
+    """Classificação profissional de email (texto ou ParsedEmail)"""
     
-    text_lower = text.lower().strip()
+    # Léxico do idioma detectado (apenas um idioma é varrido por request)
+    email = parse_email(email)
     
-    # Palavras-chave ponderadas (versão profissional)
-    productive_keywords = {
-        # Problemas técnicos (peso alto)
-        'problema': 4, 'erro': 4, 'bug': 4, 'falha': 4, 'defeito': 3,
-        'não funciona': 5, 'parou de funcionar': 5, 'travou': 3,
-        
-        # Suporte e ajuda (peso alto)
-        'suporte': 3, 'ajuda': 3, 'assistência': 3, 'socorro': 4,
-        'dúvida': 2, 'questão': 2, 'esclarecimento': 2,
-        
-        # Urgência (peso muito alto)
-        'urgente': 5, 'emergência': 5, 'crítico': 5, 'imediato': 4,
-        'asap': 4, 'prioridade': 3, 'importante': 2,
-        
-        # Negócios
-        'reunião': 2, 'meeting': 2, 'proposta': 3, 'orçamento': 3,
-        'contrato': 3, 'projeto': 2, 'deadline': 3, 'prazo': 3,
-        
-        # Ações
-        'implementar': 2, 'desenvolver': 2, 'criar': 2, 'modificar': 2,
-        'corrigir': 3, 'resolver': 3, 'atualizar': 2, 'status': 2
-    }
-    
-    unproductive_keywords = {
-        # Felicitações
-        'parabéns': 4, 'felicitações': 4, 'congratulações': 3,
-        
-        # Datas especiais
-        'aniversário': 3, 'natal': 4, 'ano novo': 4, 'festas': 2,
-        
-        # Agradecimentos
-        'obrigado': 2, 'obrigada': 2, 'agradecimento': 3, 'gratidão': 3,
-        
-        # Social
-        'café': 1, 'almoço': 1, 'jantar': 1, 'happy hour': 2,
-        'fim de semana': 1, 'feriado': 1, 'férias': 2,
-        
-        # Entretenimento
-        'piada': 3, 'engraçado': 2, 'funny': 2, 'humor': 2
-    }
+    return score_email(
+        email.language,
+        email.productive_hits,
+        email.unproductive_hits,
+        has_urgency=email.has_urgency,
+        question_count=email.question_count,
+        exclamation_count=email.exclamation_count,
+        word_count=email.word_count,
+        char_count=email.char_count
+    )
+
+def score_email(language, productive_hits, unproductive_hits, has_urgency,
+                question_count, exclamation_count, word_count, char_count):
+    """Calcular classificação a partir dos sinais já extraídos do email"""
     
     # Calcular scores
     productive_score = 0
     unproductive_score = 0
     found_keywords = []
     
-    for keyword, weight in productive_keywords.items():
-        if keyword in text_lower:
-            productive_score += weight
-            found_keywords.append(f'"{keyword}" (+{weight}P)')
+    for keyword, weight in productive_hits:
+        productive_score += weight
+        found_keywords.append(f'"{keyword}" (+{weight}P)')
     
-    for keyword, weight in unproductive_keywords.items():
-        if keyword in text_lower:
-            unproductive_score += weight
-            found_keywords.append(f'"{keyword}" (+{weight}I)')
+    for keyword, weight in unproductive_hits:
+        unproductive_score += weight
+        found_keywords.append(f'"{keyword}" (+{weight}I)')
     
     # Análise estrutural
-    question_count = text.count('?')
     if question_count > 0:
         productive_score += question_count * 2
         found_keywords.append(f'{question_count} pergunta(s) (+{question_count * 2}P)')
     
-    exclamation_count = text.count('!')
     if exclamation_count > 3:
         unproductive_score += min(exclamation_count - 3, 3)
         found_keywords.append(f'exclamações excessivas (+{min(exclamation_count - 3, 3)}I)')
-    elif exclamation_count > 0 and any(urgent in text_lower for urgent in ['urgente', 'emergência']):
+    elif exclamation_count > 0 and has_urgency:
         productive_score += exclamation_count
         found_keywords.append(f'exclamações urgentes (+{exclamation_count}P)')
     
     # Análise de comprimento
-    word_count = len(text.split())
     if word_count > 100:
         productive_score += 2
         found_keywords.append('email longo (+2P)')
@@ -129,165 +192,261 @@ def classify_email_professional(text):
             if len(found_keywords) > 5:
                 explanation += f' e mais {len(found_keywords) - 5}.'
     
-    return {
-        'classification': classification,
-        'confidence': round(confidence, 3),
-        'explanation': explanation,
-        'analysis_details': {
-            'scores': {
-                'productive': productive_score,
-                'unproductive': unproductive_score,
-                'total': total_score
-            },
-            'text_stats': {
-                'word_count': word_count,
-                'char_count': len(text),
-                'question_count': question_count,
-                'exclamation_count': exclamation_count
-            },
-            'found_keywords': found_keywords[:10]
-        }
-    }
-
-def generate_professional_response(email_content, classification):
-    """Gerar resposta profissional contextualizada"""
+    return ClassificationResult(
+        classification=classification,
+        confidence=round(confidence, 3),
+        explanation=explanation,
+        language=language,
+        productive_score=productive_score,
+        unproductive_score=unproductive_score,
+        word_count=word_count,
+        char_count=char_count,
+        question_count=question_count,
+        exclamation_count=exclamation_count,
+        found_keywords=found_keywords[:10],
+        keyword_hits=[kw for kw, _ in productive_hits] + [kw for kw, _ in unproductive_hits]
+    )
+
+def generate_professional_response(email, classification, keyword_hits=None, language=None,
+                                   protocol=None):
+    """Gerar resposta profissional contextualizada (texto ou ParsedEmail)
     
-    # Extrair nome do remetente
-    lines = email_content.split('\n')
-    sender_name = "Cliente"
+    `keyword_hits` e `language` vêm do resultado da classificação e evitam
+    uma nova varredura do texto para escolher o template. `protocol` já
+    gerado é usado por processos sem worker id (pool da variante ASGI).
+    """
+    email = parse_email(email)
     
-    for line in reversed(lines):
-        line = line.strip()
-        if len(line) > 2 and len(line) < 40 and not '@' in line:
-            words = line.split()
-            if len(words) <= 3 and not any(char.isdigit() for char in line):
-                sender_name = line.title()
-                break
+    # Extrair nome do remetente
+    sender_name = email.signature_name or "Cliente"
     
     # Gerar protocolo único
-    protocol = f"AU{datetime.now().strftime('%Y%m%d%H%M%S')}{random.randint(10, 99)}"
+    if protocol is None:
+        protocol = new_protocol()
     timestamp = datetime.now().strftime('%d/%m/%Y às %H:%M')
     
-    if classification.lower() == 'produtivo':
-        # Detectar tipo de solicitação
-        content_lower = email_content.lower()
-        
-        if any(word in content_lower for word in ['urgente', 'emergência', 'crítico']):
-            return f"""Prezado(a) {sender_name},
-
-🚨 SOLICITAÇÃO URGENTE RECEBIDA
-
-Protocolo: #{protocol}
-Recebido: {timestamp}
-Status: PRIORIDADE MÁXIMA
-
-Nossa equipe de suporte foi imediatamente acionada e está priorizando seu atendimento.
-
-⏰ Primeira resposta: até 2 horas
-🔧 Resolução estimada: 4-6 horas
-📱 Suporte urgente: (11) 9999-9999
-
-Acompanhe em tempo real: https://status.autou.io/#{protocol}
-
-Atenciosamente,
-Equipe de Suporte AutoU
-Central de Atendimento 24/7"""
-
-        elif any(word in content_lower for word in ['reunião', 'meeting', 'proposta', 'comercial']):
-            return f"""Prezado(a) {sender_name},
-
-Agradecemos seu contato comercial!
-
-📊 Detalhes da solicitação:
-   • Protocolo: #{protocol}
-   • Recebido: {timestamp}
-   • Tipo: Oportunidade Comercial
-   • Status: Em análise
-
-💼 Nossa equipe comercial irá:
-   ✓ Analisar suas necessidades
-   ✓ Preparar proposta personalizada
-   ✓ Agendar apresentação
-   ✓ Acompanhar todo o processo
-
-📅 Retorno comercial: até 48h úteis
-📧 Contato: comercial@autou.io
-📞 WhatsApp: (11) 99999-8888
-
-Cordialmente,
-Equipe Comercial AutoU
-"Transformando processos através da tecnologia" """
-
-        else:
-            return f"""Prezado(a) {sender_name},
-
-Obrigado por entrar em contato com o suporte AutoU.
-
-📋 Sua solicitação foi registrada:
-   • Protocolo: #{protocol}
-   • Data/Hora: {timestamp}
-   • Categoria: Suporte Técnico
-   • Status: Em análise
-
-👨‍💻 Nossa equipe irá:
-   1. Analisar sua questão detalhadamente
-   2. Replicar o cenário descrito
-   3. Desenvolver a melhor solução
-   4. Implementar e validar
-
-⏰ Prazo de resposta: até 24 horas úteis
-🌐 Acompanhar: https://suporte.autou.io/#{protocol}
-
-Atenciosamente,
-Equipe Técnica AutoU
-suporte@autou.io | (11) 3333-4444"""
-
-    else:  # Improdutivo
-        content_lower = email_content.lower()
-        
-        if any(word in content_lower for word in ['parabéns', 'felicitações', 'aniversário']):
-            return f"""Caro(a) {sender_name},
-
-🎉 Que alegria receber sua mensagem de felicitação!
-
-Muito obrigado por pensar em nós neste momento especial. Gestos como o seu tornam nossa jornada ainda mais significativa.
-
-✨ Retribuímos os votos de felicidade e sucesso!
-
-Que este seja o início de muitas conquistas e realizações incríveis.
-
-A equipe AutoU torce sempre por você! 🌟
-
-Com muito carinho,
-Família AutoU 💙"""
-
-        elif any(word in content_lower for word in ['obrigado', 'obrigada', 'agradecimento']):
-            return f"""Prezado(a) {sender_name},
-
-😊 Seu agradecimento iluminou nosso dia!
-
-É uma honra fazer parte da sua jornada e saber que nosso trabalho fez a diferença.
-
-Na AutoU, acreditamos que relacionamentos genuínos são a base de tudo. Mensagens como a sua nos motivam a sempre buscar a excelência.
-
-Conte sempre conosco para o que precisar!
+    branch = 'professional/produtivo' if classification.lower() == 'produtivo' else 'professional/improdutivo'
+    template = response_templates.select(branch, keyword_hits=keyword_hits, language=language,
+                                         text_lower=email.text_lower)
+    
+    return template.render({
+        'sender': sender_name,
+        'protocol': protocol,
+        'timestamp': timestamp
+    })
 
-Tenha uma excelente semana!
+def _request_json():
+    """Corpo JSON do request ({} se não for JSON)
+    
+    Lido do stream em pedaços e verificado a cada pedaço, então corpos
+    grandes demais ou malformados são recusados sem ler o resto.
+    """
+    if not request.is_json:
+        return {}
+    return read_json(request.stream, MAX_BODY_BYTES, request.content_length)
+
+def _request_text():
+    """Texto do email enviado como JSON ou formulário"""
+    if request.is_json:
+        text = _request_json().get('text')
+        return text if isinstance(text, str) else ''
+    return request.form.get('text') or ''
+
+def text_error(text):
+    """Corpo do erro 400 para texto inválido (None se válido)"""
+    if not text or len(text.strip()) < 10:
+        return {
+            'error': 'Texto muito curto',
+            'message': 'Email deve ter pelo menos 10 caracteres',
+            'received_length': len(text) if text else 0
+        }
+    
+    if len(text) > MAX_TEXT_CHARS:
+        return {
+            'error': 'Texto muito longo',
+            'message': 'Limite de 50.000 caracteres para processamento'
+        }
+    
+    return None
 
-Com gratidão,
-Equipe AutoU 💙"""
+def _validate_text(text):
+    """Resposta de erro 400 para texto inválido (None se válido)"""
+    error = text_error(text)
+    return (jsonify(error), 400) if error is not None else None
 
-        else:
-            return f"""Olá {sender_name}!
+def _classify(email):
+    """Classificar reaproveitando a decisão de um email quase idêntico, se houver
+    
+    Num acerto o email não é pontuado (léxico não é varrido): classificação,
+    confiança e scores vêm da decisão guardada; estatísticas e idioma são os
+    do email atual e não há palavras-chave (o template é escolhido pelo texto).
+    """
+    decision, sketch = near_duplicate_index.lookup(email.text, email.tokens)
+    if decision is None:
+        classification_result = classify_email_professional(email)
+        near_duplicate_index.add(sketch, (
+            classification_result.classification,
+            classification_result.confidence,
+            classification_result.productive_score,
+            classification_result.unproductive_score
+        ))
+        return classification_result, False
+    
+    classification, confidence, productive_score, unproductive_score = decision
+    return ClassificationResult(
+        classification=classification,
+        confidence=confidence,
+        explanation='Classificação reaproveitada de um email quase idêntico analisado antes.',
+        language=email.language,
+        productive_score=productive_score,
+        unproductive_score=unproductive_score,
+        word_count=email.word_count,
+        char_count=email.char_count,
+        question_count=email.question_count,
+        exclamation_count=email.exclamation_count,
+        found_keywords=()
+    ), True
+
+def analyze_email(text, start_time=None, protocol=None):
+    """Classificar o email e montar o corpo de sucesso de /api/analyze
+    
+    Compartilhado pela app Flask e pela variante ASGI (api/asgi.py), que o
+    executa em um pool de processos e gera o protocolo no processo
+    principal. Só tipos JSON comuns: o api_info pré-serializado entra na
+    camada HTTP (with_api_info).
+    """
+    if start_time is None:
+        start_time = time.time()
+    
+    # Texto analisado uma única vez para classificação e resposta
+    email = parse_email(text)
+    classification_result, is_near_duplicate = _classify(email)
+    
+    # Gerar resposta
+    suggested_response = generate_professional_response(
+        email, 
+        classification_result.classification,
+        keyword_hits=None if is_near_duplicate else classification_result.keyword_hits,
+        language=classification_result.language,
+        protocol=protocol
+    )
+    
+    # Calcular tempo de processamento
+    processing_time = round(time.time() - start_time, 3)
+    
+    # Resposta da API
+    response_data = {
+        'status': 'success',
+        'classification': classification_result.classification,
+        'confidence': classification_result.confidence,
+        'explanation': classification_result.explanation,
+        'suggested_response': suggested_response,
+        'processing_metrics': {
+            'total_time_seconds': processing_time,
+            'content_length': email.char_count,
+            'words_count': email.word_count,
+            'algorithm': 'Professional Rule-Based + ML Features',
+            'near_duplicate': is_near_duplicate
+        },
+        'analysis_details': classification_result.analysis_details()
+    }
+    
+    return response_data
 
-Que bom receber seu contato! 😊
+def with_api_info(body):
+    """Acrescentar o api_info da resposta HTTP (trecho fixo já serializado)
+    
+    O RawJSON só é entendido pelo dumps de fast_json; fica fora de
+    analyze_email para o corpo continuar serializável por qualquer encoder.
+    """
+    body['api_info'] = API_INFO.render(
+        timestamp=datetime.now().isoformat(),
+        request_id=new_request_id()
+    )
+    return body
+
+def processing_error(message):
+    """Corpo do erro 500 de /api/analyze"""
+    return {
+        'status': 'error',
+        'error': 'Erro no processamento',
+        'message': message,
+        'api_info': {
+            'version': '2.0.0-vercel',
+            'timestamp': datetime.now().isoformat()
+        }
+    }
 
-É sempre um prazer manter essa conexão com pessoas especiais como você.
+def body_too_large_error(max_bytes=MAX_BODY_BYTES):
+    """Corpo do erro 413"""
+    return {
+        'error': 'Requisição muito grande',
+        'message': f'Limite de {max_bytes} bytes por requisição'
+    }
 
-Espero que seu dia esteja sendo incrível e cheio de boas energias!
+@app.before_request
+def reject_oversized_body():
+    """Recusar pelo Content-Length, antes de qualquer leitura do corpo"""
+    max_bytes = request.max_content_length
+    if request.content_length is not None and request.content_length > max_bytes:
+        return jsonify(body_too_large_error(max_bytes)), 413
+
+@app.errorhandler(413)
+@app.errorhandler(BodyTooLarge)
+def body_too_large(e):
+    return jsonify(body_too_large_error(request.max_content_length)), 413
+
+def client_key():
+    """Chave do limite por cliente: X-API-Key cadastrada ou o IP de origem
+
+    Chaves desconhecidas e entradas do X-Forwarded-For escritas pelo próprio
+    cliente são ignoradas; senão cada valor novo ganharia fichas novas.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key in ADMISSION_API_KEYS:
+        return f'key:{api_key}'
+    if TRUSTED_PROXY_HOPS:
+        # Cada proxy anexa o IP de quem o chamou: o que vale é o anexado pelo proxy confiável mais externo
+        forwarded = [ip.strip() for ip in request.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return request.remote_addr or 'anon'
+
+@app.before_request
+def admission_control():
+    """Recusar (429/503) antes de ler o corpo quando o cliente ou o servidor estão no limite"""
+    if request.method == 'OPTIONS':
+        return
+    if request.endpoint in ADMISSION_GATED:
+        g.admission_started = admission.admit(client_key(), queue_time(request.headers.get('X-Request-Start')))
+    elif request.endpoint in ADMISSION_RATE_ONLY:
+        admission.check_rate(client_key())
+
+@app.teardown_request
+def admission_release(exc):
+    # Em respostas em streaming roda só ao fim do stream
+    started = g.pop('admission_started', None)
+    if started is not None:
+        admission.release(started)
+
+@app.after_request
+def compress_response(response):
+    return response_compression(response, request)
+
+@app.errorhandler(Rejected)
+def rejected(e):
+    if e.status == 429:
+        body = {'error': 'Muitas requisições', 'message': f'Limite por cliente atingido; tente novamente em {e.retry_after}s'}
+    else:
+        body = {'error': 'Servidor ocupado', 'message': f'Capacidade esgotada; tente novamente em {e.retry_after}s'}
+    response = jsonify(dict(body, status='error', reason=e.reason))
+    response.status_code = e.status
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
 
-Um abraço caloroso,
-Time AutoU 🤗"""
+@app.errorhandler(MalformedJSON)
+def malformed_json(e):
+    return jsonify({'error': 'JSON inválido', 'message': str(e)}), 400
 
 # ENDPOINT PRINCIPAL
 @app.route('/api/analyze', methods=['POST', 'OPTIONS'])
@@ -301,95 +460,371 @@ def analyze():
     try:
         start_time = time.time()
         
-        # Obter dados da request
-        data = request.get_json() if request.is_json else {}
-        text = data.get('text') or request.form.get('text') or ''
-        
-        # Validações
-        if not text or len(text.strip()) < 10:
-            return jsonify({
-                'error': 'Texto muito curto',
-                'message': 'Email deve ter pelo menos 10 caracteres',
-                'received_length': len(text) if text else 0
-            }), 400
+        text = _request_text()
         
-        if len(text) > 50000:  # 50k chars max para Vercel
-            return jsonify({
-                'error': 'Texto muito longo',
-                'message': 'Limite de 50.000 caracteres para processamento'
-            }), 400
+        error_response = _validate_text(text)
+        if error_response is not None:
+            return error_response
         
-        # Classificar email
-        classification_result = classify_email_professional(text)
+        return jsonify(with_api_info(analyze_email(text, start_time)))
         
-        # Gerar resposta
-        suggested_response = generate_professional_response(
-            text, 
-            classification_result['classification']
-        )
+    except (BodyTooLarge, MalformedJSON, RequestEntityTooLarge):
+        raise
+    except Exception as e:
+        return jsonify(processing_error(str(e))), 500
+
+@app.route('/api/analyze/stream', methods=['POST', 'OPTIONS'])
+def analyze_stream():
+    """Análise com resposta em server-sent events
+    
+    Eventos: 'classification' (enviado assim que o email é classificado),
+    'response' (trechos da resposta sugerida, na ordem) e 'done'. Falhas
+    depois dos cabeçalhos viram 'error', seguido de 'done' com status 'error'.
+    """
+    
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    start_time = time.time()
+    text = _request_text()
+    
+    error_response = _validate_text(text)
+    if error_response is not None:
+        return error_response
+    
+    def failed(e):
+        # Status 200 e cabeçalhos já enviados: o erro vai como evento e o stream fecha com 'done'
+        yield sse_event('error', {'error': 'Erro no processamento', 'message': str(e)})
+        yield sse_event('done', {
+            'status': 'error',
+            'total_time_seconds': round(time.time() - start_time, 3)
+        })
+    
+    def events():
+        try:
+            email = parse_email(text)
+            classification_result, is_near_duplicate = _classify(email)
+            classification = sse_event('classification', {
+                'status': 'success',
+                'request_id': new_request_id(),
+                'classification': classification_result.classification,
+                'confidence': classification_result.confidence,
+                'explanation': classification_result.explanation,
+                'analysis_details': classification_result.analysis_details(),
+                'near_duplicate': is_near_duplicate,
+                'classification_time_seconds': round(time.time() - start_time, 3)
+            })
+        except Exception as e:
+            yield from failed(e)
+            return
+        yield classification
         
-        # Calcular tempo de processamento
-        processing_time = round(time.time() - start_time, 3)
+        try:
+            suggested_response = generate_professional_response(
+                email,
+                classification_result.classification,
+                keyword_hits=None if is_near_duplicate else classification_result.keyword_hits,
+                language=classification_result.language
+            )
+            for chunk in iter_chunks(suggested_response):
+                yield sse_event('response', {'text': chunk})
+        except Exception as e:
+            yield from failed(e)
+            return
         
-        # Resposta da API
-        response_data = {
+        yield sse_event('done', {
             'status': 'success',
-            'classification': classification_result['classification'],
-            'confidence': classification_result['confidence'],
-            'explanation': classification_result['explanation'],
-            'suggested_response': suggested_response,
-            'processing_metrics': {
-                'total_time_seconds': processing_time,
-                'content_length': len(text),
-                'words_count': len(text.split()),
-                'algorithm': 'Professional Rule-Based + ML Features'
-            },
-            'analysis_details': classification_result['analysis_details'],
-            'api_info': {
-                'version': '2.0.0-vercel',
-                'environment': 'serverless',
-                'timestamp': datetime.now().isoformat(),
-                'request_id': f"req_{int(time.time())}{random.randint(100, 999)}"
-            }
+            'total_time_seconds': round(time.time() - start_time, 3),
+            'response_length': len(suggested_response)
+        })
+    
+    return app.response_class(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Desligar buffer de proxies (nginx) para os eventos saírem na hora
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Health check da API (parte fixa já serializada)"""
+    return json_response(HEALTH.render(timestamp=datetime.now().isoformat()))
+
+def _live_response(session, start_time):
+    """Montar resposta da classificação ao vivo a partir do estado da sessão"""
+    result = score_email(**session.signals())
+    
+    return jsonify({
+        'status': 'success',
+        'session_id': session.session_id,
+        'version': session.version,
+        'classification': result.classification,
+        'confidence': result.confidence,
+        'explanation': result.explanation,
+        'analysis_details': result.analysis_details(),
+        'processing_metrics': {
+            'server_time_ms': round((time.perf_counter() - start_time) * 1000, 3)
         }
-        
-        return jsonify(response_data)
-        
-    except Exception as e:
-        error_message = str(e)
-        
+    })
+
+@app.route('/api/live', methods=['POST'])
+def live_create():
+    """Abrir sessão de classificação ao vivo"""
+    start_time = time.perf_counter()
+    text = _request_json().get('text') or ''
+    if not isinstance(text, str):
+        return jsonify({'status': 'error', 'error': 'Texto inválido', 'message': '"text" deve ser um texto'}), 400
+    
+    try:
+        session = live_sessions.create(text)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'error': 'Texto muito longo', 'message': str(e)}), 400
+    
+    return _live_response(session, start_time), 201
+
+@app.route('/api/live/<session_id>', methods=['PATCH'])
+def live_update(session_id):
+    """Aplicar deltas do texto e devolver a classificação atualizada
+    
+    Corpo: {"version": n, "deltas": [{"offset": i, "delete": k, "insert": "..."}]}
+    ou {"version": n, "text": "..."} para reenviar o texto inteiro.
+    """
+    start_time = time.perf_counter()
+    data = _request_json()
+    
+    session = live_sessions.get(session_id)
+    if session is None:
         return jsonify({
             'status': 'error',
-            'error': 'Erro no processamento',
-            'message': error_message,
-            'api_info': {
-                'version': '2.0.0-vercel',
-                'timestamp': datetime.now().isoformat()
-            }
-        }), 500
+            'error': 'Sessão não encontrada',
+            'message': 'Sessão expirada ou aberta em outro processo; abra uma nova em /api/live com o texto inteiro'
+        }), 404
+    
+    with session.lock:
+        if data.get('version') != session.version:
+            return jsonify({
+                'status': 'error',
+                'error': 'Versão desatualizada',
+                'message': 'Reenvie o texto completo',
+                'version': session.version
+            }), 409
+        
+        try:
+            if 'text' in data:
+                session.reset(data['text'] or '')
+            for delta in data.get('deltas', []):
+                session.apply_delta(
+                    int(delta.get('offset', 0)),
+                    int(delta.get('delete', 0)),
+                    delta.get('insert') or ''
+                )
+        except (TypeError, ValueError, AttributeError) as e:
+            # Estado pode ter ficado parcial; o cliente deve reenviar o texto
+            session.version += 1
+            return jsonify({
+                'status': 'error',
+                'error': 'Delta inválido',
+                'message': str(e),
+                'version': session.version
+            }), 400
+        
+        session.version += 1
+        return _live_response(session, start_time)
+
+@app.route('/api/live/<session_id>', methods=['DELETE'])
+def live_close(session_id):
+    """Encerrar sessão de classificação ao vivo"""
+    live_sessions.close(session_id)
+    return '', 204
+
+def process_job_item(item):
+    """Analisar um email de um job em lote (executado pela fila de jobs)"""
+    from job_queue import InvalidItem
+    
+    text = item.get('text')
+    error = text_error(text)
+    if error is not None:
+        raise InvalidItem(error['message'])
+    
+    return analyze_email(text)
 
-@app.route('/api/health', methods=['GET'])
-def health():
-    """Health check da API"""
+def _jobs():
+    """Fila de jobs do processo, com os workers de fundo já iniciados"""
+    from job_queue import get_job_queue
+    
+    queue = get_job_queue(process_job_item)
+    queue.start()
+    return queue
+
+def _job_items():
+    """Itens do job: JSON {"emails": [...]} ou arquivo .mbox/.zip/.eml/.txt enviado"""
+    if request.is_json:
+        data = read_json(request.stream, JOBS_MAX_BODY_BYTES, request.content_length)
+        emails = data.get('emails')
+        if not isinstance(emails, list):
+            raise ValueError('Envie {"emails": ["texto", {"id": "...", "text": "..."}]}')
+        if len(emails) > JOBS_MAX_ITEMS:
+            raise ValueError(f'Limite de {JOBS_MAX_ITEMS} emails por job')
+        
+        items = []
+        for email in emails:
+            if isinstance(email, str):
+                email = {'text': email}
+            if not isinstance(email, dict) or not isinstance(email.get('text'), str):
+                raise ValueError('Cada email deve ser um texto ou {"id": "...", "text": "..."}')
+            items.append({'id': email.get('id'), 'text': email['text']})
+        return items
+    
+    from mailbox_split import iter_emails
+    
+    upload = request.files.get('file')
+    if upload is None:
+        raise ValueError('Envie {"emails": [...]} em JSON ou um arquivo no campo "file"')
+    return [
+        {'id': name, 'text': text}
+        for name, text in iter_emails(upload.filename, upload.read(), JOBS_MAX_ITEMS, JOBS_MAX_BODY_BYTES * 10)
+    ]
+
+def _job_not_found(job_id):
     return jsonify({
-        'status': 'healthy',
-        'message': 'AutoU Email Classifier API - Vercel Edition',
-        'version': '2.0.0-vercel',
-        'environment': 'serverless',
-        'timestamp': datetime.now().isoformat(),
-        'endpoints': [
-            '/api/analyze',
-            '/api/health'
-        ]
+        'status': 'error',
+        'error': 'Job não encontrado',
+        'message': f'Job {job_id} inexistente ou expirado'
+    }), 404
+
+def _job_body(job):
+    job_id = job['job_id']
+    return dict(job, links={
+        'self': f'/api/jobs/{job_id}',
+        'results': f'/api/jobs/{job_id}/results',
+        'events': f'/api/jobs/{job_id}/events'
+    })
+
+@app.route('/api/jobs', methods=['POST'])
+def job_submit():
+    """Criar job de análise em lote; o processamento segue em segundo plano"""
+    try:
+        items = _job_items()
+        if not items:
+            raise ValueError('Nenhum email encontrado')
+    except (BodyTooLarge, MalformedJSON):
+        raise
+    except ValueError as e:
+        # Inclui ArchiveError (mbox/zip ilegível)
+        return jsonify({'status': 'error', 'error': 'Job inválido', 'message': str(e)}), 400
+    
+    job = _jobs().submit(items)
+    return jsonify(_job_body(job)), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Progresso do job (polling)"""
+    from job_queue import JobNotFound, FINAL_JOB_STATES
+    
+    queue = _jobs()
+    try:
+        job = queue.status(job_id)
+        if not queue.workers and job['status'] not in FINAL_JOB_STATES:
+            queue.drain(JOBS_POLL_BUDGET_SECONDS)
+            job = queue.status(job_id)
+    except JobNotFound:
+        return _job_not_found(job_id)
+    return jsonify(_job_body(job))
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """Resultados paginados: ?cursor=<next_cursor>&limit=<até 500>
+    
+    Com ?format=ndjson (ou Accept: application/x-ndjson) devolve todos os
+    itens a partir de `cursor` em um único stream, um JSON por linha.
+    """
+    from job_queue import JobNotFound
+    
+    try:
+        cursor = max(0, int(request.args.get('cursor', 0)))
+        limit = min(JOBS_PAGE_LIMIT, max(1, int(request.args.get('limit', 100))))
+    except ValueError:
+        return jsonify({'status': 'error', 'error': 'Parâmetro inválido',
+                        'message': 'cursor e limit devem ser inteiros'}), 400
+    
+    ndjson = (request.args.get('format') == 'ndjson'
+              or request.accept_mimetypes.best == 'application/x-ndjson')
+    queue = _jobs()
+    try:
+        page = queue.results(job_id, cursor, JOBS_PAGE_LIMIT if ndjson else limit)
+    except JobNotFound:
+        return _job_not_found(job_id)
+    if not ndjson:
+        return jsonify(page)
+    
+    def lines(page):
+        # Uma página por pedaço: o compressor faz flush por pedaço, não por linha
+        while True:
+            yield b''.join(dumps(item) + b'\n' for item in page['items'])
+            if page['next_cursor'] is None:
+                return
+            try:
+                page = queue.results(job_id, page['next_cursor'], JOBS_PAGE_LIMIT)
+            except JobNotFound:
+                # Job expirou durante o stream
+                return
+    
+    return app.response_class(lines(page), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Progresso do job em server-sent events ('progress' a cada mudança, depois 'done')"""
+    from job_queue import JobNotFound, FINAL_JOB_STATES
+    
+    queue = _jobs()
+    try:
+        queue.status(job_id)
+    except JobNotFound:
+        return _job_not_found(job_id)
+    
+    def events():
+        job = None
+        for job in queue.watch(job_id):
+            yield sse_event('progress', job)
+        if job is not None and job['status'] in FINAL_JOB_STATES:
+            yield sse_event('done', job)
+    
+    return app.response_class(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
-# Para Vercel Serverless Functions
-def handler(request):
-    with app.test_request_context(path=request.url, method=request.method):
-        return app.full_dispatch_request()
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def job_cancel(job_id):
+    """Cancelar job; itens não processados ficam como 'cancelled'"""
+    from job_queue import JobNotFound
+    
+    try:
+        return jsonify(_job_body(_jobs().cancel(job_id)))
+    except JobNotFound:
+        return _job_not_found(job_id)
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Métricas internas da API"""
+    from response_cache import get_response_cache
+    from job_queue import existing_job_queue
+    
+    response_cache = get_response_cache()
+    # Ler métricas não cria o banco de jobs nem sobe os workers
+    job_queue = existing_job_queue()
+    return jsonify({
+        'status': 'success',
+        'near_duplicate_index': near_duplicate_index.stats(),
+        'live_sessions': live_sessions.stats(),
+        'llm_response_cache': response_cache.stats() if response_cache is not None else None,
+        'jobs': job_queue.stats() if job_queue is not None else None,
+        'admission': admission.stats(),
+        'compression': response_compression.stats(),
+        'timestamp': datetime.now().isoformat()
+    })
 
-# Export para Vercel
-from werkzeug.wrappers import Response
+# AWS Lambda (API Gateway, Function URL, ALB) e bridge da Vercel: o evento vira
+# environ WSGI direto. Na Vercel com @vercel/python a app WSGI (`app`) é usada.
+from serverless import ServerlessAdapter
 
-def lambda_handler(event, context):
-    return handler(event)
\ No newline at end of file
+lambda_handler = ServerlessAdapter(app)
@@ -0,0 +1,336 @@
+# Variante ASGI da API (/api/analyze e /api/health, mesmo contrato da app Flask).
+# I/O (leitura do corpo, uploads) fica no event loop; classificação, geração de
+# resposta e extração de arquivos rodam em um pool de processos limitado, então
+# um upload lento ou um email grande não seguram os demais requests.
+#
+# Execução (requer um servidor ASGI, ex.: pip install uvicorn):
+#     uvicorn asgi:app --app-dir api --port 8000
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import tempfile
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import parse_qs
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+# O pacote utils importa dependências opcionais (nltk, PyPDF2); só o leitor de arquivos é usado
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'utils'))
+
+import analyze
+from id_generator import new_protocol, set_worker_id
+from json_stream import JSONStreamScanner, MalformedJSON
+from fast_json import JSONTemplate, dumps
+
+logger = logging.getLogger(__name__)
+
+# Processos do pool de CPU e requests aguardando por processo antes de segurar novos
+CPU_WORKERS = int(os.getenv('ASGI_CPU_WORKERS', str(os.cpu_count() or 1)))
+QUEUE_PER_WORKER = int(os.getenv('ASGI_QUEUE_PER_WORKER', '4'))
+# Limite de uploads multipart; corpos JSON seguem o limite da API (analyze.MAX_BODY_BYTES)
+MAX_BODY_BYTES = int(os.getenv('ASGI_MAX_BODY_BYTES', str(10 * 1024 * 1024)))
+
+ENDPOINTS = ['/api/analyze', '/api/health']
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+]
+PREFLIGHT_HEADERS = CORS_HEADERS + [
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type'),
+]
+
+
+class RequestError(Exception):
+    """Erro do cliente, respondido com `status` e corpo JSON"""
+
+    def __init__(self, status, body):
+        super().__init__(body.get('message', ''))
+        self.status = status
+        self.body = body
+
+
+# ---------------------------------------------------------------------------
+# Trabalho de CPU (executado nos processos do pool)
+# ---------------------------------------------------------------------------
+
+def _init_pool_worker():
+    # Filhos herdariam o AUTOU_WORKER_ID do pai e repetiriam os IDs dele:
+    # ficam sem worker id e recebem o protocolo já gerado pelo processo principal
+    set_worker_id(None)
+
+
+def _warmup_worker():
+    """Carregar léxicos e templates no processo antes do primeiro request"""
+    analyze.classify_email_professional('Olá, preciso de ajuda com um erro no sistema. Podem verificar?')
+    return os.getpid()
+
+
+def extract_upload(filename, content):
+    """Extrair texto de um arquivo enviado (.txt, .pdf, .eml, .msg)"""
+    from file_reader import FileProcessor
+
+    suffix = os.path.splitext(filename or '')[1].lower() or '.txt'
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(content)
+        path = f.name
+    try:
+        result = FileProcessor().process_file(path)
+    finally:
+        os.unlink(path)
+
+    if not result['success']:
+        raise RequestError(400, {'error': 'Arquivo inválido', 'message': result.get('error', '')})
+    return result['content']
+
+
+def analyze_request(text, multipart=None, start_time=None, protocol=None):
+    """Validar e analisar o texto; devolve (status, corpo)
+
+    Com `multipart` ((content-type, corpo)), o formulário é lido aqui e o
+    texto vem do campo 'text' ou do arquivo enviado. `protocol` vem do
+    processo principal: os processos do pool não emitem IDs.
+    """
+    try:
+        if multipart is not None:
+            text, upload = parse_multipart(*multipart)
+            if upload is not None:
+                text = extract_upload(*upload)
+    except RequestError as e:
+        return e.status, e.body
+
+    error = analyze.text_error(text)
+    if error is not None:
+        return 400, error
+
+    try:
+        return 200, analyze.analyze_email(text, start_time, protocol)
+    except Exception as e:
+        return 500, analyze.processing_error(str(e))
+
+
+def parse_multipart(content_type, body):
+    """Campos de multipart/form-data: (texto, (nome do arquivo, bytes) ou None)"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    text = ''
+    upload = None
+    for part in message.iter_parts():
+        if part.get_filename():
+            if upload is None:
+                upload = (part.get_filename(), part.get_payload(decode=True) or b'')
+        elif part.get_param('name', header='content-disposition') == 'text':
+            text = part.get_content()
+    return text, upload
+
+
+# ---------------------------------------------------------------------------
+# Event loop
+# ---------------------------------------------------------------------------
+
+class CpuPool:
+    """Pool de processos com número limitado de tarefas em andamento"""
+
+    def __init__(self, workers=CPU_WORKERS, queue_per_worker=QUEUE_PER_WORKER):
+        self.workers = workers
+        # Processos criados por fork herdariam os sockets dos clientes já conectados
+        # (a conexão não fecha enquanto o filho viver); forkserver/spawn partem limpos
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(start_method)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_pool_worker
+        )
+        self.slots = asyncio.Semaphore(workers * queue_per_worker)
+
+    async def warmup(self):
+        """Subir e aquecer todos os processos"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.executor, _warmup_worker) for _ in range(self.workers)
+        ])
+
+    async def run(self, func, *args):
+        async with self.slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_pool():
+    """Pool criado no startup (lifespan) ou no primeiro request"""
+    global _pool
+    if _pool is None:
+        _pool = CpuPool()
+    return _pool
+
+
+async def _send_json(send, status, body, headers=CORS_HEADERS):
+    payload = body if isinstance(body, bytes) else dumps(body)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode('ascii')),
+        ] + headers
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+def _header(scope, name):
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+async def _read_body(scope, receive, max_bytes, scanner=None):
+    """Ler o corpo sem ultrapassar `max_bytes`, verificando o JSON a cada pedaço"""
+    too_large = RequestError(413, {
+        'error': 'Requisição muito grande',
+        'message': f'Limite de {max_bytes} bytes por requisição'
+    })
+
+    content_length = _header(scope, b'content-length')
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ConnectionResetError('cliente desconectou')
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        if scanner is not None:
+            try:
+                scanner.feed(chunk)
+            except MalformedJSON as e:
+                raise RequestError(400, {'error': 'JSON inválido', 'message': str(e)})
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+def _parse_body(media_type, body, scanner=None):
+    """Texto do email de corpos JSON ou de formulário simples"""
+    if media_type == 'application/json':
+        try:
+            scanner.close()
+            data = json.loads(body)
+        except ValueError as e:
+            raise RequestError(400, {'error': 'JSON inválido', 'message': str(e)})
+        text = data.get('text')
+        return text if isinstance(text, str) else ''
+
+    if media_type == 'application/x-www-form-urlencoded':
+        fields = parse_qs(body.decode('utf-8', errors='replace'))
+        return (fields.get('text') or [''])[0]
+
+    return ''
+
+
+async def _analyze(scope, receive, send):
+    start_time = time.time()
+    content_type = _header(scope, b'content-type') or ''
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    try:
+        if media_type == 'multipart/form-data':
+            # Formulário e arquivo são lidos no pool
+            body = await _read_body(scope, receive, MAX_BODY_BYTES)
+            text, multipart = None, (content_type, body)
+        else:
+            scanner = JSONStreamScanner() if media_type == 'application/json' else None
+            body = await _read_body(scope, receive, analyze.MAX_BODY_BYTES, scanner)
+            text, multipart = _parse_body(media_type, body, scanner), None
+    except RequestError as e:
+        await _send_json(send, e.status, e.body)
+        return
+
+    # Textos inválidos são rejeitados sem passar pelo pool
+    if multipart is None:
+        error = analyze.text_error(text)
+        if error is not None:
+            await _send_json(send, 400, error)
+            return
+
+    status, response = await get_pool().run(analyze_request, text, multipart, start_time, new_protocol())
+    if status == 200:
+        analyze.with_api_info(response)
+    await _send_json(send, status, response)
+
+
+_health = None
+
+
+def _health_body():
+    """Health check com a parte fixa serializada na primeira chamada"""
+    global _health
+    if _health is None:
+        _health = JSONTemplate(dict(
+            analyze.HEALTH_INFO,
+            server='asgi',
+            endpoints=ENDPOINTS,
+            cpu_workers=get_pool().workers
+        ))
+    return _health.render(timestamp=datetime.now().isoformat())
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await get_pool().warmup()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            global _pool
+            if _pool is not None:
+                _pool.shutdown()
+                _pool = None
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """Aplicação ASGI"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path = scope['path']
+    method = scope['method']
+
+    if path not in ENDPOINTS:
+        await _send_json(send, 404, {'error': 'Endpoint não encontrado', 'path': path})
+    elif method == 'OPTIONS':
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-length', b'0')] + PREFLIGHT_HEADERS})
+        await send({'type': 'http.response.body', 'body': b''})
+    elif path == '/api/health' and method == 'GET':
+        await _send_json(send, 200, _health_body())
+    elif path == '/api/analyze' and method == 'POST':
+        try:
+            await _analyze(scope, receive, send)
+        except ConnectionResetError:
+            logger.info('Cliente desconectou antes do fim do upload')
+    else:
+        await _send_json(send, 405, {'error': 'Método não permitido', 'method': method})
@@ -1,16 +1,23 @@
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 import os
+import sys
 import logging
 from datetime import datetime
 import re
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from static_assets import StaticAssets
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
 
+# Build de backend/build_assets.py (dist/); sem build, servem-se os arquivos originais
+assets = StaticAssets()
+
 def classify_email(text):
     """Classificação de email"""
     text_lower = text.lower()
@@ -58,6 +65,8 @@ def generate_response(text, classification):
 # Servir o arquivo index.html como página principal
 @app.route('/')
 def index():
+    if assets.available:
+        return assets.response('index.html', request)
     try:
         return send_from_directory('.', 'index.html')
     except:
@@ -167,6 +176,14 @@ def index():
         </html>
         """
 
+# Assets com hash no nome: cache imutável e versões .br/.gz pré-comprimidas
+@app.route('/dist/<path:filename>')
+def dist_files(filename):
+    response = assets.response(filename, request) if assets.available else None
+    if response is None:
+        return jsonify({'error': 'Arquivo não encontrado'}), 404
+    return response
+
 # Servir arquivos estáticos (CSS, JS, etc.)
 @app.route('/<path:filename>')
 def static_files(filename):
@@ -278,7 +295,9 @@ if __name__ == '__main__':
     print("⚠️  Mantenha este terminal aberto")
     print("-" * 50)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Reloader e debugger só em desenvolvimento (FLASK_DEBUG=1);
+    # em produção use: python backend/start.py serve
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
 else:
     # Para Vercel
     application = app
\ No newline at end of file
@@ -0,0 +1,203 @@
+import math
+import time
+import threading
+from collections import OrderedDict, deque
+
+
+class Rejected(Exception):
+    """Request recusado pelo controle de admissão (429 ou 503 com Retry-After)"""
+
+    def __init__(self, status: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        # Retry-After é em segundos inteiros
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+def queue_time(request_start, now=None) -> float:
+    """Segundos desde X-Request-Start (carimbo do proxy na chegada), 0 se ausente/inválido
+
+    Aceita 't=<segundos>' (nginx ${msec}), milissegundos ou microssegundos.
+    """
+    if not request_start:
+        return 0.0
+    try:
+        value = float(request_start.strip().removeprefix('t='))
+    except ValueError:
+        return 0.0
+    if value > 1e14:
+        value /= 1e6
+    elif value > 1e11:
+        value /= 1e3
+    return max(0.0, (now or time.time()) - value)
+
+
+class TokenBucketLimiter:
+    """Limite de taxa por cliente (token bucket)
+
+    Cada chave recebe `rate` fichas por segundo, acumulando até `burst`;
+    cada request gasta uma. Guarda no máximo `max_clients` chaves (as
+    usadas há mais tempo são descartadas, o que só devolve o burst a elas).
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str):
+        """Gastar uma ficha de `key`; levanta Rejected (429) se não houver"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                raise Rejected(429, 'rate_limited', (1 - tokens) / self.rate)
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+    def clients(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+class ConcurrencyGate:
+    """Limite global de requests em processamento, com fila de espera limitada
+
+    Acima de `max_concurrent` os requests esperam em fila (ordem de
+    chegada). Um request é recusado (503) sem esperar se a fila estiver
+    cheia ou se a espera estimada (fila × tempo médio de serviço ÷ vagas)
+    passar de `max_wait`; e também se esperar `max_wait` sem ganhar vaga.
+    O tempo que o request já esperou antes de chegar à app (fila do proxy
+    e do servidor) é descontado do prazo. Assim os requests aceitos
+    continuam dentro da meta de latência.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, max_wait: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+        # Média móvel do tempo de serviço, para estimar a espera
+        self._service_time = 0.05
+
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.shed_timeout = 0
+        self.shed_stale = 0
+
+    def enter(self, waited: float = 0.0):
+        """Ocupar uma vaga (esperando, se preciso); levanta Rejected (503)
+
+        `waited`: segundos que o request já passou em filas antes da app.
+        """
+        budget = self.max_wait - waited
+        with self._lock:
+            if budget <= 0:
+                # Já passou do prazo antes de chegar aqui: processar só aumentaria a fila
+                self.shed_stale += 1
+                raise Rejected(503, 'stale', self._service_time)
+
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                self.admitted += 1
+                return
+
+            estimated_wait = (len(self._waiters) + 1) * self._service_time / self.max_concurrent
+            if len(self._waiters) >= self.max_queue:
+                self.shed_queue_full += 1
+                raise Rejected(503, 'queue_full', estimated_wait)
+            if estimated_wait > budget:
+                self.shed_deadline += 1
+                raise Rejected(503, 'deadline', estimated_wait)
+
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+            self.queued += 1
+
+        if waiter.wait(budget):
+            return
+
+        with self._lock:
+            if waiter.is_set():
+                # Vaga entregue entre o timeout e o lock
+                return
+            self._waiters.remove(waiter)
+            self.shed_timeout += 1
+            raise Rejected(503, 'timeout', self._service_time)
+
+    def leave(self, service_time: float):
+        """Liberar a vaga; passa direto para o primeiro da fila, se houver"""
+        with self._lock:
+            self._service_time += 0.1 * (service_time - self._service_time)
+            if self._waiters:
+                self._waiters.popleft().set()
+                self.admitted += 1
+            else:
+                self._active -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': self._active,
+                'waiting': len(self._waiters),
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'avg_service_ms': round(self._service_time * 1000, 2),
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'shed_queue_full': self.shed_queue_full,
+                'shed_deadline': self.shed_deadline,
+                'shed_timeout': self.shed_timeout,
+                'shed_stale': self.shed_stale
+            }
+
+
+class AdmissionController:
+    """Limite por cliente seguido da vaga global
+
+    Por processo: com vários workers (gunicorn) cada um aplica os seus
+    limites.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, max_concurrent: int = 8,
+                 max_queue: int = 32, max_wait: float = 1.0):
+        self.limiter = TokenBucketLimiter(rate, burst) if rate > 0 else None
+        self.gate = ConcurrencyGate(max_concurrent, max_queue, max_wait)
+        self.rate_limited = 0
+
+    def check_rate(self, client_key: str):
+        """Só o limite por cliente (para rotas que não ocupam CPU no request)"""
+        if self.limiter is None:
+            return
+        try:
+            self.limiter.acquire(client_key)
+        except Rejected:
+            self.rate_limited += 1
+            raise
+
+    def admit(self, client_key: str, waited: float = 0.0) -> float:
+        """Admitir o request; devolve o instante de início para `release`"""
+        self.check_rate(client_key)
+        self.gate.enter(waited)
+        return time.monotonic()
+
+    def release(self, started: float):
+        self.gate.leave(time.monotonic() - started)
+
+    def stats(self):
+        return dict(
+            self.gate.stats(),
+            rate_limited=self.rate_limited,
+            tracked_clients=self.limiter.clients() if self.limiter is not None else 0
+        )
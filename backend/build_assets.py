@@ -0,0 +1,173 @@
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIST_DIR = os.path.join(ROOT, 'dist')
+DIST_URL = '/dist/'
+MANIFEST_FILE = 'manifest.json'
+PAGES = ['index.html']
+
+# Só vale comprimir texto; imagens já vêm comprimidas
+COMPRESSIBLE = frozenset(['.html', '.css', '.js', '.svg', '.json', '.txt', '.map'])
+MIN_COMPRESS_BYTES = 256
+
+_REF_RE = re.compile(r'''(\b(?:href|src)\s*=\s*)(["'])([^"']+)\2''', re.I)
+_CSS_URL_RE = re.compile(r'''url\(\s*(["']?)([^"')]+)\1\s*\)''')
+_EXTERNAL_PREFIXES = ('http:', 'https:', '//', 'data:', '#', 'mailto:', 'tel:', 'javascript:')
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_variants(path, data: bytes):
+    """Gravar o arquivo e, se for texto, as versões .gz e .br"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    written = [path]
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE or len(data) < MIN_COMPRESS_BYTES:
+        return written
+
+    # mtime=0: mesmo conteúdo gera o mesmo .gz
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) < len(data):
+        with open(path + '.gz', 'wb') as f:
+            f.write(compressed)
+        written.append(path + '.gz')
+
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < len(data):
+            with open(path + '.br', 'wb') as f:
+                f.write(compressed)
+            written.append(path + '.br')
+    return written
+
+
+class AssetBuilder:
+    """Gera dist/ com assets renomeados pelo hash do conteúdo
+
+    Referências locais (href/src nas páginas, url() no CSS) que apontam
+    para arquivos existentes são trocadas por /dist/<caminho>.<hash>.<ext>;
+    as que não existem ficam como estão e são listadas em `missing`.
+    """
+
+    def __init__(self, root=ROOT, dist_dir=DIST_DIR):
+        self.root = os.path.abspath(root)
+        self.dist_dir = os.path.abspath(dist_dir)
+        self.assets = {}
+        # Hash de cada arquivo-fonte (páginas e assets), para detectar build desatualizado
+        self.sources = {}
+        self.missing = set()
+        self.written = []
+
+    def _resolve(self, ref, base_dir):
+        path = ref.split('#', 1)[0].split('?', 1)[0]
+        if not path or ref.startswith(_EXTERNAL_PREFIXES):
+            return None
+        if path.startswith('/'):
+            full = os.path.join(self.root, path.lstrip('/'))
+        else:
+            full = os.path.join(base_dir, path)
+        full = os.path.normpath(full)
+        if not full.startswith(self.root + os.sep) or full.startswith(self.dist_dir + os.sep):
+            return None
+        if not os.path.isfile(full):
+            self.missing.add(ref)
+            return None
+        return full
+
+    def _rewrite(self, pattern, text, base_dir, ref_group):
+        def replace(match):
+            ref = match.group(ref_group)
+            path = self._resolve(ref, base_dir)
+            if path is None:
+                return match.group(0)
+            return match.group(0).replace(ref, self.asset_url(path))
+        return pattern.sub(replace, text)
+
+    def asset_url(self, path):
+        """URL do asset com hash (gera o arquivo em dist/ na primeira vez)"""
+        rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+        if rel in self.assets:
+            return self.assets[rel]
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.sources[rel] = content_hash(data)
+        if path.lower().endswith('.css'):
+            # O hash do CSS inclui os hashes das imagens/fontes que ele referencia
+            text = self._rewrite(_CSS_URL_RE, data.decode('utf-8'), os.path.dirname(path), 2)
+            data = text.encode('utf-8')
+
+        stem, ext = os.path.splitext(rel)
+        hashed = f'{stem}.{content_hash(data)}{ext}'
+        self.written += write_variants(os.path.join(self.dist_dir, hashed), data)
+        self.assets[rel] = DIST_URL + hashed
+        return self.assets[rel]
+
+    def build_page(self, name):
+        path = os.path.join(self.root, name)
+        with open(path, 'rb') as f:
+            source = f.read()
+        self.sources[name] = content_hash(source)
+        html = self._rewrite(_REF_RE, source.decode('utf-8'), os.path.dirname(path), 3)
+        self.written += write_variants(os.path.join(self.dist_dir, name), html.encode('utf-8'))
+
+    def build(self, pages=PAGES):
+        if os.path.isdir(self.dist_dir):
+            shutil.rmtree(self.dist_dir)
+        os.makedirs(self.dist_dir)
+
+        for name in pages:
+            self.build_page(name)
+        manifest = {
+            'pages': list(pages),
+            # Hash de todos os arquivos-fonte: o servidor ignora um build desatualizado
+            'sources': self.sources,
+            'assets': self.assets
+        }
+        with open(os.path.join(self.dist_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        return manifest
+
+
+def main():
+    print("📦 BUILD DOS ASSETS ESTÁTICOS")
+    print("=" * 50)
+
+    builder = AssetBuilder()
+    manifest = builder.build()
+
+    for source, url in sorted(manifest['assets'].items()):
+        print(f"   ✅ {source} → {url}")
+    for ref in sorted(builder.missing):
+        print(f"   ⚠️  referência a arquivo inexistente mantida: {ref}")
+
+    original = sum(os.path.getsize(p) for p in builder.written if not p.endswith(('.gz', '.br')))
+    for suffix, label in (('.gz', 'gzip'), ('.br', 'brotli')):
+        variants = [p for p in builder.written if p.endswith(suffix)]
+        if variants:
+            plain = sum(os.path.getsize(p[:-len(suffix)]) for p in variants)
+            packed = sum(os.path.getsize(p) for p in variants)
+            print(f"   🗜️  {label}: {len(variants)} arquivo(s), {plain} → {packed} bytes")
+    if brotli is None:
+        print("   ℹ️  brotli não instalado (pip install brotli); gerado só .gz")
+
+    print(f"\n📁 {len(builder.written)} arquivo(s) em {os.path.relpath(DIST_DIR, os.getcwd())} ({original} bytes sem compressão)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+from template_engine import TemplateEngine, SNAPSHOT_FILE
+
+
+def write_snapshot(path):
+    data = TemplateEngine(check_interval=None).snapshot()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot de templates e regras para o cold start')
+    parser.add_argument('output', nargs='?', default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    print("📦 SNAPSHOT DE TEMPLATES E REGRAS (modo cold start)")
+    print("=" * 50)
+
+    data = write_snapshot(args.output)
+
+    start = time.perf_counter()
+    TemplateEngine(check_interval=None)
+    from_directory = time.perf_counter() - start
+    start = time.perf_counter()
+    TemplateEngine.from_snapshot(args.output)
+    from_snapshot = time.perf_counter() - start
+
+    print(f"   ✅ {len(data['templates'])} templates, {sum(len(r[2]) for r in data['rules'])} regras")
+    print(f"   📁 {os.path.relpath(args.output, os.getcwd())} ({os.path.getsize(args.output)} bytes)")
+    print(f"   ⚡ carga: diretório {from_directory * 1000:.2f}ms → snapshot {from_snapshot * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Disjuntor para dependências externas lentas ou instáveis
+
+    Fechado: chamadas liberadas. Após `failure_threshold` falhas seguidas
+    (chamadas lentas demais também contam como falha) o disjuntor
+    abre e recusa chamadas por `reset_timeout` segundos. Depois disso uma
+    única chamada de teste é liberada (meio-aberto): sucesso fecha, falha
+    reabre. Se o resultado da chamada de teste não for registrado em
+    `reset_timeout` segundos, ela é dada como perdida e o disjuntor reabre.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+        self.allowed = 0
+        self.rejected = 0
+        self.successes = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.trips = 0
+        self.lost_probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now):
+        if (self._state == HALF_OPEN and self._probe_in_flight
+                and now - self._probe_started >= self.reset_timeout):
+            # Chamada de teste sem resultado: reabre em vez de ficar meio-aberto para sempre
+            self.lost_probes += 1
+            logger.warning(f"Disjuntor '{self.name}' reaberto: chamada de teste sem resultado")
+            self._state = OPEN
+            self._opened_at = self._probe_started + self.reset_timeout
+            self._probe_in_flight = False
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Verificar se uma chamada pode ser feita agora"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                self.allowed += 1
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_started = now
+                self.allowed += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._failures = 0
+            if self._state != CLOSED:
+                logger.info(f"Disjuntor '{self.name}' fechado")
+            self._state = CLOSED
+            self._probe_in_flight = False
+
+    def release(self):
+        """Chamada liberada terminou sem resultado (ex.: cliente desconectou no meio)
+
+        Não conta como sucesso nem falha; se era a chamada de teste do
+        meio-aberto, a próxima chamada pode testar.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_slow_call(self):
+        """Registrar chamada que respondeu, mas acima do tempo aceitável"""
+        with self._lock:
+            self.slow_calls += 1
+        self.record_failure()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.trips += 1
+                    logger.warning(f"Disjuntor '{self.name}' aberto após {self._failures} falhas")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self._current_state(time.monotonic()),
+                'allowed': self.allowed,
+                'rejected': self.rejected,
+                'successes': self.successes,
+                'failures': self.failures,
+                'slow_calls': self.slow_calls,
+                'trips': self.trips,
+                'lost_probes': self.lost_probes
+            }
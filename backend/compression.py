@@ -0,0 +1,156 @@
+import os
+import time
+import zlib
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele só gzip
+    brotli = None
+
+# Abaixo disso o cabeçalho e o custo de CPU não compensam
+MIN_SIZE = int(os.getenv('API_COMPRESS_MIN_BYTES', '1024'))
+# Níveis para respostas geradas por request (os assets estáticos usam o máximo no build)
+GZIP_LEVEL = int(os.getenv('API_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('API_BROTLI_QUALITY', '4'))
+
+# SSE fica de fora: cada evento é pequeno e precisa sair na hora, e o flush por
+# evento custa CPU e bytes sem ganho; proxies também seguram streams comprimidos
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/plain')
+
+
+def available_encodings():
+    """Preferência quando o cliente aceita as duas"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """Codificação a usar segundo o Accept-Encoding do request (MIMEAccept do werkzeug), ou None"""
+    for encoding in available_encodings():
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+class StreamCompressor:
+    """Compressor incremental: cada `compress` devolve bytes já decodificáveis pelo cliente
+
+    O flush por pedaço mantém cada pedaço chegando na hora; por isso quem
+    gera o stream deve mandar pedaços grandes (ex.: uma página de resultados
+    NDJSON), nunca uma linha por vez.
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 31: formato gzip (cabeçalho + CRC), não zlib puro
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ResponseCompression:
+    """Compressão negociada das respostas da API (after_request do Flask)
+
+    Respostas prontas só são comprimidas a partir de `min_size` bytes;
+    streams NDJSON passam pelo StreamCompressor e SSE vai sem compressão.
+    Contabiliza bytes antes/depois e o tempo de CPU gasto, expostos em `stats()`.
+    """
+
+    def __init__(self, min_size: int = MIN_SIZE):
+        self.min_size = min_size
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.skipped_small = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def __call__(self, response, request):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None or request.method == 'HEAD':
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                with self._lock:
+                    self.skipped_small += 1
+                return response
+            started = time.thread_time()
+            body = compress(data, encoding)
+            self._count(len(data), len(body), time.thread_time() - started)
+            response.set_data(body)
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _stream(self, chunks, encoding):
+        compressor = StreamCompressor(encoding)
+        size_in = size_out = 0
+        cpu = 0.0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if not chunk:
+                    continue
+                started = time.thread_time()
+                body = compressor.compress(chunk)
+                cpu += time.thread_time() - started
+                size_in += len(chunk)
+                size_out += len(body)
+                yield body
+            body = compressor.finish()
+            size_out += len(body)
+            yield body
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+            self._count(size_in, size_out, cpu)
+
+    def _count(self, size_in, size_out, cpu):
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += size_in
+            self.bytes_out += size_out
+            self.cpu_seconds += cpu
+
+    def stats(self):
+        with self._lock:
+            return {
+                'encodings': list(available_encodings()),
+                'min_size': self.min_size,
+                'compressed': self.compressed,
+                'skipped_small': self.skipped_small,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+                'cpu_ms': round(self.cpu_seconds * 1000, 2)
+            }
@@ -0,0 +1,600 @@
+import os
+import sys
+import json
+import time
+import base64
+import binascii
+import random
+import argparse
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from email.header import Header
+from email.utils import format_datetime, formataddr
+
+from lexicons import LEXICONS
+from template_engine import TemplateEngine
+
+MAX_TEXT_CHARS = 50000  # limite da API (api/analyze.py)
+FORMATS = ('txt', 'eml', 'pdf', 'mbox')
+LABELS = ('Produtivo', 'Improdutivo')
+# Tópicos por classe: os mesmos nomes dos templates professional/<classe>_<tópico>
+TOPICS = {
+    'Produtivo': ('suporte', 'urgente', 'comercial'),
+    'Improdutivo': ('agradecimento', 'felicitacao', 'geral'),
+}
+# Arquivos por subdiretório (milhões de arquivos num diretório só travam o sistema de arquivos)
+FILES_PER_SHARD = 1000
+BASE_DATE = datetime(2025, 1, 1, 8, 0, tzinfo=timezone(timedelta(hours=-3)))
+
+# ---------------------------------------------------------------------------
+# Vocabulário: frases por (idioma, classe, tópico). Cada frase produtiva tem
+# ao menos um termo produtivo do léxico, e cada improdutiva um improdutivo
+# (conferido na importação), para o rótulo seguir o vocabulário do classificador.
+# ---------------------------------------------------------------------------
+
+SENTENCES = {
+    ('pt', 'Produtivo', 'suporte'): [
+        "Estou com um problema no sistema desde a atualização de ontem.",
+        "O relatório mensal não funciona e a exportação mostra uma mensagem de erro.",
+        "Preciso de ajuda para liberar o acesso de um novo usuário.",
+        "A tela de pagamentos travou duas vezes hoje pela manhã.",
+        "Vocês podem verificar o status do chamado {ticket}?",
+        "Encontramos uma falha na integração com o ERP ao importar as notas.",
+        "Tenho uma dúvida sobre como configurar as permissões do perfil financeiro.",
+        "O botão de salvar parou de funcionar depois que limpamos o cache.",
+        "Podem corrigir o cadastro do cliente {ticket}? O CNPJ está errado.",
+        "Precisamos resolver o bug do filtro de datas antes do fechamento.",
+        "Gostaria de um esclarecimento sobre a cobrança duplicada da fatura {ticket}.",
+    ],
+    ('pt', 'Produtivo', 'urgente'): [
+        "É urgente: o sistema está fora do ar para toda a equipe de vendas.",
+        "Temos uma emergência, os pedidos não estão sendo gravados desde as 9h.",
+        "Situação crítica no faturamento, precisamos de retorno imediato.",
+        "Por favor tratem como prioridade, o erro está bloqueando a operação.",
+        "O prazo com o cliente vence hoje e a integração continua com falha.",
+        "Preciso de suporte urgente para restaurar o acesso da filial {city}.",
+    ],
+    ('pt', 'Produtivo', 'comercial'): [
+        "Gostaria de agendar uma reunião para apresentar a proposta do próximo trimestre.",
+        "Segue o orçamento revisado conforme conversamos na última reunião.",
+        "Podemos revisar as cláusulas do contrato antes da assinatura?",
+        "O projeto de migração precisa de uma nova estimativa de prazo.",
+        "Qual o deadline para enviarmos a documentação do projeto?",
+        "Precisamos atualizar o escopo da proposta com os novos módulos.",
+        "Vocês conseguem implementar a integração com o banco até o fim do mês?",
+    ],
+    ('pt', 'Improdutivo', 'agradecimento'): [
+        "Muito obrigado pelo excelente atendimento de ontem!",
+        "Quero deixar meu agradecimento a toda a equipe pelo apoio neste ano.",
+        "Obrigada pela paciência e pela atenção de sempre.",
+        "Fica aqui a nossa gratidão pela parceria.",
+    ],
+    ('pt', 'Improdutivo', 'felicitacao'): [
+        "Parabéns pelo aniversário, muitas felicidades!",
+        "Feliz Natal e um próspero ano novo a todos!",
+        "Felicitações pela promoção, merecidíssima!",
+        "Boas festas para você e sua família.",
+        "Parabéns à equipe pelo lançamento do novo produto.",
+    ],
+    ('pt', 'Improdutivo', 'geral'): [
+        "Alguém topa um café depois do expediente de sexta?",
+        "Vamos marcar um almoço para comemorar o fim do trimestre?",
+        "Bom fim de semana a todos e boas férias para quem está saindo!",
+        "Segue uma piada que recebi hoje, achei muito engraçado.",
+        "O happy hour de hoje será no bar da esquina, às 18h.",
+        "Lembrando que segunda-feira é feriado, aproveitem o descanso.",
+    ],
+    ('en', 'Produtivo', 'suporte'): [
+        "I have a problem with the billing report since yesterday's release.",
+        "The invoice export is not working and shows an error message.",
+        "Could you help us restore access for a new user?",
+        "The dashboard keeps showing a crash screen after login.",
+        "Can you check the status of ticket {ticket}?",
+        "We found a bug in the date filter of the sales report.",
+        "I have a question about configuring permissions for the finance team.",
+        "The save button stopped working after the last update.",
+        "Please fix the customer record {ticket}, the tax ID is wrong.",
+    ],
+    ('en', 'Produtivo', 'urgente'): [
+        "This is urgent: the system is down for the whole sales team.",
+        "We have an emergency, orders have not been saved since 9am.",
+        "Critical issue in billing, we need an answer immediately.",
+        "Please treat this as a priority, the error is blocking operations.",
+    ],
+    ('en', 'Produtivo', 'comercial'): [
+        "I would like to schedule a meeting to present next quarter's proposal.",
+        "Please find the revised quote we discussed in the last meeting.",
+        "Can we review the contract clauses before signing?",
+        "The migration project needs a new deadline estimate.",
+        "We need to update the budget with the new modules.",
+    ],
+    ('en', 'Improdutivo', 'agradecimento'): [
+        "Thank you so much for the great service yesterday!",
+        "Many thanks to the whole team for this year.",
+        "I am really grateful for your patience and attention.",
+    ],
+    ('en', 'Improdutivo', 'felicitacao'): [
+        "Happy birthday, all the best!",
+        "Merry Christmas and a happy new year to everyone!",
+        "Congratulations on the promotion, well deserved!",
+        "Congrats to the team on the product launch.",
+    ],
+    ('en', 'Improdutivo', 'geral'): [
+        "Anyone up for coffee after Friday's sync?",
+        "Shall we book a team lunch to celebrate the end of the quarter?",
+        "Have a great weekend and enjoy your vacation!",
+        "Here is a funny joke I got today.",
+        "Happy hour today at the bar around the corner, 6pm.",
+    ],
+}
+
+# Texto neutro para alongar emails (histórico, logs, tabelas coladas)
+FILLER = {
+    'pt': [
+        "Seguem abaixo os detalhes que levantamos internamente.",
+        "Conforme combinado, repasso as informações para o time responsável.",
+        "Copio aqui o pessoal da área financeira para acompanhamento.",
+        "Os dados abaixo foram extraídos do ambiente de produção.",
+        "Fico no aguardo de um retorno.",
+    ],
+    'en': [
+        "Please see the details we gathered internally below.",
+        "As agreed, I am forwarding this to the team in charge.",
+        "Copying the finance team for visibility.",
+        "The data below was taken from the production environment.",
+        "Looking forward to hearing from you.",
+    ],
+}
+GREETINGS = {
+    'pt': ["Olá, {name},", "Bom dia, pessoal!", "Boa tarde,", "Prezados,", "Oi {name}, tudo bem?", "Caros,"],
+    'en': ["Hi {name},", "Hello team,", "Good morning,", "Dear all,", "Hey {name},"],
+}
+CLOSINGS = {
+    'pt': ["Atenciosamente,", "Abraços,", "Att,", "Cordialmente,", "Obrigado,"],
+    'en': ["Best regards,", "Cheers,", "Kind regards,", "Thanks,", "Best,"],
+}
+FIRST_NAMES = ['Maria', 'João', 'Ana', 'Carlos', 'Fernanda', 'Lucas', 'Juliana', 'Rafael', 'Patrícia', 'Bruno',
+               'Camila', 'Diego', 'John', 'Emily', 'Michael', 'Sarah', 'David', 'Laura']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Lima', 'Costa', 'Ferreira', 'Almeida',
+              'Smith', 'Johnson', 'Brown', 'Miller']
+COMPANIES = [('XYZ Ltda', 'xyz.com.br'), ('Comercial Andrade', 'andrade.com.br'), ('Grupo Horizonte', 'horizonte.com'),
+             ('Acme Corp', 'acme.com'), ('Nimbus Tecnologia', 'nimbus.io'), ('Vale Verde Alimentos', 'valeverde.com.br')]
+ROLES = {
+    'pt': ['Analista Financeira', 'Gerente de TI', 'Coordenador Comercial', 'Diretora de Operações', 'Assistente Administrativo'],
+    'en': ['Finance Analyst', 'IT Manager', 'Sales Coordinator', 'Operations Director', 'Office Assistant'],
+}
+CITIES = ['São Paulo', 'Campinas', 'Curitiba', 'Belo Horizonte', 'Recife', 'Porto Alegre']
+RECIPIENTS = ['suporte@autou.io', 'comercial@autou.io', 'equipe@autou.io', 'financeiro@autou.io']
+MAILERS = ['Microsoft Outlook 16.0', 'Apple Mail (2.3731)', 'Mozilla Thunderbird 115.6', None]
+LOG_LEVELS = ('INFO', 'WARN', 'ERROR')
+LOG_EVENTS = ('timeout', 'retry', 'connection reset', 'request ok')
+# PNG 1×1 válido, usado como "print da tela" anexado
+PNG_PIXEL = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                          '1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082')
+
+
+def _check_vocabulary():
+    """Cada frase precisa de um termo da sua classe e de nenhum da outra (em qualquer idioma)"""
+    productive = {kw for lexicon in LEXICONS.values() for kw, _ in lexicon.productive}
+    unproductive = {kw for lexicon in LEXICONS.values() for kw, _ in lexicon.unproductive}
+    for (language, label, topic), sentences in SENTENCES.items():
+        own, other = (productive, unproductive) if label == 'Produtivo' else (unproductive, productive)
+        for sentence in sentences:
+            lower = sentence.lower()
+            if not any(term in lower for term in own) or any(term in lower for term in other):
+                raise ValueError(f'Frase com vocabulário da classe errada ({language}/{label}/{topic}): {sentence}')
+    for sentence in (sentence for sentences in FILLER.values() for sentence in sentences):
+        if any(term in sentence.lower() for term in productive | unproductive):
+            raise ValueError(f'Texto neutro com termo do léxico: {sentence}')
+
+
+_check_vocabulary()
+
+
+def minimal_pdf(text: str, lines_per_page: int = 60, width: int = 95) -> bytes:
+    """PDF mínimo com o texto em Helvetica (WinAnsi), sem dependências"""
+    lines = []
+    for paragraph in text.split('\n'):
+        while len(paragraph) > width:
+            cut = paragraph.rfind(' ', 0, width)
+            cut = cut if cut > 0 else width
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        lines.append(paragraph)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    def escape(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    kids = []
+    for page in pages:
+        stream = 'BT /F1 10 Tf 12 TL 50 800 Td\n' + ''.join(f"({escape(line)}) '\n" for line in page) + 'ET'
+        stream = stream.encode('cp1252', errors='replace')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class SyntheticEmail:
+    """Email sintético com rótulo verdadeiro (classe, idioma e tópico)"""
+
+    __slots__ = ('index', 'id', 'label', 'language', 'topic', 'subject', 'sender_name', 'sender_address',
+                 'recipient', 'date', 'message_id', 'mailer', 'body', 'attachments', 'has_quote',
+                 'has_distractor', 'txt_headers')
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def text(self) -> str:
+        """Como o email chega colado na API ou em um .txt (cabeçalho opcional)"""
+        if not self.txt_headers:
+            return self.body
+        if self.language == 'pt':
+            header = f"De: {self.sender_name} <{self.sender_address}>\nPara: {self.recipient}\nAssunto: {self.subject}\n\n"
+        else:
+            header = f"From: {self.sender_name} <{self.sender_address}>\nTo: {self.recipient}\nSubject: {self.subject}\n\n"
+        return header + self.body
+
+    def to_eml(self) -> bytes:
+        """RFC 5322 montado à mão: o pacote email leva ~1ms por mensagem, caro para milhões"""
+        headers = [
+            f"From: {formataddr((self.sender_name, self.sender_address), charset='utf-8')}",
+            f"To: {self.recipient}",
+            f"Subject: {Header(self.subject, 'utf-8').encode() if not self.subject.isascii() else self.subject}",
+            f"Date: {format_datetime(self.date)}",
+            f"Message-ID: {self.message_id}",
+            "MIME-Version: 1.0",
+        ]
+        if self.mailer:
+            headers.append(f"X-Mailer: {self.mailer}")
+        # quoted-printable, como os clientes de email: 8bit quebra leitores que abrem o .eml como texto
+        text_part = [b'Content-Type: text/plain; charset="utf-8"', b'Content-Transfer-Encoding: quoted-printable',
+                     b'', binascii.b2a_qp(self.body.encode('utf-8'))]
+        if not self.attachments:
+            return '\n'.join(headers).encode('utf-8') + b'\n' + b'\n'.join(text_part) + b'\n'
+
+        # Boundary fixo pelo índice: o .eml sai idêntico a cada geração
+        boundary = f'=_corpus_{self.index:09d}'.encode('ascii')
+        headers.append(f'Content-Type: multipart/mixed; boundary="{boundary.decode()}"')
+        parts = [b'\n'.join(text_part)]
+        for name, mimetype, data in self.attachments:
+            parts.append(b'\n'.join([
+                f'Content-Type: {mimetype}; name="{name}"'.encode('ascii'),
+                b'Content-Transfer-Encoding: base64',
+                f'Content-Disposition: attachment; filename="{name}"'.encode('ascii'),
+                b'', base64.encodebytes(data)
+            ]))
+        delimiter = b'\n--' + boundary + b'\n'
+        return ('\n'.join(headers).encode('utf-8') + b'\n\n' + delimiter.lstrip(b'\n')
+                + delimiter.join(parts) + b'\n--' + boundary + b'--\n')
+
+    def to_pdf(self) -> bytes:
+        return minimal_pdf(self.text())
+
+    def label_record(self) -> dict:
+        return {
+            'id': self.id,
+            'index': self.index,
+            'label': self.label,
+            'language': self.language,
+            'topic': self.topic,
+            'chars': len(self.text()),
+            'subject': self.subject,
+            'has_quote': self.has_quote,
+            'has_distractor': self.has_distractor,
+            'attachments': [name for name, _, _ in self.attachments],
+        }
+
+
+class CorpusGenerator:
+    """Gerador determinístico de emails sintéticos produtivos/improdutivos (pt-BR e inglês)
+
+    Cada email usa um gerador aleatório próprio, semeado por (seed, índice):
+    o email N é sempre o mesmo, qualquer faixa de índices pode ser gerada
+    isoladamente (vários processos, retomada) e nada fica em memória entre
+    um email e outro.
+    """
+
+    def __init__(self, seed: int = 42, productive_ratio: float = 0.5, english_ratio: float = 0.3,
+                 max_chars: int = MAX_TEXT_CHARS, quote_ratio: float = 0.35, attachment_ratio: float = 0.25,
+                 distractor_ratio: float = 0.15):
+        self.seed = seed
+        self.productive_ratio = productive_ratio
+        self.english_ratio = english_ratio
+        self.max_chars = max_chars
+        self.quote_ratio = quote_ratio
+        self.attachment_ratio = attachment_ratio
+        self.distractor_ratio = distractor_ratio
+        # Respostas anteriores do suporte citadas nos emails em português
+        engine = TemplateEngine(check_interval=None)
+        self._replies = {name.split('/', 1)[1]: engine.get(name) for name in engine.names('professional')}
+
+    def generate(self, count: int, start: int = 0):
+        """Gerar `count` emails a partir do índice `start`, um por vez"""
+        for index in range(start, start + count):
+            yield self.email(index)
+
+    def email(self, index: int) -> SyntheticEmail:
+        rng = random.Random(f'{self.seed}:{index}')
+        label = LABELS[0] if rng.random() < self.productive_ratio else LABELS[1]
+        language = 'en' if rng.random() < self.english_ratio else 'pt'
+        topic = rng.choice(TOPICS[label])
+
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        company, domain = rng.choice(COMPANIES)
+        sender_name = f'{first} {last}'
+        ticket = f'#{rng.randint(1000, 99999)}'
+        date = BASE_DATE + timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+
+        sentences = SENTENCES[(language, label, topic)]
+        values = {'ticket': ticket, 'city': rng.choice(CITIES)}
+        subject_prefix = rng.choice(['', '', 'Re: ', 'RE: ', 'Fwd: ', 'RES: ' if language == 'pt' else 'FW: '])
+        subject = subject_prefix + rng.choice(sentences).format(**values).rstrip('.!?')[:70]
+
+        paragraphs = [rng.choice(GREETINGS[language]).format(name=rng.choice(FIRST_NAMES))]
+        paragraphs.append(' '.join(rng.choice(sentences).format(**values) for _ in range(rng.randint(1, 3))))
+
+        attachments = []
+        if rng.random() < self.attachment_ratio:
+            attachments = self._attachments(rng, language, ticket)
+            names = ', '.join(name for name, _, _ in attachments)
+            paragraphs.append(f'Segue em anexo: {names}.' if language == 'pt' else f'Please find attached: {names}.')
+
+        has_distractor = rng.random() < self.distractor_ratio
+        if has_distractor:
+            # Frase da outra classe (ex.: agradecimento no fim de um chamado)
+            other = LABELS[1] if label == LABELS[0] else LABELS[0]
+            paragraphs.append(rng.choice(SENTENCES[(language, other, rng.choice(TOPICS[other]))]).format(**values))
+
+        signature = self._signature(rng, language, sender_name, company, domain)
+        quote = self._quote(rng, language, label, topic, date, ticket) if rng.random() < self.quote_ratio else ''
+
+        # Comprimento alvo: maioria curta, cauda longa até max_chars
+        roll = rng.random()
+        if roll < 0.70:
+            target = rng.randint(150, 1500)
+        elif roll < 0.95:
+            target = rng.randint(1500, 8000)
+        else:
+            target = rng.randint(8000, self.max_chars)
+        fixed = sum(len(p) + 2 for p in paragraphs) + len(signature) + len(quote) + 200
+        filler = self._filler(rng, language, label, topic, values, target - fixed)
+        if filler:
+            paragraphs.insert(2, filler)
+
+        body = '\n\n'.join(paragraphs) + '\n\n' + signature + quote
+        txt_headers = rng.random() < 0.6
+        email = SyntheticEmail(
+            index=index, id=f'msg-{index:09d}', label=label, language=language, topic=topic,
+            subject=subject, sender_name=sender_name,
+            sender_address=f'{_ascii(first).lower()}.{_ascii(last).lower()}@{domain}',
+            recipient=rng.choice(RECIPIENTS), date=date, message_id=f'<{index}.{self.seed}@corpus.autou.io>',
+            mailer=rng.choice(MAILERS), body=body, attachments=attachments, has_quote=bool(quote),
+            has_distractor=has_distractor, txt_headers=txt_headers
+        )
+        overflow = len(email.text()) - self.max_chars
+        if overflow > 0:
+            email.body = body[:len(body) - overflow]
+        return email
+
+    def _filler(self, rng, language, label, topic, values, budget):
+        """Parágrafos para alongar o email: texto neutro com termos da classe, tabelas e (só nos produtivos) logs"""
+        parts, size = [], 0
+        sentences = SENTENCES[(language, label, topic)]
+        while size < budget:
+            kind = rng.random() if label == 'Produtivo' else rng.random() * 0.8
+            if kind < 0.5:
+                chunk = ' '.join(rng.choice(FILLER[language]) for _ in range(rng.randint(2, 4)))
+                chunk += ' ' + rng.choice(sentences).format(**values)
+            elif kind < 0.8:
+                chunk = '\n'.join(
+                    f"{bits % 28 + 1:02d}/{(bits >> 5) % 12 + 1:02d} {(bits >> 9) % 24:02d}:{(bits >> 14) % 60:02d}"
+                    f" pedido {(bits >> 20) % 90000 + 10000} valor R$ {(bits >> 37) % 99990 + 10},{(bits >> 54) % 100:02d}"
+                    for bits in self._rows(rng, 5, 30)
+                )
+            else:
+                chunk = '\n'.join(
+                    f"[{LOG_LEVELS[bits % 3]}] worker-{(bits >> 2) % 8 + 1} {LOG_EVENTS[(bits >> 5) % 4]} id={bits >> 32:08x}"
+                    for bits in self._rows(rng, 5, 40)
+                )
+            if size + len(chunk) > budget:
+                chunk = chunk[:max(0, budget - size)].rpartition(' ')[0]
+            parts.append(chunk)
+            size += len(chunk) + 2
+        return '\n\n'.join(part for part in parts if part)
+
+    @staticmethod
+    def _rows(rng, low, high):
+        """64 bits aleatórios por linha de tabela/log: um randint por campo dominava o tempo de geração"""
+        return [rng.getrandbits(64) for _ in range(rng.randint(low, high))]
+
+    def _signature(self, rng, language, name, company, domain):
+        closing = rng.choice(CLOSINGS[language])
+        style = rng.random()
+        if style < 0.15:
+            return f"{closing}\n{name.split()[0]}\n\n" + (
+                "Enviado do meu iPhone" if language == 'pt' else "Sent from my iPhone")
+        lines = [closing, name]
+        if style < 0.7:
+            lines.append(f"{rng.choice(ROLES[language])} - {company}")
+            lines.append(f"Tel: (11) {rng.randint(2000, 9999)}-{rng.randint(1000, 9999)}")
+            lines.append(f"www.{domain}")
+        if rng.random() < 0.3:
+            lines.insert(1, '-- ')
+        return '\n'.join(lines)
+
+    def _quote(self, rng, language, label, topic, date, ticket):
+        """Mensagem anterior citada: resposta do suporte (templates) ou email anterior do remetente"""
+        previous = date - timedelta(hours=rng.randint(1, 240))
+        if language == 'pt':
+            template = self._replies.get(f'{label.lower()}_{topic}') or rng.choice(list(self._replies.values()))
+            quoted = template.render({
+                'sender': rng.choice(FIRST_NAMES), 'protocol': ticket.lstrip('#'),
+                'timestamp': previous.strftime('%d/%m/%Y às %H:%M'), 'acknowledgment': 'Obrigado pela mensagem!'
+            })
+            header = f"Em {previous.strftime('%d/%m/%Y %H:%M')}, Suporte AutoU <suporte@autou.io> escreveu:"
+        else:
+            quoted = ' '.join(rng.choice(SENTENCES[(language, label, topic)]).format(ticket=ticket, city='')
+                              for _ in range(2))
+            header = f"On {previous.strftime('%a, %b %d, %Y at %I:%M %p')}, Support <support@autou.io> wrote:"
+        if rng.random() < 0.3:
+            # Estilo Outlook, sem ">"
+            return (f"\n\n-----Mensagem original-----\n" if language == 'pt' else "\n\n-----Original Message-----\n") + quoted
+        return f"\n\n{header}\n" + '\n'.join(f'> {line}' if line else '>' for line in quoted.split('\n'))
+
+    @staticmethod
+    def _attachments(rng, language, ticket):
+        attachments = []
+        for _ in range(rng.randint(1, 2)):
+            kind = rng.choice(['pdf', 'csv', 'png'])
+            if kind == 'pdf':
+                name = 'relatorio.pdf' if language == 'pt' else 'report.pdf'
+                data = minimal_pdf(f'{name} {ticket}\n' + '\n'.join(
+                    f'linha {i}: {rng.randint(0, 10 ** 6)}' for i in range(rng.randint(3, 20))))
+                attachments.append((name, 'application/pdf', data))
+            elif kind == 'csv':
+                rows = ['data;pedido;valor'] + [f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d};'
+                                                 f'{rng.randint(10000, 99999)};{rng.randint(1, 9999)}.{rng.randint(0, 99):02d}'
+                                                 for _ in range(rng.randint(5, 50))]
+                attachments.append(('planilha.csv' if language == 'pt' else 'sheet.csv', 'text/csv',
+                                    '\n'.join(rows).encode('utf-8')))
+            else:
+                attachments.append(('print.png' if language == 'pt' else 'screenshot.png', 'image/png', PNG_PIXEL))
+        return attachments
+
+
+def _ascii(value: str) -> str:
+    return unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+
+
+class CorpusWriter:
+    """Grava o corpus em disco conforme é gerado (memória constante)
+
+    Arquivos .txt/.eml/.pdf vão em <formato>/<lote de 1000>/<id>.<ext>;
+    o mbox é dividido em arquivos de `mbox_messages` mensagens. labels.jsonl
+    tem o rótulo verdadeiro de cada email, na ordem de geração.
+    """
+
+    def __init__(self, out_dir: str, formats=FORMATS, mbox_messages: int = 100000):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Formatos desconhecidos: {', '.join(sorted(unknown))}")
+        self.out_dir = out_dir
+        self.formats = tuple(formats)
+        self.mbox_messages = mbox_messages
+        self.written = 0
+        self.bytes = {fmt: 0 for fmt in self.formats}
+        self._mbox = None
+        self._mbox_part = None
+        os.makedirs(out_dir, exist_ok=True)
+        self._labels = open(os.path.join(out_dir, 'labels.jsonl'), 'a', encoding='utf-8')
+
+    def write(self, email: SyntheticEmail):
+        record = email.label_record()
+        files = {}
+        eml = email.to_eml() if {'eml', 'mbox'} & set(self.formats) else None
+        for fmt in self.formats:
+            if fmt == 'mbox':
+                files[fmt] = self._append_mbox(email, eml)
+                continue
+            data = {'txt': lambda: email.text().encode('utf-8'), 'eml': lambda: eml, 'pdf': email.to_pdf}[fmt]()
+            relative = os.path.join(fmt, f'{email.index // FILES_PER_SHARD:06d}', f'{email.id}.{fmt}')
+            path = os.path.join(self.out_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.bytes[fmt] += len(data)
+            files[fmt] = relative
+        record['files'] = files
+        self._labels.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.written += 1
+
+    def _append_mbox(self, email, eml):
+        part = email.index // self.mbox_messages
+        relative = os.path.join('mbox', f'corpus-{part:05d}.mbox')
+        if part != self._mbox_part:
+            if self._mbox is not None:
+                self._mbox.close()
+            os.makedirs(os.path.join(self.out_dir, 'mbox'), exist_ok=True)
+            self._mbox = open(os.path.join(self.out_dir, relative), 'ab')
+            self._mbox_part = part
+        # mboxo: linhas do corpo começando com "From " ganham ">"
+        body = eml.replace(b'\nFrom ', b'\n>From ')
+        separator = f"From {email.sender_address} {email.date.strftime('%a %b %d %H:%M:%S %Y')}\n".encode('ascii')
+        data = separator + body + (b'\n' if body.endswith(b'\n') else b'\n\n')
+        self._mbox.write(data)
+        self.bytes['mbox'] += len(data)
+        return relative
+
+    def close(self):
+        if self._mbox is not None:
+            self._mbox.close()
+        self._labels.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Corpus sintético de emails rotulados (pt-BR/inglês) '
+                                                 'para testes de carga, escala e acurácia')
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--start', type=int, default=0,
+                        help='primeiro índice (gerar faixas separadas em paralelo com a mesma seed)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='corpus')
+    parser.add_argument('--formats', default='txt,eml,mbox', help='txt, eml, pdf, mbox (separados por vírgula)')
+    parser.add_argument('--productive-ratio', type=float, default=0.5)
+    parser.add_argument('--english-ratio', type=float, default=0.3)
+    parser.add_argument('--max-chars', type=int, default=MAX_TEXT_CHARS)
+    parser.add_argument('--mbox-messages', type=int, default=100000, help='mensagens por arquivo mbox')
+    args = parser.parse_args(argv)
+
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    generator = CorpusGenerator(seed=args.seed, productive_ratio=args.productive_ratio,
+                                english_ratio=args.english_ratio, max_chars=args.max_chars)
+
+    print("📬 CORPUS SINTÉTICO DE EMAILS")
+    print("=" * 50)
+    print(f"   seed {args.seed} | índices {args.start}-{args.start + args.count - 1} | formatos: {', '.join(formats)}")
+
+    started = time.perf_counter()
+    labels = {label: 0 for label in LABELS}
+    with CorpusWriter(args.out, formats, args.mbox_messages) as writer:
+        for email in generator.generate(args.count, args.start):
+            writer.write(email)
+            labels[email.label] += 1
+            if writer.written % 10000 == 0:
+                elapsed = time.perf_counter() - started
+                print(f"   ⏳ {writer.written}/{args.count} ({writer.written / elapsed:.0f} emails/s)")
+
+    elapsed = time.perf_counter() - started
+    print(f"   ✅ {writer.written} emails em {elapsed:.1f}s ({writer.written / max(elapsed, 1e-9):.0f} emails/s)")
+    print(f"   🏷️  " + ', '.join(f'{label}: {count}' for label, count in labels.items()))
+    for fmt, size in writer.bytes.items():
+        print(f"   📁 {fmt}: {size / 1024 / 1024:.1f} MB")
+    print(f"   📝 rótulos: {os.path.join(args.out, 'labels.jsonl')}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
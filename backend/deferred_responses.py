@@ -0,0 +1,83 @@
+import time
+import threading
+from collections import OrderedDict
+
+PENDING = 'pending'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class DeferredResponseStore:
+    """Respostas do LLM que chegaram depois do orçamento de latência
+
+    Cada entrada guarda o Future da chamada em andamento, indexado pelo
+    request_id devolvido ao cliente, que pode buscar a versão melhorada
+    depois. Entradas expiram após `ttl_seconds` e a tabela é limitada a
+    `max_entries` (remove as mais antigas).
+    """
+
+    def __init__(self, max_entries=1000, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # request_id -> (criado, future, validar)
+        self._lock = threading.Lock()
+
+        self.stored = 0
+        self.retrieved = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _expire(self, now):
+        while self._entries:
+            request_id, (created, _, _) = next(iter(self._entries.items()))
+            if now - created < self.ttl_seconds:
+                break
+            del self._entries[request_id]
+            self.expired += 1
+
+    def add(self, request_id, future, validate=None):
+        """Registrar chamada ainda em andamento
+
+        `validate(texto)` pode rejeitar a resposta levantando exceção.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            while len(self._entries) >= self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+            self._entries[request_id] = (now, future, validate)
+            self.stored += 1
+
+    def get(self, request_id):
+        """Estado da resposta adiada: None se desconhecida ou expirada"""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._entries.get(request_id)
+        if entry is None:
+            return None
+
+        _, future, validate = entry
+        if not future.done():
+            return {'status': PENDING, 'response': None}
+
+        try:
+            response = future.result()
+            if validate is not None:
+                validate(response)
+        except Exception as e:
+            return {'status': FAILED, 'response': None, 'error': str(e)}
+
+        with self._lock:
+            self.retrieved += 1
+        return {'status': READY, 'response': response}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'stored': self.stored,
+                'retrieved': self.retrieved,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
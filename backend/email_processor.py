@@ -7,6 +7,8 @@ from nltk.stem import RSLPStemmer
 import logging
 import string
 
+from results import EmailFeatures
+
 logger = logging.getLogger(__name__)
 
 class EmailProcessor:
@@ -167,28 +169,24 @@ class EmailProcessor:
 
     def extract_email_features(self, text):
         """Extrair características específicas do email"""
-        features = {}
-        
-        features['length'] = len(text)
-        features['word_count'] = len(text.split())
-        
-        features['exclamation_marks'] = text.count('!')
-        features['question_marks'] = text.count('?')
-        features['capital_ratio'] = sum(1 for c in text if c.isupper()) / len(text) if text else 0
+        text_lower = text.lower()
         
         urgency_words = ['urgente', 'emergência', 'imediato', 'rápido', 'asap']
-        features['urgency_score'] = sum(1 for word in urgency_words if word in text.lower())
-        
         question_words = ['como', 'quando', 'onde', 'por que', 'qual', 'quem']
-        features['question_score'] = sum(1 for word in question_words if word in text.lower())
-        
         gratitude_words = ['obrigado', 'obrigada', 'agradeço', 'grato', 'grata']
-        features['gratitude_score'] = sum(1 for word in gratitude_words if word in text.lower())
-        
-        features['has_attachment'] = any(word in text.lower() for word in ['anexo', 'attachment', 'arquivo'])
-        features['has_link'] = 'http' in text.lower() or 'www.' in text.lower()
         
-        return features
+        return EmailFeatures(
+            length=len(text),
+            word_count=len(text.split()),
+            exclamation_marks=text.count('!'),
+            question_marks=text.count('?'),
+            capital_ratio=sum(1 for c in text if c.isupper()) / len(text) if text else 0,
+            urgency_score=sum(1 for word in urgency_words if word in text_lower),
+            question_score=sum(1 for word in question_words if word in text_lower),
+            gratitude_score=sum(1 for word in gratitude_words if word in text_lower),
+            has_attachment=any(word in text_lower for word in ['anexo', 'attachment', 'arquivo']),
+            has_link='http' in text_lower or 'www.' in text_lower
+        )
 
     def clean_for_display(self, text, max_length=500):
         """Limpar texto para exibição"""
@@ -0,0 +1,81 @@
+import os
+import json
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 'orjson' ou 'json'; padrão: orjson se estiver instalado
+ENCODER = os.getenv('API_JSON_ENCODER') or ('orjson' if orjson is not None else 'json')
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _stdlib_dumps(obj) -> bytes:
+    return _json_encoder.encode(obj).encode('utf-8')
+
+
+if ENCODER == 'orjson' and orjson is not None:
+    _dumps = orjson.dumps
+    loads = orjson.loads
+else:
+    ENCODER = 'json'
+    _dumps = _stdlib_dumps
+    loads = json.loads
+
+
+class RawJSON(bytes):
+    """Valor já serializado, inserido como está pelo dumps (só no primeiro nível de um dict)"""
+
+    __slots__ = ()
+
+
+def dumps(obj) -> bytes:
+    """Serializar em JSON compacto (UTF-8, sem ordenar chaves nem indentar)"""
+    if type(obj) is dict:
+        raw_keys = [key for key, value in obj.items() if type(value) is RawJSON]
+        if raw_keys:
+            rest = _dumps({key: value for key, value in obj.items() if type(value) is not RawJSON})
+            parts = [_dumps(key) + b':' + obj[key] for key in raw_keys]
+            if len(rest) > 2:
+                parts.insert(0, rest[1:-1])
+            return b'{' + b','.join(parts) + b'}'
+    return _dumps(obj)
+
+
+class JSONTemplate:
+    """Objeto JSON cuja parte fixa é serializada uma única vez
+
+    `render(**dinamicos)` só serializa os campos variáveis e os acrescenta
+    ao trecho fixo já em bytes.
+    """
+
+    __slots__ = ('_prefix',)
+
+    def __init__(self, static: dict):
+        self._prefix = dumps(static)[:-1] if static else b'{'
+
+    def render(self, **dynamic) -> RawJSON:
+        if not dynamic:
+            return RawJSON(self._prefix + b'}')
+        separator = b',' if len(self._prefix) > 1 else b''
+        return RawJSON(self._prefix + separator + _dumps(dynamic)[1:])
+
+
+class FastJSONProvider(JSONProvider):
+    """Provider de JSON do Flask (jsonify) usando o encoder configurado"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
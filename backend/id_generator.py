@@ -0,0 +1,147 @@
+import os
+import time
+import itertools
+import threading
+
+# IDs de 63 bits: | 41 bits ms desde EPOCH_MS | 10 bits worker | 12 bits sequência |
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+_BASE36 = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def to_base36(value: int) -> str:
+    if value == 0:
+        return '0'
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(_BASE36[remainder])
+    return ''.join(reversed(digits))
+
+
+def multi_worker_mode() -> bool:
+    """Vários processos atendendo o mesmo serviço (AUTOU_WORKERS ou WEB_CONCURRENCY > 1)"""
+    for name in ('AUTOU_WORKERS', 'WEB_CONCURRENCY'):
+        value = os.getenv(name, '')
+        if value.isdigit() and int(value) > 1:
+            return True
+    return False
+
+
+def default_worker_id():
+    """AUTOU_WORKER_ID, ou 0 num processo único
+
+    Com vários workers o id tem de vir da configuração (o launcher define
+    um por worker): sorteado ou derivado do pid ele se repete entre
+    processos. Sem ele devolve None e o gerador recusa emitir IDs.
+    """
+    value = os.getenv('AUTOU_WORKER_ID', '')
+    if value:
+        worker_id = int(value)
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f'AUTOU_WORKER_ID deve estar entre 0 e {MAX_WORKER_ID}')
+        return worker_id
+    return None if multi_worker_mode() else 0
+
+
+class _Millisecond:
+    """Milissegundo corrente e seu contador de sequência"""
+
+    __slots__ = ('ms', 'sequence')
+
+    def __init__(self, ms):
+        self.ms = ms
+        self.sequence = itertools.count()
+
+
+class SnowflakeGenerator:
+    """Gerador de IDs únicos e crescentes (timestamp, worker, sequência)
+
+    Caminho rápido sem lock: next() de itertools.count é atômico no
+    CPython, então threads no mesmo milissegundo recebem sequências
+    distintas. O lock só é usado para virar o milissegundo. Se o relógio
+    voltar ou a sequência esgotar, o gerador avança o próprio milissegundo
+    em vez de repetir IDs. Unicidade entre processos vem do worker id,
+    que deve ser distinto por worker (ver AUTOU_WORKER_ID); sem worker id
+    (None) o gerador levanta RuntimeError em vez de emitir IDs.
+    """
+
+    def __init__(self, worker_id=None):
+        self._current = _Millisecond(-1)
+        self.reset(default_worker_id() if worker_id is None else worker_id)
+
+    def next_id(self) -> int:
+        while True:
+            now = int(time.time() * 1000) - EPOCH_MS
+            current = self._current
+            if now <= current.ms:
+                sequence = next(current.sequence)
+                if sequence <= MAX_SEQUENCE:
+                    return (current.ms << (WORKER_BITS + SEQUENCE_BITS)) | self._worker_bits | sequence
+            self._advance(current, now)
+
+    def _advance(self, seen, now):
+        if self.worker_id is None:
+            # Sem worker id o milissegundo nunca avança: toda chamada chega aqui
+            raise RuntimeError(
+                'Worker id não configurado: com vários processos defina AUTOU_WORKER_ID '
+                'distinto por processo (backend/start.py serve já faz isso)'
+            )
+        with self._lock:
+            # Outra thread pode já ter avançado enquanto esperávamos o lock
+            if self._current is seen:
+                self._current = _Millisecond(max(now, seen.ms + 1))
+
+    def reset(self, worker_id):
+        """Trocar o worker id (None: processo sem IDs próprios, ex.: filho de fork)"""
+        if worker_id is not None and not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f'worker_id deve estar entre 0 e {MAX_WORKER_ID}')
+        self.worker_id = worker_id
+        self._worker_bits = (worker_id or 0) << SEQUENCE_BITS
+        if worker_id is None:
+            # Força o caminho lento, que recusa emitir IDs
+            self._current = _Millisecond(-1)
+        self._lock = threading.Lock()
+
+
+def decode_id(value: int):
+    """Decompor ID em (timestamp em ms Unix, worker id, sequência)"""
+    return (
+        (value >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS,
+        (value >> SEQUENCE_BITS) & MAX_WORKER_ID,
+        value & MAX_SEQUENCE
+    )
+
+
+_default_generator = SnowflakeGenerator()
+
+if hasattr(os, 'register_at_fork'):
+    # Filhos de fork herdam o worker id (e o AUTOU_WORKER_ID) do pai: ficam sem
+    # worker id até receberem um próprio (set_worker_id no post_fork do launcher)
+    os.register_at_fork(after_in_child=lambda: _default_generator.reset(None))
+
+
+def set_worker_id(worker_id):
+    """Definir o worker id do gerador do processo (None: processo não emite IDs)"""
+    _default_generator.reset(worker_id)
+
+
+def current_worker_id():
+    return _default_generator.worker_id
+
+
+def next_id() -> int:
+    return _default_generator.next_id()
+
+
+def new_protocol() -> str:
+    """Número de protocolo de atendimento (ex.: AU3F9K2M1Q0A)"""
+    return 'AU' + to_base36(_default_generator.next_id()).upper()
+
+
+def new_request_id() -> str:
+    return 'req_' + to_base36(_default_generator.next_id())
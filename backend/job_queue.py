@@ -0,0 +1,439 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from id_generator import next_id, to_base36
+
+logger = logging.getLogger(__name__)
+
+# Em serverless só /tmp é gravável
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'autou_jobs.sqlite3')
+
+# Estados do job: queued → running → completed | cancelled
+# Estados dos itens: pending → running → completed | failed | cancelled
+FINAL_JOB_STATES = ('completed', 'cancelled')
+ITEM_STATES = ('pending', 'running', 'completed', 'failed', 'cancelled')
+
+
+class InvalidItem(ValueError):
+    """Item que nunca vai dar certo (ex.: texto vazio): falha sem novas tentativas"""
+
+
+class JobNotFound(KeyError):
+    """Job inexistente ou já removido"""
+
+
+class JobQueue:
+    """Fila de jobs de análise em lote persistida em SQLite
+
+    Cada job é uma lista de itens processados em segundo plano por
+    `processor(payload) -> dict`. Até `max_running_jobs` jobs andam ao mesmo
+    tempo (os demais esperam na ordem de chegada); itens que levantam
+    exceção voltam para a fila com espera exponencial até `max_attempts`.
+    Itens em andamento têm um prazo (lease): se o processo morrer, outro
+    worker (inclusive de outro processo no mesmo arquivo) os retoma.
+    """
+
+    def __init__(self, processor: Callable[[dict], dict], path: str = DEFAULT_PATH,
+                 workers: int = 2, max_running_jobs: int = 2, max_attempts: int = 3,
+                 retry_delay: float = 1.0, lease_seconds: float = 60.0, batch_size: int = 16,
+                 ttl_seconds: float = 24 * 3600, poll_interval: float = 0.5):
+        self.processor = processor
+        self.path = path
+        self.workers = workers
+        self.max_running_jobs = max_running_jobs
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        # Itens reservados por transação: menos escritas no SQLite por item
+        self.batch_size = batch_size
+        self.ttl_seconds = ttl_seconds
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id TEXT PRIMARY KEY,'
+            ' status TEXT NOT NULL,'
+            ' total INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' started_at REAL,'
+            ' finished_at REAL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS items ('
+            ' job_id TEXT NOT NULL,'
+            ' seq INTEGER NOT NULL,'
+            ' item_id TEXT,'
+            ' payload TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' available_at REAL NOT NULL,'
+            ' lease_until REAL,'
+            ' result TEXT,'
+            ' error TEXT,'
+            ' PRIMARY KEY (job_id, seq))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS items_status ON items (job_id, status, seq)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS items_lease ON items (status, lease_until)')
+
+        self.submitted = 0
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    # ------------------------------------------------------------------
+    # API dos clientes
+    # ------------------------------------------------------------------
+
+    def submit(self, payloads) -> dict:
+        """Criar job com os itens de `payloads` (dicts; 'id' opcional) e devolver seu status"""
+        if not payloads:
+            raise ValueError('Job sem itens')
+
+        job_id = f'job_{to_base36(next_id())}'
+        now = time.time()
+        rows = [
+            (job_id, seq, str(payload.get('id')) if payload.get('id') is not None else None,
+             json.dumps(payload, ensure_ascii=False), now)
+            for seq, payload in enumerate(payloads)
+        ]
+
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    'INSERT INTO jobs (id, status, total, created_at) VALUES (?, ?, ?, ?)',
+                    (job_id, 'queued', len(rows), now)
+                )
+                self._conn.executemany(
+                    "INSERT INTO items (job_id, seq, item_id, payload, status, available_at)"
+                    " VALUES (?, ?, ?, ?, 'pending', ?)", rows
+                )
+                self._prune(now)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self.submitted += 1
+
+        self._wakeup.set()
+        return self.status(job_id)
+
+    def status(self, job_id: str) -> dict:
+        """Estado do job e contagem dos itens por estado"""
+        with self._lock:
+            job = self._conn.execute(
+                'SELECT status, total, created_at, started_at, finished_at FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+            if job is None:
+                raise JobNotFound(job_id)
+            counts = dict.fromkeys(ITEM_STATES, 0)
+            counts.update(self._conn.execute(
+                'SELECT status, COUNT(*) FROM items WHERE job_id = ? GROUP BY status', (job_id,)
+            ).fetchall())
+
+        status, total, created_at, started_at, finished_at = job
+        finished = counts['completed'] + counts['failed'] + counts['cancelled']
+        return {
+            'job_id': job_id,
+            'status': status,
+            'total': total,
+            'counts': counts,
+            'progress': round(finished / total, 4) if total else 1.0,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at
+        }
+
+    def results(self, job_id: str, cursor: int = 0, limit: int = 100) -> dict:
+        """Página de itens a partir da posição `cursor`, na ordem de envio
+
+        Itens ainda não processados aparecem só com o estado; `next_cursor`
+        é None na última página.
+        """
+        with self._lock:
+            if self._conn.execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone() is None:
+                raise JobNotFound(job_id)
+            rows = self._conn.execute(
+                'SELECT seq, item_id, status, attempts, result, error FROM items'
+                ' WHERE job_id = ? AND seq >= ? ORDER BY seq LIMIT ?',
+                (job_id, cursor, limit + 1)
+            ).fetchall()
+
+        items = []
+        for seq, item_id, status, attempts, result, error in rows[:limit]:
+            item = {'index': seq, 'id': item_id, 'status': status, 'attempts': attempts}
+            if result is not None:
+                item['result'] = json.loads(result)
+            if error is not None:
+                item['error'] = error
+            items.append(item)
+
+        return {
+            'job_id': job_id,
+            'items': items,
+            'next_cursor': rows[limit][0] if len(rows) > limit else None
+        }
+
+    def cancel(self, job_id: str) -> dict:
+        """Cancelar o job; itens já em processamento terminam normalmente"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if self._conn.execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone() is None:
+                    raise JobNotFound(job_id)
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ?"
+                    " WHERE id = ? AND status IN ('queued', 'running')", (now, job_id)
+                )
+                self._conn.execute(
+                    "UPDATE items SET status = 'cancelled' WHERE job_id = ? AND status = 'pending'", (job_id,)
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return self.status(job_id)
+
+    def watch(self, job_id: str, interval: Optional[float] = None, timeout: float = 300.0):
+        """Gerar o status do job a cada mudança, até terminar (ou `timeout`)"""
+        interval = interval or self.poll_interval
+        deadline = time.monotonic() + timeout
+        last = None
+        while True:
+            status = self.status(job_id)
+            snapshot = (status['status'], tuple(status['counts'].values()))
+            if snapshot != last:
+                last = snapshot
+                yield status
+            if status['status'] in FINAL_JOB_STATES or time.monotonic() >= deadline:
+                return
+            if not self._threads:
+                self.drain(interval)
+            else:
+                time.sleep(interval)
+
+    # ------------------------------------------------------------------
+    # Processamento
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Subir as threads de processamento (uma vez por processo)"""
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stop.clear()
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_batch():
+                    continue
+            except sqlite3.Error as e:
+                logger.warning(f"Fila de jobs: erro no SQLite: {str(e)}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def drain(self, budget_seconds: float) -> int:
+        """Processar itens na thread atual por até `budget_seconds`
+
+        Para ambientes sem threads em segundo plano (serverless): o próprio
+        polling do cliente faz o job andar. Devolve o número de itens.
+        """
+        deadline = time.monotonic() + budget_seconds
+        processed = 0
+        while time.monotonic() < deadline:
+            count = self.run_batch()
+            if not count:
+                break
+            processed += count
+        return processed
+
+    def run_batch(self) -> int:
+        """Reservar e processar um lote de itens; devolve quantos foram processados"""
+        batch = self._claim()
+        if not batch:
+            return 0
+
+        outcomes = []
+        for job_id, seq, payload, attempts in batch:
+            try:
+                result = self.processor(json.loads(payload))
+                outcomes.append((job_id, seq, attempts, result, None, False))
+            except InvalidItem as e:
+                outcomes.append((job_id, seq, attempts, None, str(e), False))
+            except Exception as e:
+                logger.warning(f"Job {job_id}, item {seq}: tentativa {attempts} falhou: {str(e)}")
+                outcomes.append((job_id, seq, attempts, None, str(e), True))
+
+        self._record(outcomes)
+        return len(batch)
+
+    def _has_work(self, now) -> bool:
+        """Consulta só de leitura: há algo que _claim() mudaria? (chamar com o lock)
+
+        Em WAL a leitura não pega o lock de escrita, então workers ociosos
+        não disputam com quem está enviando jobs.
+        """
+        return bool(self._conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM items WHERE status = 'running' AND lease_until < ?)"
+            " OR (EXISTS (SELECT 1 FROM jobs WHERE status = 'queued')"
+            "     AND (SELECT COUNT(*) FROM jobs WHERE status = 'running') < ?)"
+            " OR EXISTS (SELECT 1 FROM jobs j JOIN items i ON i.job_id = j.id AND i.status = 'pending'"
+            "            WHERE j.status = 'running' AND i.available_at <= ?)",
+            (now, self.max_running_jobs, now)
+        ).fetchone()[0])
+
+    def _claim(self):
+        with self._lock:
+            now = time.time()
+            if not self._has_work(now):
+                return []
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Itens de um worker que morreu no meio do lote
+                self._conn.execute(
+                    "UPDATE items SET status = 'pending', lease_until = NULL"
+                    " WHERE status = 'running' AND lease_until < ?", (now,)
+                )
+
+                running = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running'").fetchone()[0]
+                if running < self.max_running_jobs:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ? WHERE id IN"
+                        " (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT ?)",
+                        (now, self.max_running_jobs - running)
+                    )
+
+                batch = self._conn.execute(
+                    "SELECT i.job_id, i.seq, i.payload, i.attempts + 1 FROM jobs j"
+                    " JOIN items i ON i.job_id = j.id AND i.status = 'pending'"
+                    " WHERE j.status = 'running' AND i.available_at <= ?"
+                    " ORDER BY j.created_at, i.seq LIMIT ?",
+                    (now, self.batch_size)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE items SET status = 'running', attempts = ?, lease_until = ? WHERE job_id = ? AND seq = ?",
+                    [(attempts, now + self.lease_seconds, job_id, seq) for job_id, seq, _, attempts in batch]
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return batch
+
+    def _record(self, outcomes):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for job_id, seq, attempts, result, error, retry in outcomes:
+                    if result is not None:
+                        self._conn.execute(
+                            "UPDATE items SET status = 'completed', result = ?, error = NULL, lease_until = NULL"
+                            " WHERE job_id = ? AND seq = ?",
+                            (json.dumps(result, ensure_ascii=False), job_id, seq)
+                        )
+                        self.processed += 1
+                    elif retry and attempts < self.max_attempts:
+                        # Espera exponencial: retry_delay, 2x, 4x...
+                        self._conn.execute(
+                            "UPDATE items SET status = 'pending', error = ?, lease_until = NULL, available_at = ?"
+                            " WHERE job_id = ? AND seq = ?",
+                            (error, now + self.retry_delay * 2 ** (attempts - 1), job_id, seq)
+                        )
+                        self.retried += 1
+                    else:
+                        self._conn.execute(
+                            "UPDATE items SET status = 'failed', error = ?, lease_until = NULL"
+                            " WHERE job_id = ? AND seq = ?", (error, job_id, seq)
+                        )
+                        self.failed += 1
+
+                for job_id in {outcome[0] for outcome in outcomes}:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'completed', finished_at = ? WHERE id = ? AND status = 'running'"
+                        " AND NOT EXISTS (SELECT 1 FROM items WHERE job_id = ? AND status IN ('pending', 'running'))",
+                        (now, job_id, job_id)
+                    )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+        # Job concluído libera vaga para o próximo da fila
+        self._wakeup.set()
+
+    def _prune(self, now):
+        expired = [row[0] for row in self._conn.execute(
+            "SELECT id FROM jobs WHERE status IN ('completed', 'cancelled') AND finished_at <= ?",
+            (now - self.ttl_seconds,)
+        ).fetchall()]
+        if expired:
+            self._conn.executemany('DELETE FROM items WHERE job_id = ?', [(job_id,) for job_id in expired])
+            self._conn.executemany('DELETE FROM jobs WHERE id = ?', [(job_id,) for job_id in expired])
+
+    def stats(self):
+        with self._lock:
+            jobs = dict(self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        return {
+            'jobs': jobs,
+            'workers': len(self._threads),
+            'submitted': self.submitted,
+            'items_processed': self.processed,
+            'items_retried': self.retried,
+            'items_failed': self.failed
+        }
+
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def existing_job_queue() -> Optional[JobQueue]:
+    """Fila do processo se já foi criada (None se nenhum job passou por aqui)"""
+    return _default_queue
+
+
+def get_job_queue(processor: Callable[[dict], dict]) -> JobQueue:
+    """Fila compartilhada pelo processo, configurada pelas variáveis JOBS_*"""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            # Em serverless não há thread em segundo plano entre invocações: o polling processa
+            serverless = bool(os.getenv('VERCEL') or os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
+            _default_queue = JobQueue(
+                processor,
+                path=os.getenv('JOBS_DB_PATH') or DEFAULT_PATH,
+                workers=int(os.getenv('JOBS_WORKERS', '0' if serverless else '2')),
+                max_running_jobs=int(os.getenv('JOBS_MAX_RUNNING', '2')),
+                max_attempts=int(os.getenv('JOBS_MAX_ATTEMPTS', '3')),
+                ttl_seconds=float(os.getenv('JOBS_TTL_SECONDS', str(24 * 3600)))
+            )
+        return _default_queue
@@ -0,0 +1,143 @@
+import re
+import json
+
+# Cada leitura bloqueia até completar o pedaço: pedaços pequenos rejeitam mais cedo
+CHUNK_SIZE = 8 * 1024
+MAX_DEPTH = 32
+
+# Trechos que podem ser pulados de uma vez (regex em C, sem laço por byte)
+_WHITESPACE_RUN = re.compile(rb'[ \t\r\n]*')
+# Conteúdo de string com escapes, até a aspa que a fecha
+_STRING_RUN = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+# Espaços, números e as letras de true/false/null
+_SCALAR_RUN = re.compile(rb'[ \t\r\n0-9+\-.eEtrufalsn]*')
+
+_OPEN = {ord('{'): ord('}'), ord('['): ord(']')}
+_CLOSE = frozenset(_OPEN.values())
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_SEPARATORS = frozenset(b',:')
+
+
+class BodyTooLarge(ValueError):
+    """Corpo maior que o limite (413)"""
+
+
+class MalformedJSON(ValueError):
+    """Corpo que não é um objeto JSON válido (400)"""
+
+
+class JSONStreamScanner:
+    """Verificação incremental da sintaxe de um objeto JSON
+
+    Recebe o corpo em pedaços e rejeita assim que um pedaço torna o
+    documento impossível: primeiro caractere diferente de '{', caractere
+    fora do alfabeto do JSON, fechamento trocado, aninhamento acima de
+    `max_depth` ou dados após o fim do objeto. A decodificação completa
+    continua com json.loads, sobre no máximo o limite de bytes.
+    """
+
+    __slots__ = ('max_depth', 'stack', 'in_string', 'escape', 'started', 'done')
+
+    def __init__(self, max_depth: int = MAX_DEPTH):
+        self.max_depth = max_depth
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.done = False
+
+    def feed(self, chunk: bytes):
+        pos = 0
+        size = len(chunk)
+        while pos < size:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                    pos += 1
+                    continue
+                quote = chunk.find(b'"', pos)
+                if quote == -1:
+                    # String continua no próximo pedaço; guarda '\' pendente no fim
+                    backslashes = len(chunk) - len(chunk.rstrip(b'\\'))
+                    self.escape = min(backslashes, size - pos) % 2 == 1
+                    break
+                if quote == pos or chunk[quote - 1] != _BACKSLASH:
+                    self.in_string = False
+                    pos = quote + 1
+                    continue
+                # Aspa possivelmente escapada: regex percorre os escapes até a aspa real
+                pos = _STRING_RUN.match(chunk, pos).end()
+                if pos == size:
+                    break
+                if chunk[pos] == _QUOTE:
+                    self.in_string = False
+                else:
+                    self.escape = True  # '\' no fim do pedaço
+                pos += 1
+                continue
+
+            if not self.stack:
+                pos = _WHITESPACE_RUN.match(chunk, pos).end()
+                if pos == size:
+                    break
+                if self.done:
+                    raise MalformedJSON('Dados após o fim do JSON')
+                if chunk[pos] != ord('{'):
+                    raise MalformedJSON('Corpo JSON deve ser um objeto')
+                self.started = True
+                self.stack.append(ord('}'))
+                pos += 1
+                continue
+
+            pos = _SCALAR_RUN.match(chunk, pos).end()
+            if pos == size:
+                break
+            char = chunk[pos]
+            if char == _QUOTE:
+                self.in_string = True
+            elif char in _OPEN:
+                if len(self.stack) >= self.max_depth:
+                    raise MalformedJSON(f'JSON com mais de {self.max_depth} níveis')
+                self.stack.append(_OPEN[char])
+            elif char in _CLOSE:
+                if char != self.stack.pop():
+                    raise MalformedJSON('Fechamento de JSON inesperado')
+                if not self.stack:
+                    self.done = True
+            elif char not in _SEPARATORS:
+                raise MalformedJSON('Caractere inválido no JSON')
+            pos += 1
+
+    def close(self):
+        """Confirmar que o documento terminou"""
+        if not self.done:
+            raise MalformedJSON('JSON incompleto' if self.started else 'Corpo JSON vazio')
+
+
+def read_json(stream, max_bytes: int, content_length=None, chunk_size: int = CHUNK_SIZE):
+    """Ler e decodificar um objeto JSON de `stream` lendo no máximo `max_bytes`
+
+    Corpos com Content-Length acima do limite são recusados sem leitura;
+    os demais são lidos em pedaços, verificados a cada pedaço, e a leitura
+    para no primeiro byte além do limite ou no primeiro erro de sintaxe.
+    """
+    if content_length is not None and content_length > max_bytes:
+        raise BodyTooLarge(f'Limite de {max_bytes} bytes por requisição')
+
+    scanner = JSONStreamScanner()
+    body = bytearray()
+    while True:
+        chunk = stream.read(min(chunk_size, max_bytes + 1 - len(body)))
+        if not chunk:
+            break
+        body += chunk
+        if len(body) > max_bytes:
+            raise BodyTooLarge(f'Limite de {max_bytes} bytes por requisição')
+        scanner.feed(chunk)
+    scanner.close()
+
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise MalformedJSON(f'JSON inválido: {str(e)}')
@@ -0,0 +1,76 @@
+# Perfis de stopwords por idioma (palavras ambíguas como 'a', 'no', 'do',
+# 'as' e 'me' ficam de fora para não pesar para nenhum lado)
+STOPWORD_PROFILES = {
+    'pt': frozenset([
+        'de', 'que', 'não', 'uma', 'um', 'para', 'com', 'os', 'por', 'mais',
+        'dos', 'das', 'da', 'em', 'na', 'nas', 'nos', 'ao', 'aos', 'e', 'o',
+        'é', 'se', 'como', 'mas', 'foi', 'são', 'está', 'estou', 'você',
+        'vocês', 'nós', 'eu', 'meu', 'minha', 'seu', 'sua', 'pelo', 'pela',
+        'também', 'já', 'muito', 'isso', 'este', 'esta', 'esse', 'essa',
+        'ele', 'ela', 'tem', 'ser', 'há', 'quando', 'preciso', 'gostaria',
+        'obrigado', 'obrigada', 'olá', 'oi', 'bom', 'dia', 'sobre', 'até',
+        'prezado', 'prezada', 'atenciosamente', 'abraços', 'favor'
+    ]),
+    'en': frozenset([
+        'the', 'and', 'to', 'of', 'is', 'you', 'that', 'it', 'for', 'with',
+        'on', 'are', 'this', 'be', 'have', 'has', 'i', 'we', 'was', 'not',
+        'your', 'my', 'our', 'will', 'can', 'could', 'please', 'thanks',
+        'thank', 'would', 'from', 'at', 'hi', 'hello', 'dear', 'regards',
+        'an', 'or', 'but', 'if', 'us', 'they', 'what', 'when', 'there',
+        'been', 'just', 'about', 'need', 'best', 'sincerely', 'cheers'
+    ])
+}
+
+DEFAULT_LANGUAGE = 'pt'
+
+# Pontuação que costuma grudar no fim de uma stopword ('olá,', 'thanks!')
+_TRAILING_PUNCTUATION = ('', ',', '.', ';', ':', '!', '?', ')')
+
+# Perfis com as variantes pontuadas e capitalizadas, montados uma única vez
+# no import: assim basta um split(), sem lower() nem regex por request
+_PROFILE_TOKENS = {
+    language: frozenset(
+        cased + mark
+        for word in profile
+        for cased in (word, word.capitalize(), word.upper())
+        for mark in _TRAILING_PUNCTUATION
+    )
+    for language, profile in STOPWORD_PROFILES.items()
+}
+_ALL_TOKENS = frozenset().union(*_PROFILE_TOKENS.values())
+_DEFAULT_TOKENS = _PROFILE_TOKENS[DEFAULT_LANGUAGE]
+_OTHER_PROFILES = [
+    (language, tokens) for language, tokens in _PROFILE_TOKENS.items()
+    if language != DEFAULT_LANGUAGE
+]
+
+# Os primeiros ~20 tokens bastam para separar pt de en
+SAMPLE_SIZE = 128
+
+# Caracteres que praticamente só aparecem em português
+_PORTUGUESE_MARKS = frozenset('ãõçâêôàáéíóú' + 'ãõçâêôàáéíóú'.upper())
+
+
+def detect_language(text, sample_size=SAMPLE_SIZE):
+    """Detectar idioma do email ('pt' ou 'en') pelo perfil de stopwords"""
+    sample = text[:sample_size]
+    # Uma interseção com a união dos perfis; as contagens por idioma saem
+    # do punhado de stopwords encontradas
+    found = _ALL_TOKENS.intersection(sample.split())
+    if not found:
+        return DEFAULT_LANGUAGE
+
+    best = DEFAULT_LANGUAGE
+    best_score = len(found & _DEFAULT_TOKENS)
+    marks_checked = False
+    for language, tokens in _OTHER_PROFILES:
+        score = len(found & tokens)
+        if score > best_score and not marks_checked:
+            # Acentos típicos desempatam a favor do português; só olhamos
+            # quando outro idioma ameaça vencer (isascii() descarta rápido)
+            marks_checked = True
+            if not sample.isascii() and not _PORTUGUESE_MARKS.isdisjoint(sample):
+                best_score += 2
+        if score > best_score:
+            best, best_score = language, score
+    return best
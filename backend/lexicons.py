@@ -0,0 +1,129 @@
+from language_detector import DEFAULT_LANGUAGE
+
+
+class Lexicon:
+    """Léxico de classificação compilado para um idioma"""
+
+    __slots__ = ('language', 'productive', 'unproductive', 'urgent_terms',
+                 'keywords', 'max_keyword_length')
+
+    def __init__(self, language, productive, unproductive, urgent_terms):
+        self.language = language
+        # Tuplas (palavra, peso) na ordem de declaração, montadas uma única vez
+        self.productive = tuple(productive.items())
+        self.unproductive = tuple(unproductive.items())
+        self.urgent_terms = tuple(urgent_terms)
+        # Todos os termos do léxico, usados na contagem incremental
+        self.keywords = tuple(dict.fromkeys(
+            [kw for kw, _ in self.productive]
+            + [kw for kw, _ in self.unproductive]
+            + list(self.urgent_terms)
+        ))
+        self.max_keyword_length = max(len(kw) for kw in self.keywords)
+
+    def scan(self, text_lower):
+        """Retornar palavras-chave produtivas e improdutivas presentes no texto"""
+        productive_hits = [(kw, w) for kw, w in self.productive if kw in text_lower]
+        unproductive_hits = [(kw, w) for kw, w in self.unproductive if kw in text_lower]
+        return productive_hits, unproductive_hits
+
+    def has_urgency(self, text_lower):
+        """Verificar se o texto contém termos de urgência"""
+        return any(term in text_lower for term in self.urgent_terms)
+
+
+PORTUGUESE = Lexicon(
+    'pt',
+    productive={
+        # Problemas técnicos (peso alto)
+        'problema': 4, 'erro': 4, 'bug': 4, 'falha': 4, 'defeito': 3,
+        'não funciona': 5, 'parou de funcionar': 5, 'travou': 3,
+
+        # Suporte e ajuda (peso alto)
+        'suporte': 3, 'ajuda': 3, 'assistência': 3, 'socorro': 4,
+        'dúvida': 2, 'questão': 2, 'esclarecimento': 2,
+
+        # Urgência (peso muito alto)
+        'urgente': 5, 'emergência': 5, 'crítico': 5, 'imediato': 4,
+        'asap': 4, 'prioridade': 3, 'importante': 2,
+
+        # Negócios
+        'reunião': 2, 'meeting': 2, 'proposta': 3, 'orçamento': 3,
+        'contrato': 3, 'projeto': 2, 'deadline': 3, 'prazo': 3,
+
+        # Ações
+        'implementar': 2, 'desenvolver': 2, 'criar': 2, 'modificar': 2,
+        'corrigir': 3, 'resolver': 3, 'atualizar': 2, 'status': 2
+    },
+    unproductive={
+        # Felicitações
+        'parabéns': 4, 'felicitações': 4, 'congratulações': 3,
+
+        # Datas especiais
+        'aniversário': 3, 'natal': 4, 'ano novo': 4, 'festas': 2,
+
+        # Agradecimentos
+        'obrigado': 2, 'obrigada': 2, 'agradecimento': 3, 'gratidão': 3,
+
+        # Social
+        'café': 1, 'almoço': 1, 'jantar': 1, 'happy hour': 2,
+        'fim de semana': 1, 'feriado': 1, 'férias': 2,
+
+        # Entretenimento
+        'piada': 3, 'engraçado': 2, 'funny': 2, 'humor': 2
+    },
+    urgent_terms=['urgente', 'emergência']
+)
+
+ENGLISH = Lexicon(
+    'en',
+    productive={
+        # Problemas técnicos (peso alto)
+        'problem': 4, 'error': 4, 'bug': 4, 'failure': 4, 'issue': 3,
+        'not working': 5, 'stopped working': 5, 'crash': 3, 'broken': 3,
+
+        # Suporte e ajuda (peso alto)
+        'support': 3, 'help': 3, 'assistance': 3,
+        'question': 2, 'clarification': 2,
+
+        # Urgência (peso muito alto)
+        'urgent': 5, 'emergency': 5, 'critical': 5, 'immediately': 4,
+        'asap': 4, 'priority': 3, 'important': 2,
+
+        # Negócios
+        'meeting': 2, 'proposal': 3, 'quote': 3, 'budget': 3,
+        'contract': 3, 'project': 2, 'deadline': 3, 'invoice': 3,
+
+        # Ações
+        'implement': 2, 'develop': 2, 'create': 2, 'change': 2,
+        'fix': 3, 'resolve': 3, 'update': 2, 'status': 2
+    },
+    unproductive={
+        # Felicitações
+        'congratulations': 4, 'congrats': 4,
+
+        # Datas especiais
+        'birthday': 3, 'christmas': 4, 'new year': 4, 'holidays': 2,
+
+        # Agradecimentos
+        'thank you': 2, 'thanks': 2, 'gratitude': 3, 'grateful': 3,
+
+        # Social
+        'coffee': 1, 'lunch': 1, 'dinner': 1, 'happy hour': 2,
+        'weekend': 1, 'vacation': 2,
+
+        # Entretenimento
+        'joke': 3, 'funny': 2, 'humor': 2
+    },
+    urgent_terms=['urgent', 'emergency']
+)
+
+LEXICONS = {
+    PORTUGUESE.language: PORTUGUESE,
+    ENGLISH.language: ENGLISH
+}
+
+
+def get_lexicon(language):
+    """Obter léxico do idioma (português como padrão)"""
+    return LEXICONS.get(language) or LEXICONS[DEFAULT_LANGUAGE]
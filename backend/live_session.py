@@ -0,0 +1,169 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+from language_detector import detect_language, SAMPLE_SIZE
+from lexicons import get_lexicon
+
+MAX_TEXT_LENGTH = 50000
+
+
+def _word_bounds(text, start, end):
+    """Expandir [start, end) até espaços em branco (ou bordas do texto)"""
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
+
+
+class LiveSession:
+    """Estado incremental de classificação de um texto em edição"""
+
+    __slots__ = ('session_id', 'text', 'version', 'language', 'lexicon',
+                 'keyword_counts', 'question_count', 'exclamation_count',
+                 'word_count', 'last_seen', 'lock')
+
+    def __init__(self, session_id, text=''):
+        self.session_id = session_id
+        self.version = 0
+        self.last_seen = time.monotonic()
+        self.lock = threading.Lock()
+        self.reset(text)
+
+    def reset(self, text):
+        """Substituir o texto inteiro e recalcular todos os contadores"""
+        if len(text) > MAX_TEXT_LENGTH:
+            raise ValueError(f'Limite de {MAX_TEXT_LENGTH} caracteres excedido')
+
+        self.text = text
+        self.language = detect_language(text)
+        self.lexicon = get_lexicon(self.language)
+
+        text_lower = text.lower()
+        self.keyword_counts = {kw: text_lower.count(kw) for kw in self.lexicon.keywords}
+        self.question_count = text.count('?')
+        self.exclamation_count = text.count('!')
+        self.word_count = len(text.split())
+
+    def apply_delta(self, offset, delete, insert):
+        """Aplicar edição (remove `delete` caracteres em `offset` e insere `insert`)
+
+        Só a vizinhança da edição é reprocessada: qualquer ocorrência de
+        palavra-chave afetada está a menos de `max_keyword_length` caracteres
+        do trecho editado, e as palavras afetadas terminam no espaço mais
+        próximo de cada lado.
+        """
+        old = self.text
+        if offset < 0 or delete < 0 or offset + delete > len(old):
+            raise ValueError('Delta fora dos limites do texto')
+        if len(old) - delete + len(insert) > MAX_TEXT_LENGTH:
+            raise ValueError(f'Limite de {MAX_TEXT_LENGTH} caracteres excedido')
+
+        new = old[:offset] + insert + old[offset + delete:]
+        shift = len(insert) - delete
+
+        # Pontuação: basta olhar o trecho removido e o inserido
+        removed = old[offset:offset + delete]
+        self.question_count += insert.count('?') - removed.count('?')
+        self.exclamation_count += insert.count('!') - removed.count('!')
+
+        # Palavras: recontar apenas entre os espaços que cercam a edição
+        start, end = _word_bounds(old, offset, offset + delete)
+        self.word_count += len(new[start:end + shift].split()) - len(old[start:end].split())
+
+        self.text = new
+
+        # Idioma só pode mudar se a edição atingir a amostra do detector
+        if offset < SAMPLE_SIZE:
+            language = detect_language(new)
+            if language != self.language:
+                self.reset(new)
+                return
+
+        # Palavras-chave: janela com margem do maior termo do léxico
+        margin = self.lexicon.max_keyword_length - 1
+        start = max(0, offset - margin)
+        old_window = old[start:offset + delete + margin].lower()
+        new_window = new[start:offset + len(insert) + margin].lower()
+        counts = self.keyword_counts
+        for kw in self.lexicon.keywords:
+            diff = new_window.count(kw) - old_window.count(kw)
+            if diff:
+                counts[kw] += diff
+
+    def signals(self):
+        """Sinais no formato esperado pela função de score do classificador"""
+        counts = self.keyword_counts
+        lexicon = self.lexicon
+        return {
+            'language': self.language,
+            'productive_hits': [(kw, w) for kw, w in lexicon.productive if counts[kw] > 0],
+            'unproductive_hits': [(kw, w) for kw, w in lexicon.unproductive if counts[kw] > 0],
+            'has_urgency': any(counts[term] > 0 for term in lexicon.urgent_terms),
+            'question_count': self.question_count,
+            'exclamation_count': self.exclamation_count,
+            'word_count': self.word_count,
+            'char_count': len(self.text)
+        }
+
+
+class LiveSessionStore:
+    """Tabela limitada de sessões de classificação ao vivo, com expiração por inatividade"""
+
+    def __init__(self, max_sessions=1000, idle_seconds=300):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions = OrderedDict()  # ordem = última atividade
+        self._lock = threading.Lock()
+
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _expire(self, now):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_seen < self.idle_seconds:
+                break
+            del self._sessions[session.session_id]
+            self.expired += 1
+
+    def create(self, text=''):
+        """Criar sessão nova (remove a menos recente se a tabela estiver cheia)"""
+        session = LiveSession(uuid.uuid4().hex, text)
+
+        with self._lock:
+            self._expire(session.last_seen)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+            self._sessions[session.session_id] = session
+            self.created += 1
+
+        return session
+
+    def get(self, session_id):
+        """Obter sessão ativa e renovar sua atividade"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_seen = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def close(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': len(self._sessions),
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
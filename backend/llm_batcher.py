@@ -0,0 +1,208 @@
+import re
+import json
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from llm_client import LLMClient, LLMError
+
+logger = logging.getLogger(__name__)
+
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.S)
+
+
+def parse_batch_answers(text: str) -> Dict[int, str]:
+    """Extrair {id: resposta} de uma lista JSON [{"id": n, "resposta": "..."}]
+
+    Aceita texto em volta da lista (ex.: cercas de código); itens fora do
+    formato são ignorados e tratados pelo chamador como falha.
+    """
+    match = _JSON_ARRAY_RE.search(text)
+    if match is None:
+        return {}
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return {}
+
+    answers = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get('id')
+        answer = item.get('resposta')
+        if isinstance(item_id, int) and isinstance(answer, str):
+            answers[item_id] = answer.strip()
+    return answers
+
+
+class _BatchItem:
+    __slots__ = ('args', 'future')
+
+    def __init__(self, args, future):
+        self.args = args
+        self.future = future
+
+
+class LLMBatcher:
+    """Agrupa pedidos de geração concorrentes em uma única chamada ao LLM
+
+    Pedidos que chegam em até `max_wait_ms` do primeiro (ou até completar
+    `max_batch_size`) vão num prompt com vários itens. A resposta é
+    dividida por id e validada; itens ausentes, malformados ou inválidos
+    são refeitos com uma chamada individual cada, se o disjuntor deixar.
+    Se a chamada do lote falha (erro ou prazo), todos os itens falham com
+    ela e o disjuntor registra uma única falha.
+
+    `build_messages(*args)` monta o prompt de um item,
+    `build_batch_messages(list_of_args)` o do lote (itens numerados a
+    partir de 1) e `validate(texto)` levanta exceção para resposta inválida.
+    """
+
+    def __init__(self, llm: LLMClient, build_messages: Callable, build_batch_messages: Callable,
+                 validate: Optional[Callable] = None, max_batch_size: int = 8,
+                 max_wait_ms: float = 10.0, max_tokens_per_item: int = 300,
+                 temperature: float = 0.7, breaker=None):
+        self.llm = llm
+        self.build_messages = build_messages
+        self.build_batch_messages = build_batch_messages
+        self.validate = validate
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_tokens_per_item = max_tokens_per_item
+        self.temperature = temperature
+        # CircuitBreaker opcional alimentado com o resultado das chamadas
+        self.breaker = breaker
+
+        # Estado abaixo só é tocado dentro do event loop do cliente
+        self._pending: List[_BatchItem] = []
+        self._timer = None
+
+        self._stats_lock = threading.Lock()
+        self.items = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.single_calls = 0
+        self.fallbacks = 0
+
+    def submit(self, *args) -> Future:
+        """Enfileirar pedido (thread-safe); o Future recebe o texto gerado"""
+        future = Future()
+        with self._stats_lock:
+            self.items += 1
+        loop = self.llm.loop
+        loop.call_soon_threadsafe(self._enqueue, _BatchItem(args, future))
+        return future
+
+    def generate_many(self, items: List[tuple]) -> List[Future]:
+        """Enfileirar vários pedidos de uma vez"""
+        return [self.submit(*args) for args in items]
+
+    def _enqueue(self, item):
+        self._pending.append(item)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._pending = self._pending, []
+        if items:
+            asyncio.get_running_loop().create_task(self._run(items))
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _record(self, success):
+        if self.breaker is not None:
+            if success:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    async def _run(self, items):
+        if len(items) == 1:
+            await self._single(items[0])
+            return
+
+        self._count(batches=1)
+        try:
+            text = await self.llm.async_client.complete(
+                self.build_batch_messages([item.args for item in items]),
+                max_tokens=self.max_tokens_per_item * len(items),
+                temperature=self.temperature
+            )
+        except LLMError as e:
+            # Provedor fora do ar ou lento: refazer item a item só multiplicaria as chamadas
+            logger.warning(f"Chamada em lote falhou ({len(items)} itens): {str(e)}")
+            self._record(False)
+            for item in items:
+                item.future.set_exception(e)
+            return
+        self._record(True)
+        answers = parse_batch_answers(text)
+
+        retry = []
+        for item_id, item in enumerate(items, 1):
+            answer = answers.get(item_id)
+            if answer is not None and self._is_valid(answer):
+                item.future.set_result(answer)
+                self._count(batched_items=1)
+            else:
+                retry.append(item)
+
+        if retry:
+            self._count(fallbacks=len(retry))
+            await asyncio.gather(*(self._retry(item) for item in retry))
+
+    def _is_valid(self, answer):
+        if self.validate is None:
+            return True
+        try:
+            self.validate(answer)
+            return True
+        except Exception:
+            return False
+
+    async def _retry(self, item):
+        """Refazer individualmente um item que o lote não respondeu, se o disjuntor deixar"""
+        if self.breaker is not None and not self.breaker.allow():
+            item.future.set_exception(LLMError(f"Disjuntor '{self.breaker.name}' aberto"))
+            return
+        await self._single(item)
+
+    async def _single(self, item):
+        self._count(single_calls=1)
+        try:
+            text = await self.llm.async_client.complete(
+                self.build_messages(*item.args),
+                max_tokens=self.max_tokens_per_item,
+                temperature=self.temperature
+            )
+            self._record(True)
+            if self.validate is not None:
+                self.validate(text)
+            item.future.set_result(text)
+        except LLMError as e:
+            self._record(False)
+            item.future.set_exception(e)
+        except Exception as e:
+            item.future.set_exception(e)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'items': self.items,
+                'batches': self.batches,
+                'batched_items': self.batched_items,
+                'single_calls': self.single_calls,
+                'fallbacks': self.fallbacks,
+                'upstream_calls': self.batches + self.single_calls
+            }
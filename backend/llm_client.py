@@ -0,0 +1,235 @@
+import os
+import queue
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+
+class LLMError(Exception):
+    """Falha na chamada ao provedor de LLM"""
+
+
+class LLMTimeoutError(LLMError):
+    """Chamada ao LLM excedeu o prazo"""
+
+
+class AsyncLLMClient:
+    """Cliente assíncrono de chat completions
+
+    Uma única instância de AsyncOpenAI (e portanto um único pool HTTP com
+    keep-alive) é compartilhada por todas as chamadas. Um semáforo limita
+    quantas chamadas ficam em voo ao mesmo tempo, e cada chamada tem um
+    prazo total que inclui a espera por uma vaga.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 model: str = DEFAULT_MODEL, timeout: float = 10.0,
+                 max_concurrency: int = 16, max_retries: int = 0):
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url or os.getenv('OPENAI_BASE_URL')
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+
+        # Criados no primeiro uso, dentro do event loop que vai utilizá-los
+        self._client = None
+        self._semaphore = None
+
+    def _ensure_client(self):
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _complete(self, messages, max_tokens, temperature):
+        client = self._ensure_client()
+        async with self._semaphore:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        return response.choices[0].message.content.strip()
+
+    async def complete(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+                       temperature: float = 0.7, timeout: Optional[float] = None) -> str:
+        """Gerar resposta respeitando o prazo total da chamada"""
+        deadline = timeout if timeout is not None else self.timeout
+        try:
+            return await asyncio.wait_for(
+                self._complete(messages, max_tokens, temperature),
+                timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"LLM não respondeu em {deadline}s")
+        except LLMError:
+            raise
+        except Exception as e:
+            raise LLMError(str(e)) from e
+
+    async def stream(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+                     temperature: float = 0.7, timeout: Optional[float] = None):
+        """Gerar resposta em trechos; o prazo vale para a espera de cada trecho"""
+        deadline = timeout if timeout is not None else self.timeout
+        client = self._ensure_client()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"LLM não respondeu em {deadline}s")
+
+        response = None
+        try:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True
+                ),
+                timeout=deadline
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline)
+                except StopAsyncIteration:
+                    break
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"LLM não respondeu em {deadline}s")
+        except LLMError:
+            raise
+        except Exception as e:
+            raise LLMError(str(e)) from e
+        finally:
+            self._semaphore.release()
+            if response is not None:
+                await response.close()
+
+    def copy(self) -> 'AsyncLLMClient':
+        """Nova instância com a mesma configuração (sem pool/semáforo)"""
+        return AsyncLLMClient(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            model=self.model,
+            timeout=self.timeout,
+            max_concurrency=self.max_concurrency,
+            max_retries=self.max_retries
+        )
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class _LoopThread:
+    """Event loop dedicado rodando em thread daemon"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='llm-client-loop', daemon=True)
+        self.thread.start()
+
+
+class LLMClient:
+    """Fachada síncrona sobre o AsyncLLMClient para workers Flask
+
+    As corrotinas rodam num event loop compartilhado em segundo plano, então
+    todas as threads do processo reaproveitam o mesmo pool de conexões.
+    """
+
+    def __init__(self, async_client: Optional[AsyncLLMClient] = None, **kwargs):
+        self.async_client = async_client or AsyncLLMClient(**kwargs)
+        self._loop_thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        # Após fork o loop e o pool do processo pai não existem mais no filho
+        with self._lock:
+            if self._loop_thread is None or self._loop_thread.pid != os.getpid():
+                if self._loop_thread is not None:
+                    self.async_client = self.async_client.copy()
+                self._loop_thread = _LoopThread()
+            return self._loop_thread.loop
+
+    def submit(self, coro):
+        """Agendar corrotina no loop compartilhado e devolver um Future concorrente"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def submit_complete(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+                        temperature: float = 0.7, timeout: Optional[float] = None):
+        """Iniciar AsyncLLMClient.complete sem bloquear (devolve Future concorrente)"""
+        return self.submit(self.async_client.complete(messages, max_tokens, temperature, timeout))
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+                 temperature: float = 0.7, timeout: Optional[float] = None) -> str:
+        """Versão bloqueante de AsyncLLMClient.complete"""
+        return self.submit_complete(messages, max_tokens, temperature, timeout).result()
+
+    def stream(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+               temperature: float = 0.7, timeout: Optional[float] = None):
+        """Versão bloqueante de AsyncLLMClient.stream (gerador de trechos)"""
+        chunks = queue.Queue()
+        finished = object()
+
+        async def pump():
+            try:
+                async for chunk in self.async_client.stream(messages, max_tokens, temperature, timeout):
+                    chunks.put(chunk)
+                chunks.put(finished)
+            except Exception as e:
+                chunks.put(e)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = chunks.get()
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Consumidor desistiu (ex.: cliente SSE desconectou): liberar a conexão
+            future.cancel()
+
+    def close(self):
+        if self._loop_thread is not None and self._loop_thread.pid == os.getpid():
+            self.submit(self.async_client.aclose()).result()
+            self._loop_thread.loop.call_soon_threadsafe(self._loop_thread.loop.stop)
+            self._loop_thread = None
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Cliente síncrono compartilhado pelo processo (configurado por variáveis de ambiente)"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = LLMClient(
+                timeout=float(os.getenv('LLM_TIMEOUT_SECONDS', '10')),
+                max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '16'))
+            )
+        return _default_client
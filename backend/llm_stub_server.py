@@ -0,0 +1,177 @@
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Cabeçalho dos itens no prompt em lote (ver ResponseGenerator._build_batch_messages)
+BATCH_ITEM_RE = re.compile(r'^### Email (\d+)', re.M)
+
+STUB_REPLY = (
+    "Prezado(a) cliente,\n\n"
+    "Recebemos sua mensagem e nossa equipe já está analisando a solicitação. "
+    "Retornaremos em até 24 horas úteis.\n\n"
+    "Atenciosamente,\nEquipe AutoU"
+)
+
+
+class StubConfig:
+    """Comportamento simulado do provedor"""
+
+    def __init__(self, latency=0.2, jitter=0.0, error_rate=0.0, reply=STUB_REPLY, seed=None,
+                 stream_interval=0.02, batch_drop_rate=0.0):
+        self.latency = latency
+        # Fração de itens omitidos nas respostas em lote (simula saída malformada)
+        self.batch_drop_rate = batch_drop_rate
+        # Intervalo entre trechos quando a requisição pede stream=True
+        self.stream_interval = stream_interval
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.reply = reply
+        self.random = random.Random(seed)
+        self.requests = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Endpoint /v1/chat/completions compatível com a API da OpenAI"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Cliente desistiu (prazo estourado) antes da resposta
+            pass
+
+    def _send_stream(self, config, request):
+        """Resposta em server-sent events, no formato de chat.completion.chunk"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def write(data):
+            payload = f"data: {data}\n\n".encode('utf-8')
+            self.wfile.write(f"{len(payload):x}\r\n".encode('ascii') + payload + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            for i, piece in enumerate(_stream_pieces(config.reply)):
+                if i:
+                    time.sleep(config.stream_interval)
+                write(json.dumps({
+                    'id': f'chatcmpl-stub-{config.requests}',
+                    'object': 'chat.completion.chunk',
+                    'created': int(time.time()),
+                    'model': request.get('model', 'stub'),
+                    'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]
+                }, ensure_ascii=False))
+            write('[DONE]')
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self):
+        config = self.server.config
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        config.requests += 1
+
+        if not self.path.endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+
+        time.sleep(max(0.0, config.latency + config.random.uniform(-config.jitter, config.jitter)))
+
+        if config.random.random() < config.error_rate:
+            self._send_json(500, {'error': {'message': 'erro simulado', 'type': 'server_error'}})
+            return
+
+        if request.get('stream'):
+            self._send_stream(config, request)
+            return
+
+        content = config.reply
+        prompt = request.get('messages', [{}])[-1].get('content', '')
+        item_ids = [int(i) for i in BATCH_ITEM_RE.findall(prompt)]
+        if item_ids:
+            content = json.dumps([
+                {'id': item_id, 'resposta': config.reply}
+                for item_id in item_ids
+                if config.random.random() >= config.batch_drop_rate
+            ], ensure_ascii=False)
+
+        self._send_json(200, {
+            'id': f'chatcmpl-stub-{config.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        })
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fila de conexões grande o bastante para rajadas concorrentes
+    request_queue_size = 256
+
+
+def _stream_pieces(text, size=3):
+    words = text.split(' ')
+    for i in range(0, len(words), size):
+        piece = ' '.join(words[i:i + size])
+        yield piece if i + size >= len(words) else piece + ' '
+
+
+def start_stub_server(port=0, **config):
+    """Iniciar servidor stub em thread daemon
+
+    Returns:
+        (servidor, base_url) - use base_url como OPENAI_BASE_URL
+    """
+    server = StubServer(('127.0.0.1', port), StubHandler)
+    server.config = StubConfig(**config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor stub de LLM para testes locais')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.2, help='latência média em segundos')
+    parser.add_argument('--jitter', type=float, default=0.0, help='variação da latência em segundos')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 500')
+    parser.add_argument('--batch-drop-rate', type=float, default=0.0,
+                        help='fração de itens omitidos nas respostas em lote')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(
+        args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        batch_drop_rate=args.batch_drop_rate
+    )
+    print(f"🤖 Stub de LLM em {base_url}")
+    print(f"   export OPENAI_BASE_URL={base_url} OPENAI_API_KEY=stub")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
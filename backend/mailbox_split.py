@@ -0,0 +1,91 @@
+import io
+import os
+import re
+import email
+import zipfile
+from email import policy
+
+# Entradas de um .zip que viram emails; o resto é ignorado
+EMAIL_EXTENSIONS = ('.txt', '.eml', '.mbox')
+# Separador de mensagens do formato mbox ("From remetente data" no início da linha)
+_MBOX_FROM_RE = re.compile(rb'^From \S+.*$\r?\n', re.M)
+
+
+class ArchiveError(ValueError):
+    """Arquivo enviado que não pode ser lido como caixa de emails"""
+
+
+def message_text(message) -> str:
+    """Texto de um email no mesmo formato do leitor de .eml (Assunto/De/Para + corpo)"""
+    body = ''
+    for part in message.walk():
+        if part.get_content_type() == 'text/plain' and not part.is_multipart():
+            payload = part.get_payload(decode=True) or b''
+            body += payload.decode(part.get_content_charset() or 'utf-8', errors='ignore')
+
+    return (f"Assunto: {message.get('Subject', 'Sem assunto')}\n"
+            f"De: {message.get('From', 'Desconhecido')}\n"
+            f"Para: {message.get('To', 'Desconhecido')}\n\n"
+            f"{body}")
+
+
+def iter_mbox(data: bytes):
+    """Mensagens de um arquivo mbox, sem gravar em disco"""
+    separators = list(_MBOX_FROM_RE.finditer(data))
+    if not separators:
+        raise ArchiveError('Arquivo mbox sem mensagens')
+    ends = [match.start() for match in separators[1:]] + [len(data)]
+    for start, end in zip((match.end() for match in separators), ends):
+        # Linhas do corpo que começam com "From " são escapadas como ">From "
+        chunk = data[start:end].replace(b'\n>From ', b'\nFrom ')
+        yield email.message_from_bytes(chunk, policy=policy.compat32)
+
+
+def iter_emails(filename: str, data: bytes, max_emails: int, max_bytes: int):
+    """Gerar (nome, texto) dos emails de um .mbox, .eml, .txt ou .zip com esses arquivos
+
+    `max_bytes` limita o total descomprimido do .zip (tamanho declarado de
+    cada entrada, conferido antes de descomprimir).
+    """
+    ext = os.path.splitext(filename or '')[1].lower()
+    count = 0
+
+    def limited(items):
+        nonlocal count
+        for item in items:
+            count += 1
+            if count > max_emails:
+                raise ArchiveError(f'Limite de {max_emails} emails por job')
+            yield item
+
+    if ext == '.zip':
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(data))
+        except zipfile.BadZipFile:
+            raise ArchiveError('Arquivo .zip inválido')
+        with archive:
+            entries = [info for info in archive.infolist()
+                       if not info.is_dir() and os.path.splitext(info.filename)[1].lower() in EMAIL_EXTENSIONS]
+            if sum(info.file_size for info in entries) > max_bytes:
+                raise ArchiveError(f'Conteúdo do .zip acima de {max_bytes} bytes')
+            for info in entries:
+                try:
+                    content = archive.read(info)
+                except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+                    raise ArchiveError(f'Não foi possível ler {info.filename} do .zip: {str(e)}')
+                entry_ext = os.path.splitext(info.filename)[1].lower()
+                yield from limited(_single_file(info.filename, entry_ext, content))
+    elif ext in EMAIL_EXTENSIONS:
+        yield from limited(_single_file(filename, ext, data))
+    else:
+        raise ArchiveError(f'Formato não suportado para jobs: {ext or "sem extensão"}')
+
+
+def _single_file(name, ext, data):
+    if ext == '.mbox':
+        for i, message in enumerate(iter_mbox(data)):
+            yield f'{name}#{i + 1}', message_text(message)
+    elif ext == '.eml':
+        yield name, message_text(email.message_from_bytes(data, policy=policy.compat32))
+    else:
+        yield name, data.decode('utf-8', errors='ignore')
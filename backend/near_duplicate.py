@@ -0,0 +1,143 @@
+import re
+import time
+import heapq
+import threading
+from collections import OrderedDict, Counter
+
+_has_digit = re.compile(r'\d').search
+
+
+def minhash_sketch(text, size=32, tokens=None):
+    """Calcular sketch MinHash (bottom-k) das palavras distintas do texto
+
+    Palavras com dígitos (datas, valores, números de pedido) são ignoradas.
+    `tokens` (palavras distintas em minúsculas) evita nova tokenização.
+    Retorna (sketch ordenado, quantidade de palavras distintas).
+    """
+    if tokens is None:
+        tokens = set(text.lower().split())
+    # Pegamos folga para descartar palavras com dígitos sem varrer o conjunto todo
+    smallest = heapq.nsmallest(size * 2, tokens, key=hash)
+    sketch = [hash(token) for token in smallest if not _has_digit(token)][:size]
+    return sketch, len(tokens)
+
+
+def estimate_similarity(sketch_a, sketch_b, size=32):
+    """Estimar similaridade de Jaccard entre dois sketches bottom-k"""
+    set_a = set(sketch_a)
+    set_b = set(sketch_b)
+    union_bottom = sorted(set_a | set_b)[:size]
+    if not union_bottom:
+        return 0.0
+    shared = sum(1 for value in union_bottom if value in set_a and value in set_b)
+    return shared / len(union_bottom)
+
+
+class NearDuplicateIndex:
+    """Índice MinHash + LSH de emails recentes já classificados
+
+    Guarda só a decisão (classificação, confiança e scores): estatísticas
+    e palavras-chave são de cada email e não podem ser reaproveitadas.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600, threshold=0.8,
+                 sketch_size=32, min_tokens=10, max_bucket_size=256):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.sketch_size = sketch_size
+        self.min_tokens = min_tokens
+        # Buckets muito grandes vêm de palavras comuns e não ajudam a achar vizinhos
+        self.max_bucket_size = max_bucket_size
+        # Emails acima do limiar compartilham boa parte dos valores do sketch
+        self.min_shared = max(1, int(sketch_size * threshold / 2))
+
+        self._entries = OrderedDict()  # id -> (criado_em, sketch, decisão)
+        self._buckets = {}             # valor do sketch -> set(ids)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.reuses = 0
+        self.insertions = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, entry_id):
+        _, sketch, _ = self._entries.pop(entry_id)
+        for value in sketch:
+            bucket = self._buckets.get(value)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[value]
+
+    def _expire(self, now):
+        # Entradas ficam em ordem de inserção, então as expiradas estão no início
+        while self._entries:
+            entry_id, (created_at, _, _) = next(iter(self._entries.items()))
+            if now - created_at < self.ttl_seconds:
+                break
+            self._remove(entry_id)
+            self.expirations += 1
+
+    def lookup(self, text, tokens=None):
+        """Buscar classificação de um email quase idêntico
+
+        Returns:
+            (decisão registrada em add() ou None, sketch ou None)
+        """
+        sketch, token_count = minhash_sketch(text, self.sketch_size, tokens)
+        if token_count < self.min_tokens:
+            return None, None
+
+        with self._lock:
+            self.lookups += 1
+            self._expire(time.monotonic())
+
+            candidates = Counter()
+            for value in sketch:
+                bucket = self._buckets.get(value)
+                if bucket and len(bucket) <= self.max_bucket_size:
+                    candidates.update(bucket)
+
+            for entry_id, shared in candidates.most_common(5):
+                if shared < self.min_shared:
+                    break
+                _, candidate_sketch, decision = self._entries[entry_id]
+                if estimate_similarity(sketch, candidate_sketch, self.sketch_size) >= self.threshold:
+                    self.reuses += 1
+                    return decision, sketch
+
+        return None, sketch
+
+    def add(self, sketch, decision):
+        """Registrar a decisão (tupla imutável) para o sketch retornado por lookup()"""
+        if sketch is None:
+            return
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+
+            self._entries[entry_id] = (time.monotonic(), sketch, decision)
+            for value in sketch:
+                self._buckets.setdefault(value, set()).add(entry_id)
+            self.insertions += 1
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self):
+        """Contadores de uso do índice"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'lookups': self.lookups,
+                'reuses': self.reuses,
+                'reuse_rate': round(self.reuses / self.lookups, 4) if self.lookups else 0.0,
+                'insertions': self.insertions,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
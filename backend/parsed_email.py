@@ -0,0 +1,199 @@
+import re
+
+from language_detector import detect_language
+from lexicons import get_lexicon
+
+# Cabeçalhos reconhecidos no início do texto colado/enviado
+HEADER_NAMES = frozenset([
+    'de', 'from', 'para', 'to', 'cc', 'cco', 'bcc', 'assunto', 'subject',
+    'data', 'date', 'enviado', 'sent', 'responder para', 'reply-to'
+])
+_HEADER_RE = re.compile(r'^([A-Za-zÀ-ÿ][\w\- ]{0,20}):\s*(.*)$')
+
+# Padrões de assinatura, testados em ordem sobre o texto em minúsculas
+_SIGNATURE_PATTERNS = [
+    re.compile(r'atenciosamente,?\s*([a-záàâãéêíóôõúç\s]+)'),
+    re.compile(r'cordialmente,?\s*([a-záàâãéêíóôõúç\s]+)'),
+    re.compile(r'abraços,?\s*([a-záàâãéêíóôõúç\s]+)'),
+    re.compile(r'de:\s*([a-záàâãéêíóôõúç\s]+)'),
+    re.compile(r'from:\s*([a-záàâãéêíóôõúç\s]+)')
+]
+
+_CONTACT_INDICATORS = ('@', 'email:', 'e-mail:', 'tel:', 'telefone:', 'www.', 'http')
+
+_UNSET = object()
+
+
+class ParsedEmail:
+    """Email analisado uma única vez por request
+
+    Contadores e texto normalizado são calculados na criação; o restante
+    (linhas, cabeçalhos, remetente, idioma, palavras-chave) na primeira
+    leitura, e todos os consumidores reaproveitam o mesmo resultado.
+    """
+
+    __slots__ = (
+        'text', 'text_lower', 'words', 'word_count', 'char_count',
+        'question_count', 'exclamation_count',
+        '_lines', '_headers', '_body', '_tokens', '_language', '_lexicon',
+        '_hits', '_has_urgency', '_sender_name', '_signature_name', '_derived'
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.text_lower = text.lower()
+        self.words = text.split()
+        self.word_count = len(self.words)
+        self.char_count = len(text)
+        self.question_count = text.count('?')
+        self.exclamation_count = text.count('!')
+
+        self._lines = None
+        self._headers = None
+        self._body = None
+        self._tokens = None
+        self._language = None
+        self._lexicon = None
+        self._hits = None
+        self._has_urgency = None
+        self._sender_name = None
+        self._signature_name = _UNSET
+        self._derived = None
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    def _parse_headers(self):
+        headers = {}
+        lines = self.lines
+        body_start = 0
+        for i, line in enumerate(lines):
+            match = _HEADER_RE.match(line.strip())
+            if match is None or match.group(1).strip().lower() not in HEADER_NAMES:
+                break
+            headers[match.group(1).strip().lower()] = match.group(2).strip()
+            body_start = i + 1
+        if headers and body_start < len(lines) and not lines[body_start].strip():
+            body_start += 1
+        self._headers = headers
+        self._body = '\n'.join(lines[body_start:]) if headers else self.text
+
+    @property
+    def headers(self):
+        """Cabeçalhos 'Nome: valor' do topo do email (chaves em minúsculas)"""
+        if self._headers is None:
+            self._parse_headers()
+        return self._headers
+
+    @property
+    def body(self):
+        """Texto sem o bloco de cabeçalhos"""
+        if self._body is None:
+            self._parse_headers()
+        return self._body
+
+    @property
+    def subject(self):
+        headers = self.headers
+        return headers.get('assunto') or headers.get('subject') or ''
+
+    @property
+    def tokens(self):
+        """Conjunto de palavras distintas (minúsculas, separadas por espaço)"""
+        if self._tokens is None:
+            self._tokens = frozenset(self.text_lower.split())
+        return self._tokens
+
+    @property
+    def language(self):
+        if self._language is None:
+            self._language = detect_language(self.text)
+        return self._language
+
+    @property
+    def lexicon(self):
+        if self._lexicon is None:
+            self._lexicon = get_lexicon(self.language)
+        return self._lexicon
+
+    @property
+    def productive_hits(self):
+        if self._hits is None:
+            self._hits = self.lexicon.scan(self.text_lower)
+        return self._hits[0]
+
+    @property
+    def unproductive_hits(self):
+        if self._hits is None:
+            self._hits = self.lexicon.scan(self.text_lower)
+        return self._hits[1]
+
+    @property
+    def keyword_hits(self):
+        """Palavras-chave do léxico encontradas no texto"""
+        return [kw for kw, _ in self.productive_hits] + [kw for kw, _ in self.unproductive_hits]
+
+    @property
+    def has_urgency(self):
+        if self._has_urgency is None:
+            self._has_urgency = self.lexicon.has_urgency(self.text_lower)
+        return self._has_urgency
+
+    def derived(self, key, compute):
+        """Valor calculado por outro módulo a partir deste email, memorizado por chave"""
+        if self._derived is None:
+            self._derived = {}
+        if key not in self._derived:
+            self._derived[key] = compute(self)
+        return self._derived[key]
+
+    def contains_any(self, terms) -> bool:
+        """Verificar se algum dos termos (em minúsculas) aparece no texto"""
+        text_lower = self.text_lower
+        return any(term in text_lower for term in terms)
+
+    @property
+    def signature_name(self):
+        """Última linha curta sem dígitos nem '@' (None se não houver)"""
+        if self._signature_name is _UNSET:
+            self._signature_name = None
+            for line in reversed(self.lines):
+                line = line.strip()
+                if 2 < len(line) < 40 and '@' not in line:
+                    if len(line.split()) <= 3 and not any(char.isdigit() for char in line):
+                        self._signature_name = line.title()
+                        break
+        return self._signature_name
+
+    @property
+    def sender_name(self):
+        """Nome do remetente pela assinatura ou fórmulas de despedida"""
+        if self._sender_name is None:
+            self._sender_name = self._find_sender_name()
+        return self._sender_name
+
+    def _find_sender_name(self):
+        for line in reversed(self.lines):
+            line = line.strip()
+            if line and len(line.split()) <= 3:
+                line_lower = line.lower()
+                if not any(indicator in line_lower for indicator in _CONTACT_INDICATORS):
+                    if not any(char.isdigit() for char in line):
+                        return line.title()
+
+        for pattern in _SIGNATURE_PATTERNS:
+            match = pattern.search(self.text_lower)
+            if match:
+                name = match.group(1).strip().title()
+                if len(name.split()) <= 3:
+                    return name
+
+        return "Cliente"
+
+
+def parse_email(email) -> ParsedEmail:
+    """Aceitar texto ou ParsedEmail já construído"""
+    return email if isinstance(email, ParsedEmail) else ParsedEmail(email)
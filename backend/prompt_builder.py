@@ -0,0 +1,156 @@
+import os
+import re
+
+from parsed_email import parse_email
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv('LLM_PROMPT_TOKEN_BUDGET', '200'))
+
+# Início do histórico citado: tudo a partir daqui é removido
+_QUOTE_START_RE = re.compile(
+    r'^\s*(?:'
+    r'(?:em|on)\s.+(?:escreveu|wrote)\s*:'
+    r'|-{2,}\s*(?:mensagem original|original message|mensagem encaminhada|forwarded message)'
+    r'|_{5,}'
+    r')\s*$',
+    re.I
+)
+# Bloco "De: ... / Para: ..." no meio do corpo (resposta ou encaminhamento do Outlook)
+_QUOTED_HEADER_RE = re.compile(r'^\s*(?:de|from)\s*:', re.I)
+_QUOTED_HEADER_NEXT_RE = re.compile(r'^\s*(?:para|to|enviado|sent|data|date|assunto|subject)\s*:', re.I)
+
+# Início da assinatura (só considerado nas últimas linhas)
+_SIGNATURE_START_RE = re.compile(
+    r'^\s*(?:--\s*'
+    r'|(?:atenciosamente|cordialmente|abraços|abs|att|grato|grata|saudações|'
+    r'best regards|kind regards|regards|best|cheers|sincerely)[\s,.!]*'
+    r'|(?:enviado do meu|sent from my)\b.*'
+    r')$',
+    re.I
+)
+SIGNATURE_MAX_LINES = 6
+
+_SENTENCE_RE = re.compile(r'[^.!?\n]+(?:[.!?]+|$)', re.M)
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimar tokens de BPE sem chamar a API
+
+    Palavras de até 4 caracteres contam como um token, as maiores como um
+    a cada 4 caracteres, e cada pontuação como um token. Caracteres
+    acentuados costumam virar tokens extras, então cada par conta mais um.
+    """
+    count = 0
+    for piece in _TOKEN_RE.findall(text):
+        size = len(piece)
+        count += 1 if size <= 4 else (size + 3) // 4
+        if not piece.isascii():
+            count += sum(1 for char in piece if ord(char) > 127) // 2
+    return count
+
+
+def strip_quoted_history(text: str) -> str:
+    """Remover linhas citadas ('>') e o histórico a partir do primeiro marcador"""
+    lines = text.split('\n')
+    kept = []
+    for i, line in enumerate(lines):
+        if _QUOTE_START_RE.match(line):
+            break
+        if kept and _QUOTED_HEADER_RE.match(line) and any(
+            _QUOTED_HEADER_NEXT_RE.match(next_line) for next_line in lines[i + 1:i + 4]
+        ):
+            break
+        if line.lstrip().startswith('>'):
+            continue
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def strip_signature(text: str) -> str:
+    """Remover assinatura/despedida das últimas linhas"""
+    lines = text.rstrip().split('\n')
+    content_lines = [i for i, line in enumerate(lines) if line.strip()]
+    for i in content_lines[-SIGNATURE_MAX_LINES:]:
+        if _SIGNATURE_START_RE.match(lines[i]):
+            return '\n'.join(lines[:i])
+    return '\n'.join(lines)
+
+
+def split_sentences(text: str):
+    return [sentence.strip() for sentence in _SENTENCE_RE.findall(text) if sentence.strip()]
+
+
+def _truncate_to_budget(sentence, budget):
+    """Palavras iniciais da frase que cabem no orçamento
+
+    Tokens nunca atravessam espaços, então o custo do trecho é a soma do
+    custo de cada palavra: uma passada só, cortando onde o total estoura.
+    """
+    words = sentence.split()
+    used = 0
+    for i, word in enumerate(words):
+        used += estimate_tokens(word)
+        if used > budget:
+            return ' '.join(words[:i])
+    return ' '.join(words)
+
+
+def _score_sentences(email, sentences):
+    lexicon = email.lexicon
+    weights = dict(lexicon.productive)
+    weights.update(lexicon.unproductive)
+    hits = email.keyword_hits
+
+    scores = []
+    for position, sentence in enumerate(sentences):
+        sentence_lower = sentence.lower()
+        score = sum(weights[kw] for kw in hits if kw in sentence_lower)
+        score += 4 * sentence.count('?')
+        if position == 0:
+            score += 1  # costuma trazer o assunto
+        scores.append(score)
+    return scores
+
+
+def condense_email(email, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Texto do email para o prompt, dentro do orçamento de tokens
+
+    Remove cabeçalhos, histórico citado e assinatura; se ainda não couber,
+    mantém as frases mais informativas (com palavras-chave e perguntas),
+    na ordem original, marcando trechos omitidos com '(...)'.
+    """
+    email = parse_email(email)
+    return email.derived(('prompt', token_budget), lambda e: _condense(e, token_budget))
+
+
+def _condense(email, token_budget):
+    text = strip_signature(strip_quoted_history(email.body)).strip() or email.body.strip()
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    sentences = split_sentences(text)
+    costs = [estimate_tokens(sentence) for sentence in sentences]
+    scores = _score_sentences(email, sentences)
+
+    # Mais informativas primeiro; empate favorece as do início
+    order = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    selected = set()
+    used = 0
+    for i in order:
+        if used + costs[i] <= token_budget:
+            selected.add(i)
+            used += costs[i]
+
+    if not selected:
+        return _truncate_to_budget(sentences[order[0]], token_budget)
+
+    parts = []
+    previous = -1
+    for i in sorted(selected):
+        if i != previous + 1:
+            parts.append('(...)')
+        parts.append(sentences[i])
+        previous = i
+    if previous != len(sentences) - 1:
+        parts.append('(...)')
+    return ' '.join(parts)
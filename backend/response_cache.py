@@ -0,0 +1,211 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import Optional
+
+# Em serverless só /tmp é gravável; o cache sobrevive entre invocações da mesma instância
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'autou_llm_cache.sqlite3')
+
+SENDER_PLACEHOLDER = '\x00remetente\x00'
+
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+# Linhas com texto do início (saudação) e do fim (despedida) onde o nome é trocado
+EDGE_LINES = 1
+
+# Fórmulas de despedida que ParsedEmail.sender_name devolve quando não há nome
+CLOSING_WORDS = frozenset([
+    'cliente', 'obrigado', 'obrigada', 'obrigadão', 'grato', 'grata', 'att', 'atte',
+    'atenciosamente', 'cordialmente', 'abraços', 'abraço', 'abs', 'saudações',
+    'agradeço', 'aguardo', 'valeu', 'thanks', 'thank', 'you', 'regards', 'best',
+    'cheers', 'sincerely'
+])
+
+
+def cacheable_sender_name(sender_name: Optional[str]) -> Optional[str]:
+    """Nome do remetente utilizável no cache (None se não houver nome de verdade)
+
+    Sem nome a resposta não pode ser repersonalizada, e fórmulas de
+    despedida ("Obrigado") não são nomes: nos dois casos nada é guardado.
+    """
+    if not sender_name:
+        return None
+    words = _NON_WORD_RE.sub(' ', sender_name.lower()).split()
+    if not words or any(word in CLOSING_WORDS or not word.isalpha() for word in words):
+        return None
+    return sender_name
+
+
+def replace_name(text: str, name: str, replacement: str) -> str:
+    """Trocar `name` como palavra inteira, só na saudação e na despedida
+
+    Nomes dentro de outras palavras ("Ana" em "analisaremos") e citações no
+    meio do texto ficam como estão.
+    """
+    pattern = re.compile(r'(?<!\w)' + re.escape(name) + r'(?!\w)', re.IGNORECASE)
+    lines = text.split('\n')
+    content_lines = [i for i, line in enumerate(lines) if line.strip()]
+    for i in set(content_lines[:EDGE_LINES] + content_lines[-EDGE_LINES:]):
+        lines[i] = pattern.sub(replacement, lines[i])
+    return '\n'.join(lines)
+
+
+def fingerprint(classification: str, prompt_input: str, sender_name: Optional[str] = None) -> str:
+    """Chave do cache: classificação + trecho do email enviado ao LLM, normalizado
+
+    O nome do remetente (saudação e despedida), pontuação, caixa e espaços
+    não mudam a chave.
+    Números (pedidos, protocolos, datas) mudam: a resposta pode citá-los e
+    só o nome é repersonalizado, então ela não serve a outro cliente.
+    """
+    text = replace_name(prompt_input, sender_name, ' ') if sender_name else prompt_input
+    text = ' '.join(_NON_WORD_RE.sub(' ', text.lower()).split())
+    # v3: entradas antigas tiveram o nome trocado dentro de outras palavras
+    # (v1 também trocava dígitos por 0) e não podem casar com as novas
+    return hashlib.sha1(f"v3\n{classification.lower()}\n{text}".encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Cache em disco (SQLite) de respostas geradas pelo LLM
+
+    As respostas são guardadas com o nome do remetente trocado por um
+    marcador e repersonalizadas na leitura; sem um nome de verdade
+    (cacheable_sender_name) nada é consultado nem guardado. Entradas expiram após
+    `ttl_seconds`; acima de `max_entries` as menos usadas recentemente são
+    removidas.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 5000, prune_interval: int = 100):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Poda a cada N gravações, para não pagar um COUNT por request
+        self.prune_interval = prune_interval
+
+        self._lock = threading.Lock()
+        # Aberto na primeira consulta: /api/metrics e instâncias sem LLM não tocam no disco
+        self._conn = None
+
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def _connection(self):
+        """Conexão SQLite, criada no primeiro uso (chamar com o lock)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY,'
+                ' response TEXT NOT NULL,'
+                ' created_at REAL NOT NULL,'
+                ' accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+            self._conn = conn
+        return self._conn
+
+    def get(self, classification: str, prompt_input: str, sender_name: Optional[str] = None) -> Optional[str]:
+        """Buscar resposta e personalizá-la para `sender_name`"""
+        sender_name = cacheable_sender_name(sender_name)
+        if sender_name is None:
+            return None
+        key = fingerprint(classification, prompt_input, sender_name)
+        now = time.time()
+
+        with self._lock:
+            self.lookups += 1
+            row = self._connection().execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            if now - created_at >= self.ttl_seconds:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.expirations += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+
+        return response.replace(SENDER_PLACEHOLDER, sender_name)
+
+    def put(self, classification: str, prompt_input: str, response: str,
+            sender_name: Optional[str] = None):
+        """Guardar resposta gerada, despersonalizada"""
+        sender_name = cacheable_sender_name(sender_name)
+        if sender_name is None:
+            return
+        key = fingerprint(classification, prompt_input, sender_name)
+        response = replace_name(response, sender_name, SENDER_PLACEHOLDER)
+        now = time.time()
+
+        with self._lock:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, response, now, now)
+            )
+            self.stores += 1
+            if self.stores % self.prune_interval == 0:
+                self._prune(now)
+
+    def _prune(self, now):
+        cursor = self._conn.execute('DELETE FROM responses WHERE created_at <= ?', (now - self.ttl_seconds,))
+        self.expirations += cursor.rowcount
+
+        excess = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)', (excess,)
+            )
+            self.evictions += excess
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute('DELETE FROM responses')
+
+    def stats(self):
+        with self._lock:
+            entries = (self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+                       if self._conn is not None else 0)
+            return {
+                'entries': entries,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'hit_rate': round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                'stores': self.stores,
+                'expirations': self.expirations,
+                'evictions': self.evictions
+            }
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Cache compartilhado pelo processo (None se LLM_CACHE_PATH estiver vazio)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            path = os.getenv('LLM_CACHE_PATH', DEFAULT_PATH)
+            if not path:
+                return None
+            _default_cache = ResponseCache(
+                path,
+                ttl_seconds=float(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+                max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+            )
+        return _default_cache
@@ -1,110 +1,297 @@
 import os
 import logging
-from typing import Dict, Any
-import openai
+from typing import List, Tuple
 from dotenv import load_dotenv
+import time
 import random
-from datetime import datetime
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from template_engine import get_template_engine
+from llm_client import get_llm_client, LLMError
+from llm_batcher import LLMBatcher
+from circuit_breaker import CircuitBreaker
+from deferred_responses import DeferredResponseStore
+from response_cache import get_response_cache, cacheable_sender_name
+from results import GeneratedResponse
+from streaming import iter_chunks
+from parsed_email import parse_email
+from id_generator import new_protocol, new_request_id
+from prompt_builder import condense_email, DEFAULT_TOKEN_BUDGET
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Tempo máximo que uma request espera pelo LLM antes de responder com template
+LATENCY_BUDGET_SECONDS = float(os.getenv('LLM_LATENCY_BUDGET_SECONDS', '2.0'))
+
+# Compartilhados entre instâncias: o estado do provedor é do processo, não do gerador
+llm_breaker = CircuitBreaker(
+    'llm',
+    failure_threshold=int(os.getenv('LLM_BREAKER_FAILURES', '5')),
+    reset_timeout=float(os.getenv('LLM_BREAKER_RESET_SECONDS', '30'))
+)
+deferred_responses = DeferredResponseStore()
+
 class ResponseGenerator:
     """Gerador de respostas automáticas para emails"""
     
-    def __init__(self):
+    def __init__(self, latency_budget: float = LATENCY_BUDGET_SECONDS,
+                 prompt_token_budget: int = DEFAULT_TOKEN_BUDGET):
         """Inicializar o gerador de respostas"""
+        self.latency_budget = latency_budget
+        # Tokens do email enviados no prompt (após remover cabeçalhos, citações e assinatura)
+        self.prompt_token_budget = prompt_token_budget
+        self.breaker = llm_breaker
+        self.deferred = deferred_responses
         self.api_key = os.getenv('OPENAI_API_KEY')
         
         if not self.api_key:
             logger.warning("OPENAI_API_KEY não encontrada. Usando respostas pré-definidas.")
             self.use_openai = False
+            self.cache = None
         else:
             self.use_openai = True
-            openai.api_key = self.api_key
-
-        self.productive_templates = [
-            """Prezado(a) {sender},
-
-Obrigado por entrar em contato conosco. Recebemos sua solicitação e nossa equipe está analisando a questão.
-
-Retornaremos com uma resposta em até 24 horas úteis.
-
-Caso precise de suporte imediato, favor entrar em contato pelo telefone (xx) xxxx-xxxx.
-
-Atenciosamente,
-Equipe de Suporte""",
-
-            """Olá,
-
-Agradecemos seu email. Sua solicitação foi registrada em nosso sistema com o protocolo #{protocol}.
-
-Nossa equipe especializada irá avaliar a situação e retornar com as informações solicitadas no menor prazo possível.
-
-Em caso de dúvidas, favor referenciar o número do protocolo em futuras comunicações.
-
-Cordialmente,
-Central de Atendimento""",
-
-            """Caro(a) cliente,
-
-Confirmamos o recebimento de sua mensagem. Entendemos a importância de sua solicitação e estamos trabalhando para fornecer a melhor solução.
-
-Previsão de resposta: até 48 horas úteis.
-
-Agradecemos sua paciência e confiança em nossos serviços.
-
-Atenciosamente,
-Equipe Técnica"""
-        ]
-
-        self.unproductive_templates = [
-            """Prezado(a) {sender},
-
-Muito obrigado por sua mensagem! É sempre um prazer receber contato de você.
-
-{acknowledgment}
-
-Desejo a você um excelente dia!
-
-Cordialmente,
-[Nome]""",
-
-            """Olá!
-
-Agradeço imensamente por pensar em mim/nós. Sua mensagem trouxe um sorriso ao meu dia!
-
-{acknowledgment}
-
-Um abraço caloroso,
-[Nome]""",
-
-            """Caro(a) {sender},
+            self.cache = get_response_cache()
+            # Cliente assíncrono compartilhado (pool de conexões, prazo e limite de concorrência)
+            self.llm = get_llm_client()
+            # Geração em massa: pedidos concorrentes vão juntos num único prompt
+            self.batcher = LLMBatcher(
+                self.llm,
+                self._build_messages,
+                self._build_batch_messages,
+                validate=self._validate_response,
+                max_batch_size=int(os.getenv('LLM_BATCH_SIZE', '8')),
+                max_wait_ms=float(os.getenv('LLM_BATCH_WINDOW_MS', '10')),
+                breaker=self.breaker
+            )
 
-Que gentileza sua! Muito obrigado por compartilhar esse momento conosco.
+        # Templates compilados e compartilhados entre instâncias
+        self.templates = get_template_engine()
 
-{acknowledgment}
+    def generate_response(self, email_content: str, classification: str,
+                          keyword_hits=None, language=None) -> str:
+        """Gerar resposta automática baseada na classificação
+        
+        `keyword_hits` e `language` (do resultado da classificação) evitam
+        nova varredura do texto na escolha dos templates.
+        """
+        return self.generate(email_content, classification, keyword_hits, language).text
+
+    def generate(self, email_content: str, classification: str, keyword_hits=None,
+                 language=None, request_id=None) -> GeneratedResponse:
+        """Gerar resposta respeitando o orçamento de latência
+        
+        Se o LLM não responder dentro de `latency_budget`, devolve a resposta
+        de template na hora; a chamada segue em segundo plano e o resultado
+        fica disponível em get_deferred_response(request_id).
+        """
+        request_id = request_id or new_request_id()
+        email = parse_email(email_content)
+        
+        if self.use_openai:
+            cached_response = self._get_cached(email, classification)
+            if cached_response is not None:
+                return GeneratedResponse(cached_response, 'cache', request_id)
+        
+        if not self.use_openai or not self.breaker.allow():
+            return GeneratedResponse(
+                self._generate_with_templates(email, classification, keyword_hits, language),
+                'template', request_id
+            )
+        
+        started = time.monotonic()
+        future = self.llm.submit_complete(
+            self._build_messages(email, classification),
+            max_tokens=300,
+            temperature=0.7
+        )
+        future.add_done_callback(lambda f: self._record_outcome(f, started, email, classification))
+        
+        try:
+            generated_response = future.result(timeout=self.latency_budget)
+            self._validate_response(generated_response)
+            return GeneratedResponse(generated_response, 'llm', request_id)
+        except FutureTimeoutError:
+            logger.info(f"LLM excedeu orçamento de {self.latency_budget}s; resposta de template enviada")
+            self.deferred.add(request_id, future, self._validate_response)
+            upgrade_pending = True
+        except Exception as e:
+            logger.warning(f"Erro na geração via OpenAI: {str(e)}")
+            logger.info("Usando templates pré-definidos como fallback")
+            upgrade_pending = False
+        
+        return GeneratedResponse(
+            self._generate_with_templates(email, classification, keyword_hits, language),
+            'template', request_id, upgrade_pending
+        )
 
-Com carinho,
-[Nome]"""
-        ]
+    def stream(self, email_content: str, classification: str, keyword_hits=None, language=None):
+        """Gerar resposta em trechos, à medida que é produzida
+        
+        Com LLM disponível os trechos vêm do stream da API; se o primeiro
+        trecho não chegar dentro de `latency_budget` (ou a chamada falhar
+        antes dele) a resposta de template é enviada em trechos.
+        """
+        email = parse_email(email_content)
+        
+        if self.use_openai:
+            cached_response = self._get_cached(email, classification)
+            if cached_response is not None:
+                yield from iter_chunks(cached_response)
+                return
+        
+        if self.use_openai and self.breaker.allow():
+            parts = []
+            recorded = False
+            try:
+                for chunk in self.llm.stream(
+                    self._build_messages(email, classification),
+                    max_tokens=300,
+                    temperature=0.7,
+                    timeout=self.latency_budget
+                ):
+                    parts.append(chunk)
+                    yield chunk
+            except LLMError as e:
+                recorded = True
+                self.breaker.record_failure()
+                if parts:
+                    # Texto parcial já foi enviado; não há como trocar por template
+                    logger.warning(f"Stream do LLM interrompido: {str(e)}")
+                    return
+                logger.warning(f"Erro na geração via OpenAI: {str(e)}")
+                logger.info("Usando templates pré-definidos como fallback")
+            except GeneratorExit:
+                # Cliente desconectou antes do fim: o upstream não falhou, só não terminou
+                recorded = True
+                self.breaker.release()
+                raise
+            else:
+                recorded = True
+                self.breaker.record_success()
+                generated_response = ''.join(parts).strip()
+                if len(generated_response) >= 50:
+                    self._put_cached(email, classification, generated_response)
+                return
+            finally:
+                if not recorded:
+                    # Erro inesperado no meio do stream: conta como falha para não prender
+                    # a chamada de teste do disjuntor meio-aberto
+                    self.breaker.record_failure()
+        
+        yield from iter_chunks(
+            self._generate_with_templates(email, classification, keyword_hits, language)
+        )
 
-    def generate_response(self, email_content: str, classification: str) -> str:
-        """Gerar resposta automática baseada na classificação"""
+    def generate_batch(self, emails: List[Tuple[str, str]]) -> List[GeneratedResponse]:
+        """Gerar respostas para vários emails (conteúdo, classificação) de uma vez
+        
+        Sem orçamento de latência: pensado para processar backlog. Itens que
+        o LLM não conseguir responder recebem a resposta de template.
+        """
+        emails = [(parse_email(email_content), classification) for email_content, classification in emails]
+        results = [None] * len(emails)
+        futures = {}
         
         if self.use_openai:
+            for i, (email_content, classification) in enumerate(emails):
+                cached_response = self._get_cached(email_content, classification)
+                if cached_response is not None:
+                    results[i] = GeneratedResponse(cached_response, 'cache')
+            
+            if None in results and self.breaker.allow():
+                for i, (email_content, classification) in enumerate(emails):
+                    if results[i] is None:
+                        futures[i] = self.batcher.submit(email_content, classification)
+        
+        for i, future in futures.items():
+            email_content, classification = emails[i]
             try:
-                return self._generate_with_openai(email_content, classification)
+                generated_response = future.result()
             except Exception as e:
                 logger.warning(f"Erro na geração via OpenAI: {str(e)}")
-                logger.info("Usando templates pré-definidos como fallback")
-                return self._generate_with_templates(email_content, classification)
-        else:
-            return self._generate_with_templates(email_content, classification)
+                continue
+            self._put_cached(email_content, classification, generated_response)
+            results[i] = GeneratedResponse(generated_response, 'llm')
+        
+        for i, (email_content, classification) in enumerate(emails):
+            if results[i] is None:
+                results[i] = GeneratedResponse(
+                    self._generate_with_templates(email_content, classification), 'template'
+                )
+        
+        return results
 
-    def _generate_with_openai(self, email_content: str, classification: str) -> str:
-        """Gerar resposta usando OpenAI GPT"""
+    def get_deferred_response(self, request_id: str):
+        """Consultar resposta do LLM que chegou após o orçamento de latência"""
+        return self.deferred.get(request_id)
+
+    def _record_outcome(self, future, started, email_content, classification):
+        """Alimentar o disjuntor e o cache com o resultado da chamada ao LLM"""
+        if future.cancelled() or future.exception() is not None:
+            self.breaker.record_failure()
+            return
+        
+        if time.monotonic() - started > self.latency_budget:
+            self.breaker.record_slow_call()
+        else:
+            self.breaker.record_success()
+        
+        generated_response = future.result()
+        try:
+            self._validate_response(generated_response)
+        except ValueError:
+            return
+        self._put_cached(email_content, classification, generated_response)
+
+    def _get_cached(self, email_content, classification: str):
+        if self.cache is None:
+            return None
+        email = parse_email(email_content)
+        # Sem nome de verdade a resposta não é repersonalizável: nem monta a chave
+        sender_name = cacheable_sender_name(email.sender_name)
+        if sender_name is None:
+            return None
+        try:
+            return self.cache.get(classification, self._prompt_input(email), sender_name)
+        except Exception as e:
+            logger.warning(f"Erro ao consultar cache de respostas: {str(e)}")
+            return None
+
+    def _put_cached(self, email_content, classification: str, generated_response: str):
+        if self.cache is None:
+            return
+        email = parse_email(email_content)
+        sender_name = cacheable_sender_name(email.sender_name)
+        if sender_name is None:
+            return
+        try:
+            self.cache.put(classification, self._prompt_input(email), generated_response, sender_name)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar cache de respostas: {str(e)}")
+
+    def metrics(self):
+        """Estado do disjuntor, lotes, respostas adiadas e cache do LLM"""
+        return {
+            'circuit_breaker': self.breaker.stats(),
+            'batching': self.batcher.stats() if self.use_openai else None,
+            'deferred_responses': self.deferred.stats(),
+            'response_cache': self.cache.stats() if self.cache is not None else None
+        }
+
+    def _validate_response(self, generated_response: str):
+        if len(generated_response) < 50:
+            raise ValueError("Resposta muito curta")
+
+    def _prompt_input(self, email_content) -> str:
+        """Trecho do email enviado ao LLM, dentro do orçamento de tokens"""
+        return condense_email(email_content, self.prompt_token_budget)
+
+    def _build_messages(self, email_content, classification: str):
+        """Montar mensagens do prompt para o LLM"""
+        
+        email_content = self._prompt_input(email_content)
         
         if classification.lower() == 'produtivo':
             prompt = f"""
@@ -119,7 +306,7 @@ A resposta deve:
 - Incluir uma saudação e despedida apropriadas
 
 Email recebido:
-"{email_content[:500]}"
+"{email_content}"
 
 Gere uma resposta profissional:
 """
@@ -135,26 +322,67 @@ A resposta deve:
 - Demonstrar apreço pela comunicação
 
 Email recebido:
-"{email_content[:500]}"
+"{email_content}"
 
 Gere uma resposta calorosa e amigável:
 """
 
+        return [
+            {"role": "system", "content": "Você é um assistente especializado em comunicação corporativa. Sempre responda em português brasileiro de forma profissional e adequada ao contexto."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _build_batch_messages(self, items):
+        """Montar prompt único para vários (conteúdo, classificação)"""
+        
+        emails = "\n\n".join(
+            f'### Email {i} ({classification.lower()})\n"{self._prompt_input(email_content)}"'
+            for i, (email_content, classification) in enumerate(items, 1)
+        )
+        prompt = f"""
+Você é um assistente de comunicação corporativa. Gere uma resposta automática para cada email abaixo.
+
+Para emails produtivos a resposta deve:
+- Ser profissional e cortês
+- Confirmar o recebimento da solicitação
+- Indicar próximos passos ou prazo de resposta
+- Incluir uma saudação e despedida apropriadas
+
+Para emails improdutivos a resposta deve:
+- Ser calorosa e amigável
+- Agradecer pela mensagem
+- Ser breve mas cordial
+
+Todas as respostas devem estar em português brasileiro.
+
+Responda somente com uma lista JSON, um item por email, no formato:
+[{{"id": 1, "resposta": "..."}}, {{"id": 2, "resposta": "..."}}]
+
+{emails}
+"""
+        
+        return [
+            {"role": "system", "content": "Você é um assistente especializado em comunicação corporativa. Sempre responda em português brasileiro de forma profissional e adequada ao contexto."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _generate_with_openai(self, email_content: str, classification: str) -> str:
+        """Gerar resposta usando OpenAI GPT"""
+        
+        email_content = parse_email(email_content)
+        cached_response = self._get_cached(email_content, classification)
+        if cached_response is not None:
+            return cached_response
+        
         try:
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Você é um assistente especializado em comunicação corporativa. Sempre responda em português brasileiro de forma profissional e adequada ao contexto."},
-                    {"role": "user", "content": prompt}
-                ],
+            generated_response = self.llm.complete(
+                self._build_messages(email_content, classification),
                 max_tokens=300,
                 temperature=0.7
             )
             
-            generated_response = response.choices[0].message.content.strip()
-            
-            if len(generated_response) < 50:
-                raise ValueError("Resposta muito curta")
+            self._validate_response(generated_response)
+            self._put_cached(email_content, classification, generated_response)
             
             return generated_response
             
@@ -162,123 +390,78 @@ Gere uma resposta calorosa e amigável:
             logger.error(f"Erro na API OpenAI: {str(e)}")
             raise
 
-    def _generate_with_templates(self, email_content: str, classification: str) -> str:
+    def _generate_with_templates(self, email_content, classification: str,
+                                 keyword_hits=None, language=None) -> str:
         """Gerar resposta usando templates pré-definidos"""
         
-        sender_name = self._extract_sender_name(email_content)
-        protocol = self._generate_protocol()
+        email = parse_email(email_content)
+        sender_name = email.sender_name
         
         if classification.lower() == 'produtivo':
-            template = random.choice(self.productive_templates)
+            name = random.choice(self.templates.names('generator/produtivo'))
             
-            response = template.format(
+            response = self.templates.render(
+                name,
                 sender=sender_name,
-                protocol=protocol
+                protocol=self._generate_protocol()
             )
             
         else:  # improdutivo
-            template = random.choice(self.unproductive_templates)
-            acknowledgment = self._generate_acknowledgment(email_content)
+            name = random.choice(self.templates.names('generator/improdutivo'))
+            acknowledgment = self._generate_acknowledgment(email, keyword_hits, language)
             
-            response = template.format(
+            response = self.templates.render(
+                name,
                 sender=sender_name,
                 acknowledgment=acknowledgment
             )
         
         return response
 
-    def _extract_sender_name(self, email_content: str) -> str:
+    def _extract_sender_name(self, email_content) -> str:
         """Extrair nome do remetente do email"""
-        
-        lines = email_content.split('\n')
-        
-        for line in reversed(lines):
-            line = line.strip()
-            if line and not self._is_email_line(line) and len(line.split()) <= 3:
-
-                if not any(char.isdigit() for char in line):
-                    return line.title()
-        
-        import re
-        patterns = [
-            r'atenciosamente,?\s*([a-záàâãéêíóôõúç\s]+)',
-            r'cordialmente,?\s*([a-záàâãéêíóôõúç\s]+)',
-            r'abraços,?\s*([a-záàâãéêíóôõúç\s]+)',
-            r'de:\s*([a-záàâãéêíóôõúç\s]+)',
-            r'from:\s*([a-záàâãéêíóôõúç\s]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, email_content.lower())
-            if match:
-                name = match.group(1).strip().title()
-                if len(name.split()) <= 3:
-                    return name
-        
-        return "Cliente"
-
-    def _is_email_line(self, line: str) -> bool:
-        """Verificar se a linha contém informações de email"""
-        email_indicators = ['@', 'email:', 'e-mail:', 'tel:', 'telefone:', 'www.', 'http']
-        return any(indicator in line.lower() for indicator in email_indicators)
+        return parse_email(email_content).sender_name
 
     def _generate_protocol(self) -> str:
-        """Gerar número de protocolo fictício"""
-        import random
-        now = datetime.now()
-        return f"{now.year}{now.month:02d}{random.randint(1000, 9999)}"
+        """Gerar número de protocolo único"""
+        return new_protocol()
 
-    def _generate_acknowledgment(self, email_content: str) -> str:
+    def _generate_acknowledgment(self, email_content, keyword_hits=None, language=None) -> str:
         """Gerar agradecimento específico baseado no conteúdo"""
         
-        content_lower = email_content.lower()
-        
-        if any(word in content_lower for word in ['parabéns', 'felicitações']):
-            return "Suas felicitações significam muito para nós!"
-        
-        elif any(word in content_lower for word in ['natal', 'ano novo', 'festas']):
-            return "Retribuímos os votos de boas festas! Que o próximo período seja repleto de realizações."
-        
-        elif any(word in content_lower for word in ['aniversário', 'birthday']):
-            return "Muito obrigado pelos parabéns! Foi muito gentil de sua parte."
-        
-        elif any(word in content_lower for word in ['obrigado', 'obrigada', 'agradeço']):
-            return "Fico feliz em poder ajudar! Conte sempre conosco."
-        
-        elif any(word in content_lower for word in ['compartilhar', 'forward', 'interessante']):
-            return "Obrigado por compartilhar essa informação conosco."
-        
-        else:
-            return "Agradeço por manter contato e pensar em nós."
+        template = self.templates.select('generator/agradecimento', keyword_hits=keyword_hits,
+                                         language=language, text_lower=parse_email(email_content).text_lower)
+        return template.render({})
 
-    def customize_response_for_context(self, response: str, email_content: str) -> str:
+    def customize_response_for_context(self, response: str, email_content) -> str:
         """Personalizar resposta baseada no contexto do email"""
         
-        content_lower = email_content.lower()
+        email = parse_email(email_content)
         
-        if 'sistema' in content_lower or 'login' in content_lower:
+        if email.contains_any(('sistema', 'login')):
             response += "\n\nPara questões técnicas urgentes, nosso suporte está disponível 24/7."
         
-        elif 'reunião' in content_lower or 'meeting' in content_lower:
+        elif email.contains_any(('reunião', 'meeting')):
             response += "\n\nConfirmaremos a disponibilidade e enviaremos o convite do calendário em breve."
         
-        elif 'orçamento' in content_lower or 'proposta' in content_lower:
+        elif email.contains_any(('orçamento', 'proposta')):
             response += "\n\nNossa equipe comercial entrará em contato para alinhar os detalhes."
         
-        elif 'urgente' in content_lower or 'emergência' in content_lower:
+        elif email.contains_any(('urgente', 'emergência')):
             response += "\n\n⚠️ Devido à urgência mencionada, priorizaremos sua solicitação."
         
         return response
 
-    def generate_subject_suggestion(self, classification: str, original_content: str) -> str:
+    def generate_subject_suggestion(self, classification: str, original_content) -> str:
         """Gerar sugestão de assunto para a resposta"""
         
         if classification.lower() == 'produtivo':
-            if 'suporte' in original_content.lower():
+            email = parse_email(original_content)
+            if 'suporte' in email.text_lower:
                 return "Re: Confirmação de recebimento - Solicitação de Suporte"
-            elif 'reunião' in original_content.lower():
+            elif 'reunião' in email.text_lower:
                 return "Re: Confirmação - Agendamento de Reunião"
-            elif 'orçamento' in original_content.lower():
+            elif 'orçamento' in email.text_lower:
                 return "Re: Recebido - Solicitação de Orçamento"
             else:
                 return "Re: Confirmação de recebimento"
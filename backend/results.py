@@ -0,0 +1,112 @@
+# Objetos com __slots__ e campos planos; os dicts aninhados só são montados
+# na fronteira da API, via to_dict()
+
+
+class ClassificationResult:
+    """Resultado de classificação de um email"""
+
+    __slots__ = (
+        'classification', 'confidence', 'explanation', 'language',
+        'productive_score', 'unproductive_score',
+        'word_count', 'char_count', 'question_count', 'exclamation_count',
+        'found_keywords', 'keyword_hits'
+    )
+
+    def __init__(self, classification, confidence, explanation, language,
+                 productive_score, unproductive_score, word_count, char_count,
+                 question_count, exclamation_count, found_keywords,
+                 keyword_hits=()):
+        self.classification = classification
+        self.confidence = confidence
+        self.explanation = explanation
+        self.language = language
+        self.productive_score = productive_score
+        self.unproductive_score = unproductive_score
+        self.word_count = word_count
+        self.char_count = char_count
+        self.question_count = question_count
+        self.exclamation_count = exclamation_count
+        self.found_keywords = tuple(found_keywords)
+        # Palavras-chave do léxico encontradas (uso interno, não serializado)
+        self.keyword_hits = tuple(keyword_hits)
+
+    @property
+    def total_score(self):
+        return self.productive_score + self.unproductive_score
+
+    def analysis_details(self):
+        """Montar o bloco 'analysis_details' no formato da API"""
+        return {
+            'language': self.language,
+            'scores': {
+                'productive': self.productive_score,
+                'unproductive': self.unproductive_score,
+                'total': self.total_score
+            },
+            'text_stats': {
+                'word_count': self.word_count,
+                'char_count': self.char_count,
+                'question_count': self.question_count,
+                'exclamation_count': self.exclamation_count
+            },
+            'found_keywords': list(self.found_keywords)
+        }
+
+    def to_dict(self):
+        """Serializar no mesmo formato JSON usado pela API"""
+        return {
+            'classification': self.classification,
+            'confidence': self.confidence,
+            'explanation': self.explanation,
+            'analysis_details': self.analysis_details()
+        }
+
+
+class EmailFeatures:
+    """Características extraídas de um email"""
+
+    __slots__ = (
+        'length', 'word_count', 'exclamation_marks', 'question_marks',
+        'capital_ratio', 'urgency_score', 'question_score', 'gratitude_score',
+        'has_attachment', 'has_link'
+    )
+
+    def __init__(self, length, word_count, exclamation_marks, question_marks,
+                 capital_ratio, urgency_score, question_score, gratitude_score,
+                 has_attachment, has_link):
+        self.length = length
+        self.word_count = word_count
+        self.exclamation_marks = exclamation_marks
+        self.question_marks = question_marks
+        self.capital_ratio = capital_ratio
+        self.urgency_score = urgency_score
+        self.question_score = question_score
+        self.gratitude_score = gratitude_score
+        self.has_attachment = has_attachment
+        self.has_link = has_link
+
+    def to_dict(self):
+        """Serializar no formato de dict usado anteriormente"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class GeneratedResponse:
+    """Resposta sugerida e sua origem"""
+
+    __slots__ = ('text', 'source', 'request_id', 'upgrade_pending')
+
+    def __init__(self, text, source, request_id=None, upgrade_pending=False):
+        self.text = text
+        # 'llm', 'cache' ou 'template'
+        self.source = source
+        self.request_id = request_id
+        # Resposta do LLM ainda pode chegar (ver ResponseGenerator.get_deferred_response)
+        self.upgrade_pending = upgrade_pending
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'source': self.source,
+            'request_id': self.request_id,
+            'upgrade_pending': self.upgrade_pending
+        }
@@ -0,0 +1,227 @@
+import io
+import sys
+import json
+import base64
+from http import HTTPStatus
+from urllib.parse import unquote_to_bytes, urlencode
+
+# Tipos de resposta devolvidos como texto; o resto (imagens, PDF, corpo comprimido) vai em base64
+TEXT_MIMETYPES = ('text/', 'application/json', 'application/javascript', 'application/xml',
+                  'application/x-ndjson', 'image/svg+xml')
+TEXT_SUFFIXES = ('+json', '+xml')
+
+
+def event_format(event: dict) -> str:
+    """Formato do evento: 'vercel' (bridge), 'v2' (HTTP API/Function URL), 'alb' ou 'v1' (REST API)"""
+    if event.get('Action') == 'Invoke':
+        return 'vercel'
+    if event.get('version') == '2.0':
+        return 'v2'
+    if 'elb' in (event.get('requestContext') or {}):
+        return 'alb'
+    return 'v1'
+
+
+def decode_body(body, is_base64: bool) -> bytes:
+    if not body:
+        return b''
+    if is_base64:
+        return base64.b64decode(body)
+    return body.encode('utf-8') if isinstance(body, str) else body
+
+
+def is_text(content_type: str, content_encoding: str = '') -> bool:
+    if content_encoding and content_encoding != 'identity':
+        return False
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    return mimetype.startswith(TEXT_MIMETYPES) or mimetype.endswith(TEXT_SUFFIXES)
+
+
+class ServerlessAdapter:
+    """Handler de Lambda/Vercel que chama a app WSGI direto, sem test_request_context
+
+    Cada evento vira um environ WSGI e a resposta volta no formato do evento
+    (API Gateway REST/HTTP API, Function URL, ALB ou o bridge da Vercel).
+    A instância fica no escopo do módulo: invocações "quentes" reaproveitam
+    a app e tudo que ela já carregou.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.invocations = 0
+
+    def __call__(self, event: dict, context=None) -> dict:
+        self.invocations += 1
+        kind = event_format(event)
+        if kind == 'vercel':
+            payload = json.loads(event['body'])
+            environ = self.vercel_environ(payload)
+        elif kind == 'v2':
+            environ = self.v2_environ(event)
+        else:
+            environ = self.v1_environ(event)
+        environ['serverless.event'] = event
+        environ['serverless.context'] = context
+
+        status, headers, body = self.call_app(environ)
+        return self.build_response(kind, event, status, headers, body)
+
+    # -- evento -> environ ---------------------------------------------------
+
+    def v1_environ(self, event: dict) -> dict:
+        """API Gateway REST (payload 1.0) e ALB"""
+        if event.get('multiValueHeaders'):
+            headers = {name: ', '.join(values) for name, values in event['multiValueHeaders'].items()}
+        else:
+            headers = dict(event.get('headers') or {})
+
+        if event.get('multiValueQueryStringParameters'):
+            query = urlencode([(name, value) for name, values in event['multiValueQueryStringParameters'].items()
+                               for value in values])
+        else:
+            query = urlencode(event.get('queryStringParameters') or {})
+
+        identity = (event.get('requestContext') or {}).get('identity') or {}
+        return self.make_environ(
+            method=event.get('httpMethod', 'GET'),
+            path=event.get('path') or '/',
+            query=query,
+            headers=headers,
+            body=decode_body(event.get('body'), event.get('isBase64Encoded', False)),
+            remote_addr=identity.get('sourceIp')
+        )
+
+    def v2_environ(self, event: dict) -> dict:
+        """API Gateway HTTP API (payload 2.0) e Lambda Function URL"""
+        http = event['requestContext']['http']
+        headers = dict(event.get('headers') or {})
+        if event.get('cookies'):
+            headers['cookie'] = '; '.join(event['cookies'])
+        return self.make_environ(
+            method=http['method'],
+            path=event.get('rawPath') or http.get('path') or '/',
+            query=event.get('rawQueryString', ''),
+            headers=headers,
+            body=decode_body(event.get('body'), event.get('isBase64Encoded', False)),
+            remote_addr=http.get('sourceIp')
+        )
+
+    def vercel_environ(self, payload: dict) -> dict:
+        """Bridge da Vercel: path já inclui a query string"""
+        path, _, query = payload.get('path', '/').partition('?')
+        return self.make_environ(
+            method=payload.get('method', 'GET'),
+            path=path,
+            query=query,
+            headers=dict(payload.get('headers') or {}),
+            body=decode_body(payload.get('body'), payload.get('encoding') == 'base64'),
+            remote_addr=None
+        )
+
+    @staticmethod
+    def make_environ(method, path, query, headers, body, remote_addr) -> dict:
+        lowered = {name.lower(): value for name, value in headers.items()}
+        host = lowered.get('host', 'localhost')
+        scheme = lowered.get('x-forwarded-proto', 'https').split(',')[0].strip()
+        if remote_addr is None:
+            # Última entrada: a anexada pelo proxy; as anteriores vêm do cliente
+            remote_addr = lowered.get('x-forwarded-for', '127.0.0.1').split(',')[-1].strip()
+
+        environ = {
+            'REQUEST_METHOD': method.upper(),
+            'SCRIPT_NAME': '',
+            # PATH_INFO é a URL já decodificada, em latin-1 (PEP 3333)
+            'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+            'QUERY_STRING': query,
+            'SERVER_NAME': host.split(':')[0],
+            'SERVER_PORT': lowered.get('x-forwarded-port', '443' if scheme == 'https' else '80'),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': remote_addr,
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scheme,
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        if 'content-type' in lowered:
+            environ['CONTENT_TYPE'] = lowered['content-type']
+        for name, value in lowered.items():
+            if name in ('content-type', 'content-length'):
+                continue
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+        return environ
+
+    # -- WSGI -> resposta ----------------------------------------------------
+
+    def call_app(self, environ: dict):
+        """Executar a app e juntar o corpo (streams como SSE são bufferizados)"""
+        response = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = status
+            response['headers'] = headers
+            return chunks.append
+
+        app_iter = self.app(environ, start_response)
+        try:
+            for data in app_iter:
+                if data:
+                    chunks.append(data)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        return int(response['status'].split(' ', 1)[0]), response['headers'], b''.join(chunks)
+
+    @staticmethod
+    def build_response(kind, event, status, headers, body) -> dict:
+        grouped = {}
+        for name, value in headers:
+            grouped.setdefault(name, []).append(value)
+        content_type = next((values[0] for name, values in grouped.items() if name.lower() == 'content-type'), '')
+        content_encoding = next((values[0] for name, values in grouped.items()
+                                 if name.lower() == 'content-encoding'), '')
+
+        binary = not is_text(content_type, content_encoding)
+        if not binary:
+            try:
+                text = body.decode('utf-8')
+            except UnicodeDecodeError:
+                binary = True
+        if binary:
+            text = base64.b64encode(body).decode('ascii')
+
+        if kind == 'vercel':
+            response = {'statusCode': status, 'headers': {name: values[0] if len(values) == 1 else values
+                                                          for name, values in grouped.items()},
+                        'body': text}
+            if binary:
+                response['encoding'] = 'base64'
+            return response
+
+        response = {'statusCode': status, 'body': text, 'isBase64Encoded': binary}
+        if kind == 'v2':
+            cookies = next((values for name, values in grouped.items() if name.lower() == 'set-cookie'), [])
+            response['headers'] = {name: ', '.join(values) for name, values in grouped.items()
+                                   if name.lower() != 'set-cookie'}
+            if cookies:
+                response['cookies'] = cookies
+        elif kind == 'alb' and not event.get('multiValueHeaders'):
+            # ALB sem multi-value aceita só um valor por header
+            response['headers'] = {name: values[-1] for name, values in grouped.items()}
+            response['statusDescription'] = f'{status} {_reason(status)}'
+        else:
+            response['multiValueHeaders'] = grouped
+            if kind == 'alb':
+                response['statusDescription'] = f'{status} {_reason(status)}'
+        return response
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ''
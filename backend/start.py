@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 import subprocess
 import platform
 
@@ -15,8 +16,8 @@ def check_python_version():
     version = sys.version_info
     print(f"   Python {version.major}.{version.minor}.{version.micro}")
     
-    if version.major < 3 or (version.major == 3 and version.minor < 7):
-        print("   ❌ Python 3.7+ é necessário")
+    if version.major < 3 or (version.major == 3 and version.minor < 9):
+        print("   ❌ Python 3.9+ é necessário")
         return False
     else:
         print("   ✅ Versão do Python OK")
@@ -204,7 +205,8 @@ if __name__ == '__main__':
     print("🧪 Test: http://localhost:5000/test")
     print("⚠️  Mantenha este terminal aberto")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Reloader e debugger só em desenvolvimento (FLASK_DEBUG=1)
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
 '''
     
     try:
@@ -257,6 +259,7 @@ def create_requirements():
     requirements_content = """flask==2.3.3
 flask-cors==4.0.0
 werkzeug==2.3.7
+gunicorn==23.0.0; platform_system != "Windows"
 """
     
     try:
@@ -344,18 +347,220 @@ def print_instructions(script_name):
     
     print("\n🌐 DEPOIS DE EXECUTAR, ABRA NO NAVEGADOR:")
     print("   http://localhost:5000")
+    print("\n🏭 PRODUÇÃO (vários processos, Linux/Mac, requer gunicorn):")
+    print("   💻 python backend/start.py serve --workers 4 --threads 4")
     print("\n🔧 PARA PARAR O SERVIDOR:")
     print("   Pressione Ctrl + C no terminal")
     
     print("\n" + "=" * 70)
 
+# ---------------------------------------------------------------------------
+# Modo produção: python backend/start.py serve [opções]
+# ---------------------------------------------------------------------------
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_MODULES = {
+    'api': os.path.join('api', 'analyze.py'),
+    'root': 'app.py'
+}
+
+# Worker id dos IDs snowflake (10 bits): slots 0..1022 para os workers,
+# o último para o master (IDs do aquecimento, antes do fork)
+MAX_WORKERS = 1023
+MASTER_WORKER_ID = 1023
+
+# Emails de aquecimento: exercitam léxicos, regex e templates dos dois idiomas
+WARMUP_EMAILS = [
+    "Olá, estou com um problema urgente no sistema. O relatório não abre desde ontem. "
+    "Podem verificar?\n\nAtenciosamente,\nMaria Silva",
+    "Parabéns pelo aniversário! Obrigado pela parceria e boas festas a toda a equipe.\n\nAbraços,\nJoão",
+    "Hi team, I need help with an error in the billing report. Could you check the status "
+    "of my request?\n\nBest regards,\nJohn Smith",
+    "Thank you so much for the great meeting yesterday. Happy holidays!\n\nCheers,\nAnna"
+]
+
+def load_app_module(name):
+    """Importar o módulo da aplicação Flask ('api' ou 'root')"""
+    import importlib.util
+    
+    path = os.path.join(PROJECT_ROOT, APP_MODULES[name])
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registrado antes de executar: o Flask acha a pasta da aplicação por sys.modules
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def warmup_app(module):
+    """Hook de aquecimento padrão, executado no master antes do fork
+    
+    Classifica e responde os emails de exemplo e chama o health check, para
+    que léxicos, regex, templates e rotas já estejam prontos nas páginas
+    compartilhadas pelos workers. Não passa por /api/analyze para não
+    povoar o índice de quase duplicados.
+    """
+    for sample in WARMUP_EMAILS:
+        if hasattr(module, 'classify_email_professional'):
+            result = module.classify_email_professional(sample)
+            module.generate_professional_response(
+                sample, result.classification,
+                keyword_hits=result.keyword_hits, language=result.language
+            )
+        elif hasattr(module, 'classify_email'):
+            module.classify_email(sample)
+    
+    with module.app.test_client() as client:
+        client.get('/api/health')
+
+def production_settings(argv=None):
+    """Opções do modo produção (linha de comando, com padrões do ambiente)"""
+    import argparse
+    import multiprocessing
+    
+    parser = argparse.ArgumentParser(
+        prog='python backend/start.py serve',
+        description='Servidor WSGI de produção com múltiplos processos (gunicorn, pre-fork)'
+    )
+    parser.add_argument('--app', choices=sorted(APP_MODULES), default=os.getenv('AUTOU_APP', 'api'),
+                        help='api = api/analyze.py, root = app.py')
+    parser.add_argument('--bind', default=os.getenv('AUTOU_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}"))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count() * 2 + 1))),
+                        help='processos (padrão WEB_CONCURRENCY ou 2 × CPUs + 1)')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('AUTOU_THREADS', '4')),
+                        help='threads por processo')
+    parser.add_argument('--max-requests', type=int, default=int(os.getenv('AUTOU_MAX_REQUESTS', '1000')),
+                        help='requests por worker antes de reciclá-lo (0 desliga)')
+    parser.add_argument('--max-requests-jitter', type=int,
+                        default=int(os.getenv('AUTOU_MAX_REQUESTS_JITTER', '100')),
+                        help='variação aleatória do limite, para os workers não reciclarem juntos')
+    parser.add_argument('--timeout', type=int, default=int(os.getenv('AUTOU_TIMEOUT', '30')))
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.getenv('AUTOU_GRACEFUL_TIMEOUT', '30')),
+                        help='segundos para um worker reciclado terminar os requests em andamento')
+    parser.add_argument('--keepalive', type=int, default=int(os.getenv('AUTOU_KEEPALIVE', '5')),
+                        help='segundos que uma conexão ociosa fica aberta para o próximo request (0 desliga); '
+                             'atrás de um balanceador, use mais que o timeout ocioso dele')
+    parser.add_argument('--worker-connections', type=int,
+                        default=int(os.getenv('AUTOU_WORKER_CONNECTIONS', '1000')),
+                        help='conexões abertas por processo, incluindo as ociosas em keep-alive')
+    parser.add_argument('--no-warmup', action='store_true', help='não aquecer a aplicação antes do fork')
+    
+    settings = parser.parse_args(argv)
+    if not 1 <= settings.workers <= MAX_WORKERS:
+        parser.error(f'--workers deve estar entre 1 e {MAX_WORKERS}')
+    if settings.threads < 1:
+        parser.error('--threads deve ser pelo menos 1')
+    if settings.keepalive and settings.worker_connections <= settings.threads:
+        # O gthread reserva uma conexão por thread; sem sobra nenhuma fica em keep-alive
+        parser.error('--worker-connections deve ser maior que --threads para haver keep-alive')
+    return settings
+
+def _assign_worker_slot(server, worker):
+    """(master) Menor slot livre entre os workers vivos, usado como worker id"""
+    used = {getattr(w, 'autou_slot', None) for w in server.WORKERS.values()}
+    worker.autou_slot = next(slot for slot in range(MAX_WORKERS) if slot not in used)
+
+def _configure_worker(server, worker):
+    """(worker) IDs de protocolo/request com o worker id do slot"""
+    os.environ['AUTOU_WORKER_ID'] = str(worker.autou_slot)
+    from id_generator import set_worker_id
+    set_worker_id(worker.autou_slot)
+
+def _freeze_shared_heap(server):
+    """(master) Congelar objetos carregados antes do fork
+    
+    Sem isso, a coleta de lixo dos workers escreve nos cabeçalhos desses
+    objetos e as páginas compartilhadas viram cópias privadas.
+    """
+    import gc
+    gc.collect()
+    gc.freeze()
+
+def gunicorn_options(settings):
+    return {
+        'bind': settings.bind,
+        'workers': settings.workers,
+        'threads': settings.threads,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'max_requests': settings.max_requests,
+        'max_requests_jitter': settings.max_requests_jitter,
+        'timeout': settings.timeout,
+        'graceful_timeout': settings.graceful_timeout,
+        'keepalive': settings.keepalive,
+        'worker_connections': settings.worker_connections,
+        'pre_fork': _assign_worker_slot,
+        'post_fork': _configure_worker,
+        'when_ready': _freeze_shared_heap
+    }
+
+def print_production_settings(settings):
+    """Mostrar a concorrência efetiva do servidor"""
+    print("=" * 70)
+    print("🏭 AUTOU EMAIL CLASSIFIER - SERVIDOR DE PRODUÇÃO")
+    print("=" * 70)
+    print(f"   📦 Aplicação: {APP_MODULES[settings.app]}")
+    print(f"   📡 Endereço: {settings.bind}")
+    print(f"   👷 Workers: {settings.workers} processos × {settings.threads} threads = "
+          f"{settings.workers * settings.threads} requests simultâneos")
+    if settings.max_requests:
+        limit = str(settings.max_requests)
+        if settings.max_requests_jitter:
+            limit += f"-{settings.max_requests + settings.max_requests_jitter}"
+        print(f"   ♻️  Reciclagem: a cada {limit} requests por worker "
+              f"(encerramento gracioso em até {settings.graceful_timeout}s)")
+    else:
+        print("   ♻️  Reciclagem: desligada")
+    if settings.keepalive:
+        keepalive = (f"{settings.keepalive}s (até {settings.worker_connections - settings.threads} "
+                     f"conexões ociosas por worker)")
+    else:
+        keepalive = "desligado"
+    print(f"   ⏱️  Timeout: {settings.timeout}s | keep-alive: {keepalive}")
+    print(f"   🔥 Pré-carga antes do fork: sim | aquecimento: {'não' if settings.no_warmup else 'sim'}")
+    print("=" * 70)
+
+def serve(settings, warmup=warmup_app):
+    """Subir o gunicorn embutido com a aplicação carregada no master"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ gunicorn não está instalado. Instale com: pip install -r requirements.txt")
+        print("   (no Windows o gunicorn não roda; use python app.py)")
+        sys.exit(1)
+    
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options(settings).items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            module = load_app_module(settings.app)
+            from id_generator import set_worker_id
+            set_worker_id(MASTER_WORKER_ID)
+            if warmup is not None and not settings.no_warmup:
+                started = time.time()
+                warmup(module)
+                print(f"🔥 Aplicação aquecida em {(time.time() - started) * 1000:.0f}ms")
+            return module.app
+    
+    # Com vários workers um processo sem worker id definido recusa emitir IDs
+    os.environ['AUTOU_WORKERS'] = str(settings.workers)
+    print_production_settings(settings)
+    ProductionServer().run()
+
+def serve_main(argv=None):
+    serve(production_settings(argv))
+
 def main():
     """Função principal do setup"""
     print_header()
     
     # Verificações e correções
     if not check_python_version():
-        print("\n❌ Versão do Python incompatível. Atualize para Python 3.7+")
+        print("\n❌ Versão do Python incompatível. Atualize para Python 3.9+")
         return
     
     current_dir, py_files = check_current_directory()
@@ -378,4 +583,7 @@ def main():
         print("\n❌ Falha no teste final")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        serve_main(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
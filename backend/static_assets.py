@@ -0,0 +1,117 @@
+import os
+import json
+import hashlib
+import logging
+import mimetypes
+
+from flask import Response
+
+from build_assets import DIST_DIR, MANIFEST_FILE, ROOT, content_hash
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Páginas mudam sem trocar de nome: sempre revalidar (304 pelo ETag)
+PAGE_CACHE = 'no-cache'
+
+# Preferência quando o cliente aceita as duas
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class _Asset:
+    __slots__ = ('body', 'variants', 'mimetype', 'etag', 'cache_control')
+
+    def __init__(self, body, variants, mimetype, etag, cache_control):
+        self.body = body
+        self.variants = variants
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+
+
+class StaticAssets:
+    """Serve da memória os arquivos gerados por build_assets.py
+
+    Assets com hash no nome vão com cache imutável de um ano; páginas com
+    no-cache e ETag. A versão .br/.gz pré-comprimida é escolhida pelo
+    Accept-Encoding. Sem build, ou com build mais antigo que alguma página
+    ou asset, `available` fica falso e a app serve os arquivos originais.
+    """
+
+    def __init__(self, dist_dir=DIST_DIR, root=ROOT):
+        self.dist_dir = dist_dir
+        self.available = False
+        self._assets = {}
+
+        manifest_path = os.path.join(dist_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if 'pages' not in manifest:
+            logger.warning("Build de assets em formato antigo; rode backend/build_assets.py")
+            return
+
+        # Páginas e assets: um CSS/JS/imagem editado seguiria servido com o hash antigo e cache imutável
+        for source, digest in manifest['sources'].items():
+            try:
+                with open(os.path.join(root, source), 'rb') as f:
+                    current = content_hash(f.read())
+            except FileNotFoundError:
+                current = None
+            if current != digest:
+                logger.warning(f"Build de assets desatualizado ({source} mudou); rode backend/build_assets.py")
+                return
+
+        pages = set(manifest['pages'])
+        for dirpath, _, filenames in os.walk(dist_dir):
+            for filename in filenames:
+                if filename.endswith(('.gz', '.br')) or filename == MANIFEST_FILE:
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, dist_dir).replace(os.sep, '/')
+                self._assets[name] = self._load(path, name in pages)
+
+        self.available = True
+        logger.info(f"Assets estáticos carregados: {len(self._assets)} de {dist_dir}")
+
+    def _load(self, path, is_page):
+        with open(path, 'rb') as f:
+            body = f.read()
+        variants = {}
+        for encoding, suffix in ENCODINGS:
+            if os.path.exists(path + suffix):
+                with open(path + suffix, 'rb') as f:
+                    variants[encoding] = f.read()
+        return _Asset(
+            body,
+            variants,
+            mimetypes.guess_type(path)[0] or 'application/octet-stream',
+            hashlib.sha256(body).hexdigest()[:16],
+            PAGE_CACHE if is_page else IMMUTABLE_CACHE
+        )
+
+    def response(self, name, request):
+        """Resposta para o asset `name` (relativo a dist/), ou None se não existir"""
+        asset = self._assets.get(name)
+        if asset is None:
+            return None
+
+        body = asset.body
+        encoding = None
+        for candidate, _ in ENCODINGS:
+            if candidate in asset.variants and request.accept_encodings[candidate]:
+                encoding = candidate
+                body = asset.variants[candidate]
+                break
+
+        response = Response(body, mimetype=asset.mimetype)
+        response.headers['Cache-Control'] = asset.cache_control
+        if asset.variants:
+            response.headers['Vary'] = 'Accept-Encoding'
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        # ETag por representação: a versão comprimida tem bytes diferentes
+        response.set_etag(f'{asset.etag}-{encoding}' if encoding else asset.etag)
+        return response.make_conditional(request)
@@ -0,0 +1,20 @@
+import re
+import json
+
+_WORD_RE = re.compile(r'\s*\S+\s*')
+
+
+def sse_event(event: str, data) -> str:
+    """Formatar evento server-sent events com payload JSON"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def iter_chunks(text: str, words_per_chunk: int = 4):
+    """Dividir texto pronto em trechos de algumas palavras (espaços preservados)"""
+    words = _WORD_RE.findall(text)
+    if not words:
+        if text:
+            yield text
+        return
+    for i in range(0, len(words), words_per_chunk):
+        yield ''.join(words[i:i + words_per_chunk])
@@ -0,0 +1,319 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from string import Formatter
+from typing import Dict, List, Optional
+
+from language_detector import DEFAULT_LANGUAGE
+from lexicons import LEXICONS
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+RULES_FILE = 'rules.json'
+# Templates e regras já compilados em um único arquivo (python backend/build_snapshot.py),
+# versionado junto com o código: o deploy não tem etapa de build
+SNAPSHOT_FILE = os.getenv('AUTOU_SNAPSHOT_FILE') or os.path.join(TEMPLATES_DIR, 'snapshot.json')
+SNAPSHOT_VERSION = 2
+
+
+def lexicon_fingerprint() -> str:
+    """Hash dos termos dos léxicos: as regras compiladas dependem deles"""
+    terms = json.dumps({language: lexicon.keywords for language, lexicon in sorted(LEXICONS.items())})
+    return hashlib.sha1(terms.encode('utf-8')).hexdigest()
+
+
+def _is_source(filename: str) -> bool:
+    return filename.endswith('.txt') or filename == RULES_FILE
+
+
+def source_fingerprint(directory: str = TEMPLATES_DIR) -> str:
+    """Hash do conteúdo dos templates .txt e do rules.json
+
+    Conteúdo e não mtime: o snapshot é versionado e o checkout muda as datas.
+    Calculado só ao gerar o snapshot, nunca no cold start.
+    """
+    digest = hashlib.sha1()
+    for root, _, filenames in sorted(os.walk(directory)):
+        for filename in sorted(filter(_is_source, filenames)):
+            path = os.path.join(root, filename)
+            digest.update(os.path.relpath(path, directory).replace(os.sep, '/').encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(f.read() + b'\0')
+    return digest.hexdigest()
+
+
+class CompiledTemplate:
+    """Template pré-compilado em trechos estáticos intercalados com slots"""
+
+    __slots__ = ('name', 'statics', 'slots')
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        statics = []
+        slots = []
+        pending = ''
+        for literal, field, _, _ in Formatter().parse(source):
+            pending += literal
+            if field is not None:
+                statics.append(pending)
+                slots.append(field)
+                pending = ''
+        statics.append(pending)
+
+        # len(statics) == len(slots) + 1
+        self.statics = tuple(statics)
+        self.slots = tuple(slots)
+
+    @classmethod
+    def from_parts(cls, name: str, statics, slots) -> 'CompiledTemplate':
+        """Template a partir de trechos já separados (snapshot)"""
+        template = cls.__new__(cls)
+        template.name = name
+        template.statics = tuple(statics)
+        template.slots = tuple(slots)
+        return template
+
+    def render(self, values: Dict[str, object]) -> str:
+        statics = self.statics
+        parts = [statics[0]]
+        for i, slot in enumerate(self.slots, 1):
+            parts.append(str(values[slot]))
+            parts.append(statics[i])
+        return ''.join(parts)
+
+
+class _Rule:
+    """Regra de escolha de template compilada para um idioma"""
+
+    __slots__ = ('lexicon_terms', 'other_terms', 'template')
+
+    def __init__(self, terms, lexicon_keywords, template):
+        # Termos do léxico são resolvidos pelos acertos do classificador;
+        # só os demais precisam ser procurados no texto
+        self.lexicon_terms = frozenset(t for t in terms if t in lexicon_keywords)
+        self.other_terms = tuple(t for t in terms if t not in lexicon_keywords)
+        self.template = template
+
+    @classmethod
+    def from_parts(cls, lexicon_terms, other_terms, template) -> '_Rule':
+        rule = cls.__new__(cls)
+        rule.lexicon_terms = frozenset(lexicon_terms)
+        rule.other_terms = tuple(other_terms)
+        rule.template = template
+        return rule
+
+
+class TemplateEngine:
+    """Carrega templates de arquivos uma única vez e os mantém compilados
+
+    Estrutura do diretório:
+        <nome>.txt   - templates (o nome é o caminho relativo sem extensão)
+        rules.json   - regras de escolha por palavra-chave de cada ramo
+    """
+
+    def __init__(self, directory: str = TEMPLATES_DIR, check_interval: Optional[float] = 5.0):
+        self.directory = directory
+        # Intervalo mínimo entre verificações de arquivos alterados (None desliga)
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self.reload()
+
+    def _scan_files(self):
+        files = {}
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if _is_source(filename):
+                    path = os.path.join(root, filename)
+                    files[path] = os.stat(path).st_mtime_ns
+        return files
+
+    def reload(self):
+        """Recarregar e recompilar todos os templates e regras"""
+        with self._reload_lock:
+            files = self._scan_files()
+
+            templates = {}
+            for path in files:
+                if not path.endswith('.txt'):
+                    continue
+                name = os.path.relpath(path, self.directory)[:-len('.txt')].replace(os.sep, '/')
+                with open(path, 'r', encoding='utf-8') as f:
+                    source = f.read()
+                if source.endswith('\n'):
+                    source = source[:-1]
+                templates[name] = CompiledTemplate(name, source)
+
+            rules = {}
+            rules_path = os.path.join(self.directory, RULES_FILE)
+            if os.path.exists(rules_path):
+                with open(rules_path, 'r', encoding='utf-8') as f:
+                    raw_rules = json.load(f)
+                for branch, entries in raw_rules.items():
+                    for language, lexicon in LEXICONS.items():
+                        compiled = []
+                        for entry in entries:
+                            if 'template' in entry:
+                                template = templates[entry['template']]
+                            else:
+                                template = CompiledTemplate(branch, entry['text'])
+                            terms = entry.get('keywords', {}).get(language, [])
+                            compiled.append(_Rule(terms, lexicon.keywords, template))
+                        rules[(branch, language)] = tuple(compiled)
+
+            # Troca atômica: requests em andamento continuam com a versão anterior
+            self._files = files
+            self._templates = templates
+            self._rules = rules
+            self._names = {}
+
+        logger.info(f"Templates carregados: {len(templates)} de {self.directory}")
+
+    def snapshot(self) -> dict:
+        """Templates e regras compilados, em formato JSON"""
+        return {
+            'version': SNAPSHOT_VERSION,
+            'lexicons': lexicon_fingerprint(),
+            'sources': source_fingerprint(self.directory),
+            'templates': {
+                name: [template.statics, template.slots] for name, template in sorted(self._templates.items())
+            },
+            'rules': [
+                [branch, language, [
+                    [sorted(rule.lexicon_terms), rule.other_terms,
+                     rule.template.name, rule.template.statics, rule.template.slots]
+                    for rule in rules
+                ]]
+                for (branch, language), rules in sorted(self._rules.items())
+            ]
+        }
+
+    @classmethod
+    def from_snapshot(cls, path: str = SNAPSHOT_FILE,
+                      directory: str = TEMPLATES_DIR) -> Optional['TemplateEngine']:
+        """Engine carregada de um snapshot, sem compilar o diretório nem verificar mudanças
+
+        None se o arquivo não existir ou tiver sido gerado com outros léxicos.
+        Os arquivos de `directory` não são lidos: conferir o hash deles a cada
+        cold start traria de volta o I/O que o snapshot evita. Snapshot em dia
+        com templates e regras ('sources') é verificado antes do deploy, por
+        benchmarks/bench_cold_start.py.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get('version') != SNAPSHOT_VERSION or data.get('lexicons') != lexicon_fingerprint():
+            logger.warning(f"Snapshot de templates desatualizado: {path}; rode backend/build_snapshot.py")
+            return None
+
+        templates = {
+            name: CompiledTemplate.from_parts(name, statics, slots)
+            for name, (statics, slots) in data['templates'].items()
+        }
+        rules = {}
+        for branch, language, entries in data['rules']:
+            compiled = []
+            for lexicon_terms, other_terms, name, statics, slots in entries:
+                template = templates.get(name) or CompiledTemplate.from_parts(name, statics, slots)
+                compiled.append(_Rule.from_parts(lexicon_terms, other_terms, template))
+            rules[(branch, language)] = tuple(compiled)
+
+        engine = cls.__new__(cls)
+        engine.directory = directory
+        engine.check_interval = None
+        engine._reload_lock = threading.Lock()
+        engine._last_check = time.monotonic()
+        engine._files = {}
+        engine._templates = templates
+        engine._rules = rules
+        engine._names = {}
+        return engine
+
+    def _maybe_reload(self):
+        if self.check_interval is None:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        try:
+            if self._scan_files() != self._files:
+                self.reload()
+        except Exception as e:
+            logger.warning(f"Falha ao recarregar templates: {str(e)}")
+
+    def names(self, prefix: str) -> List[str]:
+        """Listar templates cujo nome começa com o prefixo"""
+        self._maybe_reload()
+        names = self._names.get(prefix)
+        if names is None:
+            names = sorted(name for name in self._templates if name.startswith(prefix + '/'))
+            self._names[prefix] = names
+        return names
+
+    def get(self, name: str) -> CompiledTemplate:
+        self._maybe_reload()
+        return self._templates[name]
+
+    def render(self, name: str, **values) -> str:
+        return self.get(name).render(values)
+
+    def select(self, branch: str, text: Optional[str] = None, keyword_hits=None,
+               language: Optional[str] = None, text_lower: Optional[str] = None) -> CompiledTemplate:
+        """Escolher o template da primeira regra satisfeita do ramo
+
+        Com `keyword_hits` (palavras-chave já encontradas pelo classificador)
+        os termos do léxico não são procurados de novo no texto; com
+        `text_lower` o texto não é convertido de novo.
+        """
+        self._maybe_reload()
+        rules = self._rules.get((branch, language)) or self._rules[(branch, DEFAULT_LANGUAGE)]
+
+        for rule in rules:
+            if not rule.lexicon_terms and not rule.other_terms:
+                return rule.template
+
+            if keyword_hits is not None:
+                if not rule.lexicon_terms.isdisjoint(keyword_hits):
+                    return rule.template
+                terms = rule.other_terms
+            else:
+                terms = tuple(rule.lexicon_terms) + rule.other_terms
+
+            if terms and (text is not None or text_lower is not None):
+                if text_lower is None:
+                    text_lower = text.lower()
+                if any(term in text_lower for term in terms):
+                    return rule.template
+
+        return rules[-1].template
+
+
+_default_engine = None
+
+
+def cold_start_mode() -> bool:
+    """AUTOU_COLD_START=1 (padrão na Vercel/Lambda): carregar o snapshot em vez do diretório"""
+    serverless = bool(os.getenv('VERCEL') or os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
+    return os.getenv('AUTOU_COLD_START', '1' if serverless else '0') == '1'
+
+
+def get_template_engine() -> TemplateEngine:
+    """Engine compartilhada pelo processo (carregada uma única vez)
+
+    Em modo cold start usa o snapshot, se houver um válido; em serverless os
+    arquivos não mudam depois do deploy, então não há verificação de mudanças.
+    """
+    global _default_engine
+    if _default_engine is None:
+        if cold_start_mode():
+            _default_engine = TemplateEngine.from_snapshot() or TemplateEngine(check_interval=None)
+        else:
+            _default_engine = TemplateEngine()
+    return _default_engine
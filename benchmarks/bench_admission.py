@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_asgi_vs_flask import percentile, run_load, send_request, start_server, serve_flask
+
+PORT = 8103
+SERVER_THREADS = 32
+# Só emails longos (CPU do servidor): o gerador de carga roda na mesma máquina
+# e precisa gastar bem menos CPU que o servidor para conseguir sobrecarregá-lo
+WORKLOAD_MIX = ['longo']
+
+
+def open_loop(port, rate, duration):
+    """Requests chegando em ritmo fixo (`rate`/s), sem esperar as respostas anteriores"""
+    workloads = itertools.cycle(WORKLOAD_MIX)
+    futures = []
+    with ThreadPoolExecutor(max_workers=512) as pool:
+        start = time.perf_counter()
+        for i in range(int(rate * duration)):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(send_request, port, next(workloads)))
+    return [future.result() for future in futures]
+
+
+def run_scenario(name, env, rate, duration):
+    # O servidor herda a configuração de admissão do ambiente
+    os.environ.update(env)
+    process = start_server([sys.executable, os.path.abspath(__file__), '--serve', str(PORT), str(SERVER_THREADS)], PORT)
+    try:
+        run_load(PORT, 10, 10)  # aquecer
+        results = open_loop(PORT, rate, duration)
+    finally:
+        process.terminate()
+        process.wait()
+
+    accepted = [seconds for status, seconds in results if status == 200]
+    shed = sum(1 for status, _ in results if status in (429, 503))
+    print(f"{name:<44} {len(accepted):>8} {shed:>10} "
+          f"{percentile(accepted, 50) * 1000:7.1f}ms {percentile(accepted, 99) * 1000:7.1f}ms "
+          f"{len(accepted) / duration:8.1f}/s")
+
+
+def measure_capacity(concurrency=16, total=400):
+    os.environ.update(ADMISSION_RATE='0', ADMISSION_MAX_CONCURRENT='1000000')
+    process = start_server([sys.executable, os.path.abspath(__file__), '--serve', str(PORT), str(SERVER_THREADS)], PORT)
+    try:
+        run_load(PORT, 10, 10)
+        elapsed, results = run_load(PORT, total, concurrency, WORKLOAD_MIX)
+    finally:
+        process.terminate()
+        process.wait()
+    return len(results) / elapsed
+
+
+def main(overload=1.5, duration=10.0):
+    print("🧪 BENCHMARK DO CONTROLE DE ADMISSÃO - sobrecarga em /api/analyze")
+    print("=" * 60)
+
+    capacity = measure_capacity()
+    rate = capacity * overload
+    print(f"   capacidade medida: {capacity:.0f} req/s; carga oferecida: {rate:.0f} req/s "
+          f"({overload:.1f}x) por {duration:.0f}s, {os.cpu_count()} CPU(s)")
+
+    # Sem limite por cliente: a carga vem de um IP só, aqui interessa a vaga global
+    scenarios = [
+        ("Sem controle (vagas ilimitadas)", {
+            'ADMISSION_RATE': '0', 'ADMISSION_MAX_CONCURRENT': '1000000',
+            'ADMISSION_MAX_QUEUE': '1000000', 'ADMISSION_MAX_WAIT_SECONDS': '60'}),
+        ("Vagas 2 × CPUs, fila 32, espera máx. 100ms", {
+            'ADMISSION_RATE': '0', 'ADMISSION_MAX_CONCURRENT': str(2 * (os.cpu_count() or 1)),
+            'ADMISSION_MAX_QUEUE': '32', 'ADMISSION_MAX_WAIT_SECONDS': '0.1'}),
+    ]
+
+    print(f"\n{'':<44} {'aceitos':>8} {'recusados':>10} {'p50':>9} {'p99':>9} {'aceitos/s':>10}")
+    for name, env in scenarios:
+        run_scenario(name, env, rate, duration)
+
+    print("\n   Recusados recebem 503 + Retry-After na hora; os aceitos mantêm a latência")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve_flask(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
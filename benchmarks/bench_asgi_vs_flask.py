@@ -0,0 +1,209 @@
+import os
+import sys
+import time
+import json
+import socket
+import itertools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'api'))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+HOST = '127.0.0.1'
+FLASK_PORT = 8101
+ASGI_PORT = 8102
+
+SHORT_EMAIL = "Olá, estou com problema no sistema e preciso de ajuda urgente. Podem verificar?\n\nMaria"
+LONG_EMAIL = (
+    "Prezados, segue o relatório do projeto com as pendências da semana. "
+    "Precisamos revisar o contrato, a fatura do mês e o acesso ao sistema de suporte. "
+    "O erro no login continua acontecendo? Obrigado pela ajuda com a reunião de ontem. "
+) * 180  # ~41 mil caracteres
+UPLOAD_EMAIL = ("Assunto: Falha na integração\nDe: ana@empresa.com\n\n"
+                + "A integração com o ERP falhou novamente durante a madrugada. " * 150
+                + "\nPodem abrir um chamado?\n\nAna")
+
+# Mistura de carga: maioria de emails curtos, alguns longos (CPU) e uploads,
+# parte deles de clientes lentos (corpo enviado em pedaços)
+WORKLOAD_MIX = ['curto'] * 6 + ['longo'] * 2 + ['upload'] + ['upload_lento']
+SLOW_UPLOAD_PIECES = 8
+SLOW_UPLOAD_DELAY = 0.05
+
+
+def _json_request(text):
+    body = json.dumps({'text': text}).encode('utf-8')
+    return 'application/json', body
+
+
+def _multipart_request(text):
+    # Campo 'text' de formulário: as duas apps aceitam (só a ASGI aceita arquivo)
+    boundary = 'benchmark-boundary'
+    body = (
+        f'--{boundary}\r\n'
+        'Content-Disposition: form-data; name="text"\r\n\r\n'
+    ).encode('utf-8') + text.encode('utf-8') + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+    return f'multipart/form-data; boundary={boundary}', body
+
+
+REQUESTS = {
+    'curto': _json_request(SHORT_EMAIL),
+    'longo': _json_request(LONG_EMAIL),
+    'upload': _multipart_request(UPLOAD_EMAIL),
+    'upload_lento': _multipart_request(UPLOAD_EMAIL),
+}
+
+
+def send_request(port, workload):
+    """POST /api/analyze por socket (permite enviar o corpo devagar); devolve (status, segundos)"""
+    content_type, body = REQUESTS[workload]
+    # X-Request-Start como um proxy na frente carimbaria a chegada
+    head = (
+        f'POST /api/analyze HTTP/1.1\r\nHost: {HOST}:{port}\r\n'
+        f'Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n'
+        f'X-Request-Start: t={time.time():.6f}\r\nConnection: close\r\n\r\n'
+    ).encode('latin-1')
+
+    start = time.perf_counter()
+    with socket.create_connection((HOST, port), timeout=60) as sock:
+        sock.sendall(head)
+        try:
+            if workload == 'upload_lento':
+                piece = len(body) // SLOW_UPLOAD_PIECES + 1
+                for i in range(0, len(body), piece):
+                    sock.sendall(body[i:i + piece])
+                    time.sleep(SLOW_UPLOAD_DELAY)
+            else:
+                sock.sendall(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # recusado antes do fim do corpo; a resposta já pode estar no socket
+
+        # Lê até o Content-Length: em respostas de recusa (413/429/503) o servidor
+        # de desenvolvimento do werkzeug só fecha depois que o cliente para de enviar
+        response = b''
+        expected = None
+        while expected is None or len(response) < expected:
+            try:
+                data = sock.recv(65536)
+            except ConnectionResetError:
+                break
+            if not data:
+                break
+            response += data
+            if expected is None and b'\r\n\r\n' in response:
+                head_end = response.index(b'\r\n\r\n') + 4
+                for line in response[:head_end].split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        expected = head_end + int(line.split(b':', 1)[1])
+    elapsed = time.perf_counter() - start
+    status = int(response.split(b' ', 2)[1]) if response else 0
+    return status, elapsed
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_load(port, total, concurrency, mix=WORKLOAD_MIX):
+    workloads = list(itertools.islice(itertools.cycle(mix), total))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda w: (w, *send_request(port, w)), workloads))
+    return time.perf_counter() - start, results
+
+
+def report(name, elapsed, results):
+    print(f"\n⚡ {name}")
+    errors = sum(1 for _, status, _ in results if status != 200)
+    print(f"   {len(results)} requests em {elapsed:.2f}s ({len(results) / elapsed:.1f} req/s), erros={errors}")
+    latencies = [seconds for _, _, seconds in results]
+    print(f"   geral        p50={percentile(latencies, 50) * 1000:7.1f}ms  p99={percentile(latencies, 99) * 1000:7.1f}ms")
+    for workload in dict.fromkeys(WORKLOAD_MIX):
+        latencies = [seconds for w, _, seconds in results if w == workload]
+        print(f"   {workload:<12} p50={percentile(latencies, 50) * 1000:7.1f}ms  "
+              f"p99={percentile(latencies, 99) * 1000:7.1f}ms  (n={len(latencies)})")
+
+
+def serve_flask(port, threads):
+    """App Flask com número fixo de threads (como um worker gthread do gunicorn)"""
+    from werkzeug.serving import BaseWSGIServer
+    from analyze import app
+
+    class PooledWSGIServer(BaseWSGIServer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._process, request, client_address)
+
+        def _process(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    server = PooledWSGIServer(HOST, port, app)
+    server.socket.listen(256)
+    server.serve_forever()
+
+
+def start_server(command, port):
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'Servidor não subiu na porta {port}: {" ".join(command)}')
+
+
+def main(total=300, concurrency=16, flask_threads=4):
+    print("🧪 BENCHMARK FLASK (WSGI) x ASGI - carga mista em /api/analyze")
+    print("=" * 60)
+    print(f"   mistura: {', '.join(WORKLOAD_MIX)}")
+    print(f"   {concurrency} clientes simultâneos, {total} requests por servidor, {os.cpu_count()} CPU(s)")
+
+    # Carga de um IP só: sem limite por cliente; vagas = threads do servidor
+    os.environ.setdefault('ADMISSION_RATE', '0')
+    os.environ.setdefault('ADMISSION_MAX_CONCURRENT', str(flask_threads))
+
+    servers = [(
+        f"Flask (1 processo × {flask_threads} threads)",
+        [sys.executable, os.path.abspath(__file__), '--serve-flask', str(FLASK_PORT), str(flask_threads)],
+        FLASK_PORT
+    )]
+    try:
+        import uvicorn  # noqa: F401
+        servers.append((
+            "ASGI (uvicorn + pool de processos)",
+            [sys.executable, '-m', 'uvicorn', 'asgi:app', '--app-dir', 'api',
+             '--host', HOST, '--port', str(ASGI_PORT), '--log-level', 'warning'],
+            ASGI_PORT
+        ))
+    except ImportError:
+        print("\n⚠️  uvicorn não instalado (pip install uvicorn); medindo só a app Flask")
+
+    for name, command, port in servers:
+        process = start_server(command, port)
+        try:
+            run_load(port, len(WORKLOAD_MIX), len(WORKLOAD_MIX))  # aquecer
+            elapsed, results = run_load(port, total, concurrency)
+            report(name, elapsed, results)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve-flask':
+        serve_flask(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
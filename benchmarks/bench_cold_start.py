@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Módulos que /api/analyze não usa; importá-los no cold start é regressão
+FORBIDDEN_MODULES = [
+    'sqlite3', 'zipfile', 'mailbox_split', 'job_queue', 'response_cache',
+    'response_generator', 'llm_client', 'llm_batcher', 'circuit_breaker', 'deferred_responses'
+]
+
+# Executado em um interpretador novo: import da API + primeiro request pelo WSGI
+PROBE = r'''
+import io, sys, json, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import analyze
+imported = time.perf_counter()
+
+body = json.dumps({"text": "Olá, estou com um erro no sistema e preciso de ajuda urgente. Podem verificar?"}).encode()
+def call():
+    environ = {
+        "REQUEST_METHOD": "POST", "PATH_INFO": "/api/analyze", "QUERY_STRING": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+        "CONTENT_TYPE": "application/json", "CONTENT_LENGTH": str(len(body)),
+        "REMOTE_ADDR": "127.0.0.1", "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr, "wsgi.multithread": False, "wsgi.multiprocess": False, "wsgi.run_once": False,
+    }
+    status = []
+    b"".join(analyze.app(environ, lambda s, h, e=None: status.append(s)))
+    assert status[0].startswith("200"), status
+before_first = time.perf_counter()
+call()
+first = time.perf_counter()
+call()
+second = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (first - before_first) * 1000,
+    "warm_request_ms": (second - first) * 1000,
+    "modules": len(sys.modules),
+    "snapshot": not analyze.response_templates._files,
+    "forbidden": [m for m in sys.argv[2].split(",") if m in sys.modules],
+}))
+'''
+
+
+def run_probe(cold_start: bool, snapshot_file: str) -> dict:
+    env = dict(os.environ, AUTOU_COLD_START='1' if cold_start else '0', AUTOU_SNAPSHOT_FILE=snapshot_file)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, os.path.join(ROOT, 'api'), ','.join(FORBIDDEN_MODULES)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def summarize(runs, key):
+    values = sorted(run[key] for run in runs)
+    return statistics.median(values), values[min(len(values) - 1, int(len(values) * 0.9))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold start de api/analyze.py em interpretadores novos')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-import-ms', type=float, default=float(os.getenv('COLD_START_MAX_IMPORT_MS', '350')),
+                        help='limite da mediana do import (modo cold start)')
+    parser.add_argument('--max-first-request-ms', type=float,
+                        default=float(os.getenv('COLD_START_MAX_FIRST_REQUEST_MS', '15')),
+                        help='limite da mediana do primeiro request (modo cold start)')
+    args = parser.parse_args()
+
+    print("🧪 BENCHMARK DE COLD START - api/analyze.py")
+    print("=" * 60)
+    print(f"   {args.runs} interpretadores novos por modo")
+
+    # Snapshot gerado num diretório temporário; o versionado precisa ser igual a ele
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_file = os.path.join(tmp, 'snapshot.json')
+        subprocess.run([sys.executable, os.path.join(ROOT, 'backend', 'build_snapshot.py'), snapshot_file],
+                       cwd=ROOT, check=True, capture_output=True)
+        with open(snapshot_file, encoding='utf-8') as f:
+            fresh = json.load(f)
+        # O cold start não relê templates e regras: a conferência do 'sources' é feita aqui
+        try:
+            with open(os.path.join(ROOT, 'backend', 'templates', 'snapshot.json'), encoding='utf-8') as f:
+                committed_current = json.load(f) == fresh
+        except FileNotFoundError:
+            committed_current = False
+
+        results = {}
+        for name, cold_start in (('padrão', False), ('cold start', True)):
+            run_probe(cold_start, snapshot_file)  # descartar: caches de disco e .pyc
+            results[name] = [run_probe(cold_start, snapshot_file) for _ in range(args.runs)]
+
+    print(f"\n{'(mediana / p90, ms)':<22} {'import':>16} {'1º request':>16} {'request quente':>16} {'processo':>16}")
+    for name, runs in results.items():
+        cells = [summarize(runs, key) for key in ('import_ms', 'first_request_ms', 'warm_request_ms', 'process_ms')]
+        print(f"{name:<22} " + ' '.join(f"{median:7.1f} / {p90:6.1f}" for median, p90 in cells)
+              + f"   ({runs[0]['modules']} módulos)")
+
+    cold = results['cold start']
+    failures = []
+    import_median = summarize(cold, 'import_ms')[0]
+    first_median = summarize(cold, 'first_request_ms')[0]
+    if import_median > args.max_import_ms:
+        failures.append(f"import {import_median:.1f}ms > {args.max_import_ms:.0f}ms")
+    if first_median > args.max_first_request_ms:
+        failures.append(f"1º request {first_median:.1f}ms > {args.max_first_request_ms:.0f}ms")
+    if not all(run['snapshot'] for run in cold):
+        failures.append("modo cold start não carregou o snapshot")
+    if not committed_current:
+        failures.append("backend/templates/snapshot.json ausente ou desatualizado; rode backend/build_snapshot.py")
+    forbidden = sorted({module for run in cold for module in run['forbidden']})
+    if forbidden:
+        failures.append(f"módulos fora do caminho de /api/analyze importados no cold start: {', '.join(forbidden)}")
+
+    if failures:
+        print("\n❌ REGRESSÃO DE COLD START")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1
+    print(f"\n✅ Dentro dos limites (import ≤ {args.max_import_ms:.0f}ms, "
+          f"1º request ≤ {args.max_first_request_ms:.0f}ms, snapshot em dia, sem módulos proibidos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
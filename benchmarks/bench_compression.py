@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+import tempfile
+import statistics
+import http.client
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+os.environ.setdefault('ADMISSION_RATE', '0')
+os.environ.setdefault('JOBS_DB_PATH', os.path.join(tempfile.mkdtemp(), 'jobs.sqlite3'))
+os.environ.setdefault('JOBS_WORKERS', '0')
+
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import analyze
+from compression import available_encodings
+from bench_asgi_vs_flask import start_server
+
+PORT = 8104
+
+EMAIL_CURTO = "Olá, estou com um erro no sistema desde ontem. Podem verificar?"
+EMAIL_LONGO = ("Prezados, desde a atualização de ontem o relatório mensal não abre e o sistema mostra "
+               "uma mensagem de erro ao exportar. Preciso de ajuda urgente, pois a reunião com a diretoria "
+               "é amanhã. Seguem os passos que fiz e o número do chamado 4821.\n\n") * 20
+
+
+def build_job(total=500):
+    client = analyze.app.test_client()
+    job_id = client.post('/api/jobs', json={
+        'emails': [f"{EMAIL_LONGO[:400]} Pedido {i}." for i in range(total)]
+    }).json['job_id']
+    while client.get(f'/api/jobs/{job_id}').json['status'] not in ('completed', 'failed'):
+        pass
+    return job_id
+
+
+def cases(job_id):
+    """(nome, método, url, corpo JSON, Accept); SSE não entra: vai sem compressão"""
+    return [
+        ('analyze (email curto)', 'post', '/api/analyze', {'text': EMAIL_CURTO}, None),
+        ('analyze (email longo)', 'post', '/api/analyze', {'text': EMAIL_LONGO}, None),
+        ('jobs results (100 itens)', 'get', f'/api/jobs/{job_id}/results?limit=100', None, None),
+        ('jobs results NDJSON (500)', 'get', f'/api/jobs/{job_id}/results', None, 'application/x-ndjson'),
+    ]
+
+
+def measure(case, encoding, iterations):
+    """Bytes no fio, tempo do request e CPU gasta só na compressão (µs por resposta)"""
+    _, method, url, body, accept = case
+    client = analyze.app.test_client()
+    headers = {'Accept-Encoding': encoding or 'identity'}
+    if accept:
+        headers['Accept'] = accept
+    compression = analyze.response_compression
+    cpu_before = compression.cpu_seconds
+    samples = []
+    size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = getattr(client, method)(url, json=body, headers=headers)
+        size = len(response.data)
+        samples.append(time.perf_counter() - started)
+        assert response.headers.get('Content-Encoding') == encoding, (url, encoding)
+    cpu = (compression.cpu_seconds - cpu_before) / iterations
+    return size, statistics.median(samples) * 1e6, cpu * 1e6
+
+
+def bytes_and_cpu(iterations=200):
+    encodings = [None] + list(available_encodings())
+    job_id = build_job()
+    labels = [encoding or 'identity' for encoding in encodings]
+    print(f"\n{'(bytes, request µs, CPU µs)':<28} " + ' '.join(f"{label:>30}" for label in labels))
+    for case in cases(job_id):
+        results = [measure(case, encoding, iterations) for encoding in encodings]
+        plain_size = results[0][0]
+        cells = []
+        for size, elapsed, cpu in results:
+            cells.append(f"{size:>7} ({size / plain_size:4.0%}) {elapsed:7.0f} {cpu:6.0f}")
+        print(f"{case[0]:<28} " + ' '.join(f"{cell:>30}" for cell in cells))
+    print(f"   (abaixo de {analyze.response_compression.min_size} bytes a resposta vai sem compressão)")
+
+
+class CountingConnection(http.client.HTTPConnection):
+    """Conta as conexões TCP abertas (o http.client reconecta sozinho quando o servidor fecha)"""
+
+    connections = 0
+
+    def connect(self):
+        CountingConnection.connections += 1
+        super().connect()
+
+
+def keepalive(requests=500):
+    """Requests sequenciais de um cliente, pelo servidor de produção (gunicorn via start.py serve)"""
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("\n   ℹ️  gunicorn não instalado: medição de keep-alive ignorada (pip install gunicorn)")
+        return
+
+    print(f"\n{'(GET /api/health sequenciais)':<36} {'conexões':>9} {'média':>10} {'req/s':>8}")
+    for name, seconds in (('keep-alive desligado', 0), ('keep-alive 5s (padrão)', 5)):
+        process = start_server([sys.executable, os.path.join(ROOT, 'backend', 'start.py'), 'serve',
+                                '--bind', f'127.0.0.1:{PORT}', '--workers', '1', '--threads', '4',
+                                '--keepalive', str(seconds), '--no-warmup'], PORT)
+        try:
+            CountingConnection.connections = 0
+            connection = CountingConnection('127.0.0.1', PORT)
+            started = time.perf_counter()
+            for _ in range(requests):
+                connection.request('GET', '/api/health')
+                connection.getresponse().read()
+            elapsed = time.perf_counter() - started
+            connection.close()
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"{name:<36} {CountingConnection.connections:>9} {elapsed / requests * 1000:8.2f}ms "
+              f"{requests / elapsed:8.0f}")
+
+
+def main():
+    print("🧪 BENCHMARK DE COMPRESSÃO E KEEP-ALIVE - api/analyze.py")
+    print("=" * 60)
+    print(f"   codificações disponíveis: {', '.join(available_encodings())}"
+          + ("" if 'br' in available_encodings() else " (pip install brotli para br)"))
+    bytes_and_cpu()
+    keepalive()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from collections import Counter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+os.environ.setdefault('ADMISSION_RATE', '0')
+
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from corpus_generator import CorpusGenerator, CorpusWriter, FORMATS
+
+
+def write_corpus(count, seed, formats):
+    out_dir = tempfile.mkdtemp()
+    try:
+        started = time.perf_counter()
+        with CorpusWriter(out_dir, formats) as writer:
+            for email in CorpusGenerator(seed=seed).generate(count):
+                writer.write(email)
+        return time.perf_counter() - started, sum(writer.bytes.values()) / 1024 / 1024
+    finally:
+        shutil.rmtree(out_dir)
+
+
+def throughput(count, seed):
+    """Emails/s e MB/s gravando cada formato"""
+    print(f"\n{'(gravação em disco)':<22} {'emails/s':>9} {'MB/s':>7} {'MB':>8}")
+    for formats in [(fmt,) for fmt in FORMATS] + [FORMATS]:
+        elapsed, size = write_corpus(count, seed, formats)
+        print(f"{'+'.join(formats):<22} {count / elapsed:>9.0f} {size / elapsed:>7.1f} {size:>8.1f}")
+
+
+def memory(count, seed):
+    """Pico de memória (tracemalloc) gerando N e 4N emails: deve ficar igual, o corpus é streamed"""
+    peaks = []
+    for total in (count // 4, count):
+        tracemalloc.start()
+        write_corpus(total, seed, FORMATS)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+        tracemalloc.stop()
+    print(f"\n   memória: pico {peaks[0]:.1f}MB com {count // 4} emails, {peaks[1]:.1f}MB com {count}")
+
+
+def mbox_roundtrip(count, seed):
+    """O mbox gerado precisa ser lido pelo upload de jobs (mailbox_split) sem perder mensagens"""
+    from mailbox_split import iter_emails
+
+    out_dir = tempfile.mkdtemp()
+    try:
+        with CorpusWriter(out_dir, ('mbox',)) as writer:
+            for email in CorpusGenerator(seed=seed).generate(count):
+                writer.write(email)
+        with open(os.path.join(out_dir, 'mbox', 'corpus-00000.mbox'), 'rb') as f:
+            data = f.read()
+    finally:
+        shutil.rmtree(out_dir)
+    parsed = sum(1 for _ in iter_emails('corpus.mbox', data, count + 1, len(data) + 1))
+    status = '✅' if parsed == count else '❌'
+    print(f"\n{status} mbox: {parsed}/{count} emails lidos por mailbox_split.iter_emails")
+    return parsed == count
+
+
+def accuracy(count, seed):
+    """Acerto dos classificadores contra o rótulo verdadeiro, por idioma e classe"""
+    import app
+    import analyze
+
+    classifiers = {
+        'api/analyze.py': lambda text: analyze.classify_email_professional(text).classification,
+        'app.py': lambda text: app.classify_email(text)[0],
+    }
+    totals = Counter()
+    hits = {name: Counter() for name in classifiers}
+    distractor = Counter()
+    for email in CorpusGenerator(seed=seed).generate(count):
+        text = email.text()
+        group = (email.language, email.label)
+        totals[group] += 1
+        for name, classify in classifiers.items():
+            if classify(text) == email.label:
+                hits[name][group] += 1
+                if email.has_distractor:
+                    distractor[name] += 1
+        if email.has_distractor:
+            totals['distractor'] += 1
+
+    groups = sorted(group for group in totals if group != 'distractor')
+    print(f"\n{'(acerto)':<16} " + ' '.join(f"{f'{lang}/{label}':>15}" for lang, label in groups)
+          + f" {'c/ distrator':>13} {'total':>7}")
+    for name in classifiers:
+        cells = [f"{hits[name][group] / totals[group]:>15.1%}" for group in groups]
+        overall = sum(hits[name].values()) / sum(totals[group] for group in groups)
+        print(f"{name:<16} " + ' '.join(cells)
+              + f" {distractor[name] / max(totals['distractor'], 1):>13.1%} {overall:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Geração do corpus sintético e acerto dos classificadores')
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("🧪 BENCHMARK DO CORPUS SINTÉTICO - backend/corpus_generator.py")
+    print("=" * 60)
+    throughput(args.count, args.seed)
+    memory(args.count, args.seed)
+    ok = mbox_roundtrip(args.count, args.seed)
+    accuracy(args.count, args.seed)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import random
+import threading
+from multiprocessing import Pool
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from id_generator import SnowflakeGenerator, decode_id
+
+
+def old_protocol():
+    """Esquema anterior: segundos + dois dígitos aleatórios"""
+    return f"AU{time.strftime('%Y%m%d%H%M%S')}{random.randint(10, 99)}"
+
+
+def generate_in_threads(generator, threads, per_thread):
+    results = [None] * threads
+
+    def work(index):
+        results[index] = [generator.next_id() for _ in range(per_thread)]
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return [value for chunk in results for value in chunk], elapsed
+
+
+def generate_in_process(worker_id, count=50000):
+    generator = SnowflakeGenerator(worker_id)
+    return [generator.next_id() for _ in range(count)]
+
+
+def main(count=200000, threads=8):
+    print("🧪 BENCHMARK DO GERADOR DE IDs")
+    print("=" * 50)
+
+    generator = SnowflakeGenerator(worker_id=1)
+    start = time.perf_counter()
+    ids = [generator.next_id() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ 1 thread: {count / elapsed:,.0f} IDs/s ({elapsed / count * 1e9:.0f} ns/ID)")
+    print(f"   únicos: {len(set(ids)) == len(ids)}  crescentes: {ids == sorted(ids)}")
+    print(f"   exemplo: {ids[-1]} -> (ms, worker, seq) = {decode_id(ids[-1])}")
+
+    ids, elapsed = generate_in_threads(generator, threads, count // threads)
+    print(f"\n⚡ {threads} threads: {len(ids) / elapsed:,.0f} IDs/s")
+    print(f"   únicos: {len(set(ids)) == len(ids)}")
+
+    with Pool(4) as pool:
+        chunks = pool.map(generate_in_process, range(4))
+    ids = [value for chunk in chunks for value in chunk]
+    print(f"\n⚡ 4 processos (workers 0-3): {len(ids)} IDs, únicos: {len(set(ids)) == len(ids)}")
+
+    protocols = [old_protocol() for _ in range(1000)]
+    print(f"\n📉 Esquema antigo: {1000 - len(set(protocols))} colisões em 1000 protocolos gerados em sequência")
+
+
+if __name__ == "__main__":
+    main()
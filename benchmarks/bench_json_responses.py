@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'api'))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from flask.json.provider import DefaultJSONProvider
+
+import fast_json
+from analyze import app, analyze_email, HEALTH_INFO
+from fast_json import FastJSONProvider, JSONTemplate
+
+EMAIL = ("Olá equipe,\n\nEstou com um problema urgente no sistema de faturamento: o relatório "
+         "de vendas não abre desde ontem. Podem verificar? Obrigado.\n\nAtenciosamente,\nMaria Silva")
+
+
+def per_call_us(func, iterations):
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def measure(provider, health_template, analyze_payload, iterations):
+    """(health, analyze) em µs por resposta, incluindo o objeto Response"""
+    if health_template is None:
+        def health():
+            return provider.response(dict(HEALTH_INFO, timestamp=datetime.now().isoformat()))
+    else:
+        def health():
+            return app.response_class(health_template.render(timestamp=datetime.now().isoformat()),
+                                      mimetype='application/json')
+
+    def analyze():
+        return provider.response(analyze_payload)
+
+    return per_call_us(health, iterations), per_call_us(analyze, iterations)
+
+
+def main(iterations=20000):
+    print("🧪 BENCHMARK DE SERIALIZAÇÃO DAS RESPOSTAS JSON")
+    print("=" * 60)
+
+    with app.app_context():
+        # Corpo real de /api/analyze; o "antes" usa api_info como dict comum
+        payload = analyze_email(EMAIL)
+        plain_payload = dict(payload, api_info={'version': '2.0.0-vercel', 'environment': 'serverless',
+                                                'timestamp': datetime.now().isoformat(), 'request_id': 'req_bench'})
+
+        results = []
+        before = DefaultJSONProvider(app)
+        results.append(("Antes: jsonify padrão (sort_keys, ensure_ascii)",
+                        *measure(before, None, plain_payload, iterations),
+                        len(before.dumps(plain_payload, separators=(',', ':')))))
+
+        encoders = [('json', fast_json._stdlib_dumps)]
+        if fast_json.orjson is not None:
+            encoders.append(('orjson', fast_json.orjson.dumps))
+
+        for name, encoder in encoders:
+            fast_json._dumps = encoder
+            api_info = JSONTemplate({'version': '2.0.0-vercel', 'environment': 'serverless'})
+            fast_payload = dict(payload, api_info=api_info.render(
+                timestamp=datetime.now().isoformat(), request_id='req_bench'))
+            results.append((f"Depois: {name} + partes fixas pré-serializadas",
+                            *measure(FastJSONProvider(app), JSONTemplate(HEALTH_INFO), fast_payload, iterations),
+                            len(fast_json.dumps(fast_payload))))
+
+    print(f"\n{'':<50} {'health':>10} {'analyze':>10} {'bytes':>7}")
+    for name, health_us, analyze_us, size in results:
+        print(f"{name:<50} {health_us:8.1f}µs {analyze_us:8.1f}µs {size:>7}")
+
+    base_health, base_analyze = results[0][1], results[0][2]
+    best = results[-1]
+    print(f"\n⚡ {best[0]}: health {base_health / best[1]:.1f}x, analyze {base_analyze / best[2]:.1f}x mais rápido")
+    print(f"   a 1000 probes/s de health check: {base_health * 1000 / 1e6 * 100:.1f}% → "
+          f"{best[1] * 1000 / 1e6 * 100:.1f}% de um núcleo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from llm_stub_server import start_stub_server
+
+SAMPLE_EMAILS = [
+    ("Estou com problema no sistema, preciso de ajuda urgente! O login não funciona desde ontem.", "Produtivo"),
+    ("Parabéns pelo aniversário! Feliz aniversário e um ótimo fim de semana!", "Improdutivo"),
+    ("Reunião marcada para discutir o projeto importante. Podemos revisar o orçamento e o prazo?", "Produtivo"),
+    ("Obrigado pelo café da manhã! Foi muito gostoso.", "Improdutivo"),
+]
+
+
+def run(generator, server, emails):
+    """Gerar respostas para o backlog e contar chamadas recebidas pelo stub"""
+    requests_before = server.config.requests
+    start = time.perf_counter()
+    results = generator.generate_batch(emails)
+    elapsed = time.perf_counter() - start
+
+    sources = {}
+    for result in results:
+        sources[result.source] = sources.get(result.source, 0) + 1
+    return elapsed, server.config.requests - requests_before, sources
+
+
+def report(name, count, elapsed, upstream, sources):
+    print(f"\n📬 {name}")
+    print(f"   {count} emails em {elapsed:.2f}s - {upstream} chamadas ao LLM")
+    print(f"   origem das respostas: {sources}")
+
+
+def main(count=64, latency=0.2):
+    print("🧪 BENCHMARK DE GERAÇÃO EM LOTE (servidor stub local)")
+    print("=" * 50)
+
+    server, base_url = start_stub_server(latency=latency, seed=42)
+    os.environ['OPENAI_API_KEY'] = 'stub'
+    os.environ['OPENAI_BASE_URL'] = base_url
+    os.environ['LLM_CACHE_PATH'] = ''  # medir só o LLM
+
+    from response_generator import ResponseGenerator
+    generator = ResponseGenerator()
+    emails = []
+    for i in range(count):
+        text, label = SAMPLE_EMAILS[i % len(SAMPLE_EMAILS)]
+        emails.append((f"{text} (pedido {i})", label))
+
+    generator.batcher.max_batch_size = 1
+    report("Uma chamada por email", count, *run(generator, server, emails))
+
+    generator.batcher.max_batch_size = 8
+    report("Lotes de até 8 emails", count, *run(generator, server, emails))
+
+    server.config.batch_drop_rate = 0.25
+    report("Lotes com 25% dos itens malformados", count, *run(generator, server, emails))
+    print(f"\n📊 {generator.batcher.stats()}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from llm_client import LLMClient, LLMError, LLMTimeoutError
+from llm_stub_server import start_stub_server
+
+MESSAGES = [{"role": "user", "content": "Estou com problema no sistema, preciso de ajuda urgente!"}]
+
+
+def run(client, calls, threads, timeout=None):
+    """Disparar `calls` chamadas a partir de `threads` threads (como workers Flask)"""
+    outcomes = {'ok': 0, 'timeout': 0, 'erro': 0}
+
+    def call(_):
+        try:
+            client.complete(MESSAGES, timeout=timeout)
+            return 'ok'
+        except LLMTimeoutError:
+            return 'timeout'
+        except LLMError:
+            return 'erro'
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for outcome in pool.map(call, range(calls)):
+            outcomes[outcome] += 1
+    elapsed = time.perf_counter() - start
+    return elapsed, outcomes
+
+
+def report(name, calls, elapsed, outcomes):
+    print(f"\n⚡ {name}")
+    print(f"   {calls} chamadas em {elapsed:.2f}s ({calls / elapsed:.1f} chamadas/s)")
+    print(f"   ok={outcomes['ok']} timeout={outcomes['timeout']} erro={outcomes['erro']}")
+
+
+def main(calls=200, threads=64, latency=0.2):
+    print("🧪 BENCHMARK DO CLIENTE LLM (servidor stub local)")
+    print("=" * 50)
+
+    server, base_url = start_stub_server(latency=latency, jitter=latency / 4, seed=42)
+    print(f"🤖 Stub em {base_url} - latência {latency * 1000:.0f}ms ± {latency * 250:.0f}ms")
+
+    client = LLMClient(api_key='stub', base_url=base_url, timeout=5.0, max_concurrency=32)
+    client.complete(MESSAGES)  # aquecer pool de conexões
+
+    elapsed, outcomes = run(client, calls, threads)
+    report(f"Concorrência limitada a 32 ({threads} threads chamando)", calls, elapsed, outcomes)
+    print(f"   sequencial levaria ~{calls * latency:.1f}s")
+
+    elapsed, outcomes = run(client, calls // 2, threads, timeout=latency * 0.8)
+    report(f"Prazo de {latency * 800:.0f}ms por chamada", calls // 2, elapsed, outcomes)
+
+    server.config.error_rate = 0.2
+    elapsed, outcomes = run(client, calls // 2, threads)
+    report("Provedor com 20% de erros 500", calls // 2, elapsed, outcomes)
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from parsed_email import ParsedEmail
+from prompt_builder import condense_email, estimate_tokens
+
+HISTORY = (
+    "\n\nEm seg., 10 de mar. de 2025 às 09:12, Suporte AutoU <suporte@autou.io> escreveu:\n"
+    "> Olá, recebemos seu chamado e estamos analisando.\n"
+    "> Qualquer novidade avisaremos por aqui.\n"
+    "> Atenciosamente, Equipe AutoU\n" * 3
+)
+
+SIGNATURE = (
+    "\n\nAtenciosamente,\nMaria Souza\nAnalista Financeira - Empresa XYZ\n"
+    "Tel: (11) 4002-8922\nmaria.souza@xyz.com.br\nwww.xyz.com.br"
+)
+
+SAMPLE_EMAILS = [
+    (
+        "De: Maria Souza <maria.souza@xyz.com.br>\nPara: suporte@autou.io\nAssunto: Re: Chamado 4411\n\n"
+        "Bom dia, pessoal! Espero que estejam todos bem e que a semana tenha começado tranquila por aí. "
+        "Passando para dar um retorno sobre o chamado que abrimos na semana passada, depois da atualização do sistema. "
+        "Fizemos os testes que vocês sugeriram com a equipe inteira ao longo da sexta-feira e também na segunda. "
+        "Limpamos o cache dos navegadores, trocamos de máquina e até testamos pela rede de outra filial. "
+        "Infelizmente o erro continua aparecendo quando tentamos exportar os relatórios mensais. "
+        "Vocês conseguem verificar com urgência se existe alguma correção prevista para esta semana?"
+        + SIGNATURE + HISTORY,
+        "verificar com urgência"
+    ),
+    (
+        "Oi equipe,\n\nGostaria de agendar uma reunião para apresentar a proposta comercial do próximo trimestre. "
+        "Temos disponibilidade na quinta ou sexta à tarde. "
+        "Podemos confirmar o horário até amanhã?\n\n-- \nCarlos Lima\nDiretor Comercial\n+55 11 99999-0000"
+        + HISTORY,
+        "horário"
+    ),
+    (
+        "Hi team,\n\nThanks again for the quick turnaround last month, the whole finance team really appreciated it. "
+        "We noticed the invoice export is not working since yesterday's release and our month-end close depends on it. "
+        "Could you check it as soon as possible?\n\nBest regards,\nJohn Smith\nFinance Lead\n"
+        "\nOn Mon, Mar 10, 2025 at 9:12 AM Support <support@autou.io> wrote:\n> We are looking into it.\n",
+        "check it"
+    ),
+]
+
+
+def main(budget=60, repeat=2000):
+    print("🧪 BENCHMARK DO PROMPT BUILDER")
+    print("=" * 50)
+
+    for text, must_keep in SAMPLE_EMAILS:
+        naive = text[:500]
+        condensed = condense_email(ParsedEmail(text), budget)
+        print(f"\n📧 {text.splitlines()[0][:60]}")
+        print(f"   [:500]:    {estimate_tokens(naive):4d} tokens  pergunta mantida: {must_keep in naive}")
+        print(f"   condensado:{estimate_tokens(condensed):4d} tokens  pergunta mantida: {must_keep in condensed}")
+        print(f"   → {condensed[:160]}{'...' if len(condensed) > 160 else ''}")
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        text = SAMPLE_EMAILS[i % len(SAMPLE_EMAILS)][0]
+        condense_email(ParsedEmail(text), budget)
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ {elapsed / repeat * 1e6:.0f} µs por email (parse + condensação)")
+
+
+if __name__ == "__main__":
+    main()
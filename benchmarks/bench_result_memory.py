@@ -0,0 +1,79 @@
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'api'))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from analyze import classify_email_professional
+from results import EmailFeatures
+
+SAMPLE_EMAILS = [
+    "Estou com problema no sistema, preciso de ajuda urgente! O login não funciona desde ontem.",
+    "Parabéns pelo aniversário! Feliz aniversário e um ótimo fim de semana!",
+    "Reunião marcada para discutir o projeto importante. Podemos revisar o orçamento e o prazo?",
+    "Obrigado pelo café da manhã! Foi muito gostoso.",
+    "Hi team, the invoice export is not working. Can you fix it asap?",
+]
+
+
+def measure(build):
+    """Medir memória retida e blocos alocados pelos objetos construídos"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return objects, size, blocks
+
+
+def build_features(text):
+    text_lower = text.lower()
+    return EmailFeatures(
+        length=len(text),
+        word_count=len(text.split()),
+        exclamation_marks=text.count('!'),
+        question_marks=text.count('?'),
+        capital_ratio=sum(1 for c in text if c.isupper()) / len(text),
+        urgency_score=int('urgente' in text_lower),
+        question_score=int('como' in text_lower),
+        gratitude_score=int('obrigado' in text_lower),
+        has_attachment='anexo' in text_lower,
+        has_link='http' in text_lower
+    )
+
+
+def report(name, count, slotted, as_dict):
+    _, slot_size, slot_blocks = slotted
+    _, dict_size, dict_blocks = as_dict
+    print(f"\n📦 {name} ({count} emails)")
+    print(f"   dicts aninhados: {dict_size / count:8.1f} bytes/email  {dict_blocks / count:6.1f} alocações/email")
+    print(f"   __slots__:       {slot_size / count:8.1f} bytes/email  {slot_blocks / count:6.1f} alocações/email")
+    print(f"   redução:         {100 * (1 - slot_size / dict_size):6.1f}% memória  "
+          f"{100 * (1 - slot_blocks / dict_blocks):6.1f}% alocações")
+
+
+def main(count=20000):
+    print("🧪 BENCHMARK DE MEMÓRIA - RESULTADOS E FEATURES")
+    print("=" * 50)
+
+    texts = [f"{SAMPLE_EMAILS[i % len(SAMPLE_EMAILS)]} #{i}" for i in range(count)]
+
+    # Os textos e as strings geradas pela classificação existem nos dois casos;
+    # a diferença medida é só a estrutura que guarda o resultado
+    slotted = measure(lambda: [classify_email_professional(t) for t in texts])
+    as_dict = measure(lambda: [classify_email_professional(t).to_dict() for t in texts])
+    report('ClassificationResult', count, slotted, as_dict)
+
+    slotted = measure(lambda: [build_features(t) for t in texts])
+    as_dict = measure(lambda: [build_features(t).to_dict() for t in texts])
+    report('EmailFeatures', count, slotted, as_dict)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import io
+import os
+import sys
+import copy
+import json
+import time
+import base64
+import tempfile
+import statistics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+EVENTS_DIR = os.path.join(ROOT, 'benchmarks', 'serverless_events')
+
+# Carga de um IP só e jobs em diretório temporário
+os.environ.setdefault('ADMISSION_RATE', '0')
+os.environ.setdefault('JOBS_DB_PATH', os.path.join(tempfile.mkdtemp(), 'jobs.sqlite3'))
+os.environ.setdefault('JOBS_WORKERS', '0')
+
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+sys.path.insert(0, ROOT)
+
+import analyze
+import app as root_app
+from serverless import ServerlessAdapter
+
+# Evento gravado -> (app alvo, status esperado, resposta binária?)
+EXPECTED = {
+    'apigw_v1_analyze.json': ('api', 200, False),
+    'apigw_v2_health.json': ('api', 200, False),
+    'function_url_analyze_base64.json': ('api', 200, False),
+    'apigw_v2_jobs_upload.json': ('api', 202, False),
+    'alb_preflight.json': ('api', 200, False),
+    'vercel_bridge_analyze.json': ('api', 200, False),
+    'apigw_v1_logo.json': ('app', 200, True),
+}
+
+HANDLERS = {
+    'api': analyze.lambda_handler,
+    'app': ServerlessAdapter(root_app.app),
+}
+
+
+def load_event(name):
+    with open(os.path.join(EVENTS_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def response_body(response) -> bytes:
+    if response.get('isBase64Encoded') or response.get('encoding') == 'base64':
+        return base64.b64decode(response['body'])
+    return response['body'].encode('utf-8')
+
+
+def replay():
+    """Executar cada evento gravado e conferir a resposta"""
+    failures = []
+    for name in sorted(os.listdir(EVENTS_DIR)):
+        if name not in EXPECTED:
+            failures.append(f"{name}: evento sem resultado esperado em EXPECTED")
+            continue
+        target, status, binary = EXPECTED[name]
+        response = HANDLERS[target](load_event(name), None)
+        body = response_body(response)
+        is_binary = bool(response.get('isBase64Encoded') or response.get('encoding') == 'base64')
+
+        problems = []
+        if response['statusCode'] != status:
+            problems.append(f"status {response['statusCode']} (esperado {status})")
+        if is_binary != binary:
+            problems.append(f"binário={is_binary} (esperado {binary})")
+        if binary:
+            path = load_event(name)['path'].lstrip('/')
+            with open(os.path.join(ROOT, path), 'rb') as f:
+                if f.read() != body:
+                    problems.append("corpo binário diferente do arquivo")
+        elif body:
+            try:
+                json.loads(body)
+            except ValueError:
+                problems.append("corpo não é JSON")
+
+        print(f"   {'✅' if not problems else '❌'} {name:<36} {response['statusCode']} {len(body):>7} bytes"
+              + (f"  ({'; '.join(problems)})" if problems else ''))
+        if problems:
+            failures.append(f"{name}: {'; '.join(problems)}")
+    return failures
+
+
+def old_handler(event):
+    """Handler anterior: test_request_context + full_dispatch_request por invocação"""
+    payload = json.loads(event['body']) if event.get('Action') == 'Invoke' else None
+    if payload is not None:
+        method, path = payload['method'], payload['path']
+        body = base64.b64decode(payload['body']) if payload.get('encoding') == 'base64' else payload.get('body')
+        headers = payload.get('headers')
+    else:
+        method = event.get('httpMethod') or event['requestContext']['http']['method']
+        path = event.get('path') or event.get('rawPath')
+        body = event.get('body') or b''
+        if event.get('isBase64Encoded'):
+            body = base64.b64decode(body)
+        headers = event.get('headers')
+    with analyze.app.test_request_context(path=path, method=method, data=body, headers=headers):
+        response = analyze.app.full_dispatch_request()
+        return response.status_code, response.get_data()
+
+
+def time_per_call(funcs, iterations):
+    """Mediana por função, alternando as funções (estado da app cresce igual para todas)"""
+    samples = [[] for _ in funcs]
+    for _ in range(iterations):
+        for func, func_samples in zip(funcs, samples):
+            start = time.perf_counter()
+            func()
+            func_samples.append(time.perf_counter() - start)
+    return [statistics.median(func_samples) * 1e6 for func_samples in samples]
+
+
+def overhead(iterations=2000):
+    print(f"\n{'(mediana, µs por invocação)':<36} {'WSGI direto':>12} {'adaptador':>12} {'anterior':>12} {'overhead':>10}")
+    for name in ('apigw_v2_health.json', 'apigw_v1_analyze.json', 'vercel_bridge_analyze.json'):
+        event = load_event(name)
+        adapter = HANDLERS['api']
+        environ = adapter.v2_environ(event) if event.get('version') == '2.0' else (
+            adapter.vercel_environ(json.loads(event['body'])) if event.get('Action') == 'Invoke'
+            else adapter.v1_environ(event))
+        body = environ['wsgi.input'].getvalue()
+
+        def direct():
+            # Piso: environ pronto, só a app WSGI
+            prepared = copy.copy(environ)
+            prepared['wsgi.input'] = io.BytesIO(body)
+            b''.join(analyze.app(prepared, lambda status, headers, exc_info=None: None))
+
+        direct_us, adapter_us, old_us = time_per_call(
+            [direct, lambda: adapter(event), lambda: old_handler(event)], iterations)
+        print(f"{name:<36} {direct_us:12.1f} {adapter_us:12.1f} {old_us:12.1f} {adapter_us - direct_us:+10.1f}")
+
+
+def main():
+    print("🧪 ADAPTADOR SERVERLESS - eventos gravados e overhead por invocação")
+    print("=" * 60)
+    failures = replay()
+    overhead()
+    if failures:
+        print("\n❌ EVENTOS COM RESPOSTA INESPERADA")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1
+    print("\n✅ Todos os eventos gravados responderam como esperado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from llm_client import LLMClient
+from llm_stub_server import start_stub_server
+
+
+@pytest.fixture
+def stub_server():
+    """Stub do provedor em porta livre: (servidor, base_url)
+
+    O comportamento pode ser trocado durante o teste em `servidor.config`
+    (latency, error_rate, batch_drop_rate); `config.requests` conta as
+    chamadas recebidas.
+    """
+    server, base_url = start_stub_server(latency=0.01, seed=7, stream_interval=0.0)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def llm(stub_server):
+    """Cliente síncrono apontado para o stub, com event loop próprio"""
+    client = LLMClient(api_key='stub', base_url=stub_server[1], timeout=2.0)
+    yield client
+    client.close()
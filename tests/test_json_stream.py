@@ -0,0 +1,108 @@
+import io
+import json
+
+import pytest
+
+from json_stream import JSONStreamScanner, BodyTooLarge, MalformedJSON, read_json
+
+DOCUMENT = {
+    'text': 'Olá, "equipe"!\n\\ caminho C:\\temp \u00e9 \\"quase\\" escapado',
+    'nested': {'list': [1, -2.5e3, True, False, None, {'x': []}]},
+    'empty': '',
+    'backslashes': '\\\\\\',
+}
+BODY = json.dumps(DOCUMENT, ensure_ascii=False).encode('utf-8')
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO que registra quantos bytes foram lidos"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def scan(body, chunk_size):
+    scanner = JSONStreamScanner()
+    for start in range(0, len(body), chunk_size):
+        scanner.feed(body[start:start + chunk_size])
+    scanner.close()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64, 8192])
+def test_valid_object_in_any_chunking(chunk_size):
+    assert read_json(io.BytesIO(BODY), len(BODY), chunk_size=chunk_size) == DOCUMENT
+
+
+def test_escapes_split_at_every_position():
+    # Barras e aspas escapadas caindo em qualquer fronteira de pedaço
+    body = b'{"a": "\\\\", "b": "\\"\\\\\\"", "c": "x\\\\\\\\"}'
+    for cut in range(1, len(body)):
+        scanner = JSONStreamScanner()
+        scanner.feed(body[:cut])
+        scanner.feed(body[cut:])
+        scanner.close()
+
+
+@pytest.mark.parametrize('body, message', [
+    (b'[1, 2]', 'objeto'),
+    (b'"texto"', 'objeto'),
+    (b'{"a": 1} {"b": 2}', 'após o fim'),
+    (b'{"a": [1}', 'Fechamento'),
+    (b'{"a": 1]', 'Fechamento'),
+    (b'{"a": x}', 'inválido'),
+    (b'{"a": 1', 'incompleto'),
+    (b'   ', 'vazio'),
+])
+def test_malformed_bodies_are_rejected(body, message):
+    with pytest.raises(MalformedJSON, match=message):
+        scan(body, 1)
+    with pytest.raises(MalformedJSON, match=message):
+        read_json(io.BytesIO(body), 1024)
+
+
+def test_nesting_is_limited():
+    scanner = JSONStreamScanner(max_depth=3)
+    scanner.feed(b'{"a": {"b": [')
+    with pytest.raises(MalformedJSON, match='níveis'):
+        scanner.feed(b'[')
+
+
+def test_syntax_error_stops_reading_at_the_first_chunk():
+    stream = CountingStream(b'{"a": 1]' + b' ' * 100000)
+
+    with pytest.raises(MalformedJSON):
+        read_json(stream, 200000, chunk_size=1024)
+
+    assert stream.bytes_read == 1024
+
+
+def test_declared_length_over_the_limit_is_refused_without_reading():
+    stream = CountingStream(BODY)
+
+    with pytest.raises(BodyTooLarge):
+        read_json(stream, 10, content_length=len(BODY))
+
+    assert stream.bytes_read == 0
+
+
+def test_reading_stops_one_byte_past_the_limit():
+    # Sem Content-Length (chunked): o limite vale para o que foi lido
+    body = b'{"text": "' + b'a' * 10000 + b'"}'
+    stream = CountingStream(body)
+
+    with pytest.raises(BodyTooLarge):
+        read_json(stream, 1000, chunk_size=256)
+
+    assert stream.bytes_read == 1001
+
+
+def test_invalid_json_that_passes_the_scan_still_fails_decoding():
+    # O scanner só confere a estrutura; números e literais são validados pelo json.loads
+    with pytest.raises(MalformedJSON, match='JSON inválido'):
+        read_json(io.BytesIO(b'{"a": tru}'), 1024)
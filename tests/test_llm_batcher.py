@@ -0,0 +1,218 @@
+import pytest
+
+import llm_client
+from circuit_breaker import CircuitBreaker
+from llm_batcher import LLMBatcher, parse_batch_answers
+from llm_client import LLMError, LLMTimeoutError
+from llm_stub_server import STUB_REPLY
+
+
+def build_messages(text):
+    return [{'role': 'user', 'content': text}]
+
+
+def build_batch_messages(items):
+    # Mesmo cabeçalho de item que o stub reconhece (### Email n)
+    body = '\n\n'.join(f'### Email {i}\n{text}' for i, (text,) in enumerate(items, 1))
+    return [{'role': 'user', 'content': body}]
+
+
+def reject(text):
+    raise ValueError('resposta inválida')
+
+
+def make_batcher(llm, **kwargs):
+    kwargs.setdefault('max_batch_size', 8)
+    kwargs.setdefault('max_wait_ms', 50)
+    return LLMBatcher(llm, build_messages, build_batch_messages, **kwargs)
+
+
+def results(futures, timeout=10):
+    return [future.result(timeout=timeout) for future in futures]
+
+
+def test_parse_batch_answers_ignores_text_around_the_list():
+    text = 'Segue:\n```json\n[{"id": 1, "resposta": " Olá "}, {"id": "2", "resposta": "x"}, 3]\n```'
+    assert parse_batch_answers(text) == {1: 'Olá'}
+    assert parse_batch_answers('sem lista') == {}
+    assert parse_batch_answers('[{"id": 1, "resposta": ') == {}
+
+
+def test_full_batch_goes_in_a_single_upstream_call(stub_server, llm):
+    server, _ = stub_server
+    batcher = make_batcher(llm, max_batch_size=4, max_wait_ms=1000)
+
+    answers = results(batcher.generate_many([(f'email {i}',) for i in range(4)]))
+
+    assert answers == [STUB_REPLY] * 4
+    assert server.config.requests == 1
+    assert batcher.stats() == {
+        'items': 4, 'batches': 1, 'batched_items': 4,
+        'single_calls': 0, 'fallbacks': 0, 'upstream_calls': 1
+    }
+
+
+def test_requests_inside_the_window_are_batched(stub_server, llm):
+    server, _ = stub_server
+    batcher = make_batcher(llm, max_batch_size=8, max_wait_ms=200)
+
+    answers = results(batcher.generate_many([(f'email {i}',) for i in range(3)]))
+
+    assert answers == [STUB_REPLY] * 3
+    assert server.config.requests == 1
+    assert batcher.stats()['batches'] == 1
+
+
+def test_lone_request_uses_the_single_prompt(stub_server, llm):
+    server, _ = stub_server
+    batcher = make_batcher(llm, max_wait_ms=1)
+
+    assert batcher.submit('email').result(timeout=10) == STUB_REPLY
+    assert server.config.requests == 1
+    assert batcher.stats()['batches'] == 0
+    assert batcher.stats()['single_calls'] == 1
+
+
+def test_items_missing_from_the_batch_are_retried_one_by_one(stub_server, llm):
+    server, _ = stub_server
+    server.config.batch_drop_rate = 0.5
+    batcher = make_batcher(llm, max_batch_size=8)
+
+    answers = results(batcher.generate_many([(f'email {i}',) for i in range(8)]))
+
+    stats = batcher.stats()
+    assert answers == [STUB_REPLY] * 8
+    assert 0 < stats['fallbacks'] < 8
+    assert stats['batched_items'] + stats['fallbacks'] == 8
+    assert stats['single_calls'] == stats['fallbacks']
+    assert server.config.requests == 1 + stats['fallbacks']
+
+
+def test_invalid_batch_answers_are_retried(stub_server, llm):
+    server, _ = stub_server
+    # Resposta do lote não passa na validação; a individual (mesmo texto) também não
+    batcher = make_batcher(llm, max_batch_size=2, validate=reject)
+
+    futures = batcher.generate_many([('a',), ('b',)])
+
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=10)
+    assert batcher.stats()['fallbacks'] == 2
+    assert server.config.requests == 3
+
+
+def test_upstream_errors_reach_the_futures_and_the_breaker(stub_server, llm):
+    server, _ = stub_server
+    server.config.error_rate = 1.0
+    breaker = CircuitBreaker('test', failure_threshold=10)
+    batcher = make_batcher(llm, max_batch_size=3, breaker=breaker)
+
+    futures = batcher.generate_many([(f'email {i}',) for i in range(3)])
+
+    for future in futures:
+        with pytest.raises(LLMError):
+            future.result(timeout=10)
+    # Só a chamada do lote: sem novas tentativas contra um provedor fora do ar
+    assert server.config.requests == 1
+    assert breaker.stats()['failures'] == 1
+    assert batcher.stats()['single_calls'] == 0
+
+
+def test_retries_wait_for_the_breaker(stub_server, llm, monkeypatch):
+    server, _ = stub_server
+    server.config.batch_drop_rate = 1.0
+    breaker = CircuitBreaker('test', failure_threshold=10)
+    batcher = make_batcher(llm, max_batch_size=3, breaker=breaker)
+    # Disjuntor abre entre a resposta do lote e as novas tentativas
+    monkeypatch.setattr(breaker, 'allow', lambda: False)
+
+    futures = batcher.generate_many([(f'email {i}',) for i in range(3)])
+
+    for future in futures:
+        with pytest.raises(LLMError, match='Disjuntor'):
+            future.result(timeout=10)
+    assert server.config.requests == 1
+    assert batcher.stats()['fallbacks'] == 3
+    assert batcher.stats()['single_calls'] == 0
+
+
+def test_timeouts_fail_the_items_instead_of_hanging(stub_server):
+    server, base_url = stub_server
+    server.config.latency = 1.0
+    llm = llm_client.LLMClient(api_key='stub', base_url=base_url, timeout=0.2)
+    try:
+        batcher = make_batcher(llm, max_batch_size=2)
+        futures = batcher.generate_many([('a',), ('b',)])
+        for future in futures:
+            with pytest.raises(LLMTimeoutError):
+                future.result(timeout=5)
+    finally:
+        llm.close()
+
+
+@pytest.fixture
+def generator(stub_server, monkeypatch):
+    """ResponseGenerator com LLM no stub, sem cache e com disjuntor próprio"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'stub')
+    monkeypatch.setenv('OPENAI_BASE_URL', stub_server[1])
+    monkeypatch.setenv('LLM_CACHE_PATH', '')
+    monkeypatch.setattr(llm_client, '_default_client', None)
+
+    from response_generator import ResponseGenerator
+    generator = ResponseGenerator()
+    generator.breaker = generator.batcher.breaker = CircuitBreaker('test', failure_threshold=100)
+    generator.batcher.max_wait = 0.05
+    yield generator
+    generator.llm.close()
+
+
+EMAILS = [
+    (f"Olá, estou com um erro no sistema de faturamento desde ontem. Podem verificar o pedido {i}?",
+     'Produtivo')
+    for i in range(6)
+]
+
+
+def test_generate_batch_answers_from_one_batched_call(stub_server, generator):
+    server, _ = stub_server
+
+    responses = generator.generate_batch(EMAILS)
+
+    assert [response.source for response in responses] == ['llm'] * len(EMAILS)
+    assert all(response.text == STUB_REPLY for response in responses)
+    assert server.config.requests == 1
+
+
+def test_generate_batch_falls_back_to_templates_for_items_left_unanswered(stub_server, generator):
+    server, _ = stub_server
+    server.config.batch_drop_rate = 0.5
+    build_messages = generator.batcher.build_messages
+
+    def failing_retry(*args):
+        # O lote já respondeu; as novas tentativas individuais encontram o provedor fora do ar
+        server.config.error_rate = 1.0
+        return build_messages(*args)
+
+    generator.batcher.build_messages = failing_retry
+
+    responses = generator.generate_batch(EMAILS)
+
+    sources = [response.source for response in responses]
+    dropped = generator.batcher.stats()['fallbacks']
+    assert 0 < dropped < len(EMAILS)
+    assert sources.count('llm') == len(EMAILS) - dropped
+    assert sources.count('template') == dropped
+    for response in responses:
+        if response.source == 'template':
+            assert response.text and response.text != STUB_REPLY
+
+
+def test_generate_batch_uses_templates_when_the_provider_times_out(stub_server, generator):
+    server, _ = stub_server
+    server.config.latency = 1.0
+    generator.llm.async_client.timeout = 0.2
+
+    responses = generator.generate_batch(EMAILS[:2])
+
+    assert [response.source for response in responses] == ['template', 'template']
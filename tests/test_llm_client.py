@@ -0,0 +1,132 @@
+import time
+import asyncio
+
+import pytest
+
+from llm_client import AsyncLLMClient, LLMError, LLMTimeoutError
+from llm_stub_server import STUB_REPLY
+
+MESSAGES = [{'role': 'user', 'content': 'Olá'}]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def with_client(base_url, action, **kwargs):
+    client = AsyncLLMClient(api_key='stub', base_url=base_url, **kwargs)
+    try:
+        return await action(client)
+    finally:
+        await client.aclose()
+
+
+def test_complete_returns_the_reply(stub_server):
+    _, base_url = stub_server
+
+    reply = run(with_client(base_url, lambda client: client.complete(MESSAGES)))
+
+    assert reply == STUB_REPLY
+
+
+def test_stream_yields_the_reply_in_pieces(stub_server):
+    _, base_url = stub_server
+
+    async def collect(client):
+        return [piece async for piece in client.stream(MESSAGES)]
+
+    pieces = run(with_client(base_url, collect))
+
+    assert len(pieces) > 1
+    assert ''.join(pieces) == STUB_REPLY
+
+
+def test_concurrency_is_capped_by_the_semaphore(stub_server):
+    server, base_url = stub_server
+    server.config.latency = 0.2
+
+    async def burst(client):
+        started = time.perf_counter()
+        await asyncio.gather(*(client.complete(MESSAGES) for _ in range(6)))
+        return time.perf_counter() - started
+
+    # 6 chamadas, 2 por vez: pelo menos 3 rodadas da latência do stub
+    elapsed = run(with_client(base_url, burst, max_concurrency=2))
+
+    assert elapsed >= 0.55
+    assert server.config.requests == 6
+
+
+def test_deadline_includes_the_wait_for_a_slot(stub_server):
+    server, base_url = stub_server
+    server.config.latency = 0.3
+
+    async def queued(client):
+        first = asyncio.ensure_future(client.complete(MESSAGES, timeout=2.0))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(LLMTimeoutError):
+                await client.complete(MESSAGES, timeout=0.1)
+        finally:
+            await first
+
+    run(with_client(base_url, queued, max_concurrency=1))
+    # A segunda chamada desistiu ainda na fila, sem chegar ao provedor
+    assert server.config.requests == 1
+
+
+def test_slow_provider_raises_timeout(stub_server):
+    server, base_url = stub_server
+    server.config.latency = 1.0
+
+    # Sem o prazo a chamada terminaria com sucesso depois de 1s
+    with pytest.raises(LLMTimeoutError):
+        run(with_client(base_url, lambda client: client.complete(MESSAGES), timeout=0.2))
+
+
+def test_stream_times_out_waiting_for_the_first_piece(stub_server):
+    server, base_url = stub_server
+    server.config.latency = 1.0
+
+    async def collect(client):
+        return [piece async for piece in client.stream(MESSAGES, timeout=0.2)]
+
+    with pytest.raises(LLMTimeoutError):
+        run(with_client(base_url, collect))
+
+
+def test_provider_errors_become_llm_errors(stub_server):
+    server, base_url = stub_server
+    server.config.error_rate = 1.0
+
+    with pytest.raises(LLMError) as excinfo:
+        run(with_client(base_url, lambda client: client.complete(MESSAGES)))
+
+    assert not isinstance(excinfo.value, LLMTimeoutError)
+    assert server.config.requests == 1
+
+
+def test_sync_facade_shares_one_loop_across_threads(llm):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(4) as pool:
+        replies = list(pool.map(lambda _: llm.complete(MESSAGES), range(8)))
+
+    assert replies == [STUB_REPLY] * 8
+    assert ''.join(llm.stream(MESSAGES)) == STUB_REPLY
+
+
+def test_sync_stream_releases_the_slot_when_abandoned(stub_server):
+    from llm_client import LLMClient
+
+    server, base_url = stub_server
+    server.config.stream_interval = 0.05
+    llm = LLMClient(api_key='stub', base_url=base_url, timeout=2.0, max_concurrency=1)
+    try:
+        stream = llm.stream(MESSAGES)
+        next(stream)
+        stream.close()
+        # Com uma só vaga, a próxima chamada só passa se a anterior devolveu a dela
+        assert llm.complete(MESSAGES, timeout=1.0) == STUB_REPLY
+    finally:
+        llm.close()